@@ -0,0 +1,97 @@
+import os
+import queue
+import streamlit as st
+from dotenv import load_dotenv
+
+load_dotenv()
+
+st.set_page_config(
+    page_title="Interview Admin Dashboard",
+    page_icon="📊",
+    layout="wide"
+)
+
+# One LiveMetrics per process, shared by every open dashboard
+@st.cache_resource
+def init_live_metrics():
+    from database.connection import get_database
+    from services.live_metrics import LiveMetrics
+    live_metrics = LiveMetrics(get_database().interview_sessions,
+                               poll_interval=float(os.getenv("LIVE_METRICS_POLL_INTERVAL", "2.0")))
+    live_metrics.start()
+    return live_metrics
+
+live_metrics = init_live_metrics()
+
+@st.cache_resource
+def init_metrics_store():
+    from database.connection import get_database
+    from services.shared_store import MongoSharedStore
+    return MongoSharedStore(get_database().cluster_state)
+
+# Published by every app instance every LLM_METRICS_INTERVAL seconds
+@st.cache_data(ttl=5)
+def load_llm_metrics() -> dict:
+    from services.metrics_publisher import published_metrics
+    return published_metrics(init_metrics_store())
+
+live_fragment = st.fragment(run_every=1.0) if hasattr(st, "fragment") else (lambda func: func)
+
+@live_fragment
+def show_live_metrics():
+    if "metrics_feed" not in st.session_state:
+        st.session_state.metrics_feed = live_metrics.subscribe()
+        st.session_state.recent_events = []
+
+    # Drain the deltas pushed since the last refresh
+    while True:
+        try:
+            st.session_state.recent_events.insert(0, st.session_state.metrics_feed.get_nowait())
+        except queue.Empty:
+            break
+    del st.session_state.recent_events[20:]
+
+    snapshot = live_metrics.snapshot()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Active interviews", snapshot["active"])
+    col2.metric("Completed today", snapshot["completed_today"])
+    col3.metric("Average rating (recent)",
+                f"{snapshot['average_rating']:.1f}/10" if snapshot["average_rating"] is not None else "–")
+
+    show_llm_metrics()
+
+    st.subheader("Technologies today")
+    if snapshot["technologies"]:
+        st.bar_chart({name: count for name, count in snapshot["technologies"]})
+    else:
+        st.caption("No interviews started today")
+
+    st.subheader("Recent events")
+    for event in st.session_state.recent_events:
+        st.text(", ".join(f"{key}={value}" for key, value in event.items()))
+    st.caption(f"Updates via {snapshot['mode'].replace('_', ' ')}")
+
+def show_llm_metrics():
+    st.subheader("LLM")
+    instances = load_llm_metrics()
+    if not instances:
+        st.caption("No app instance has published LLM metrics yet")
+        return
+    for node_id, metrics in instances.items():
+        queue_stats, readiness = metrics["queue"], metrics.get("readiness") or {}
+        interactive_wait = queue_stats["wait_time"].get("interactive", {})
+        col0, col1, col2, col3, col4 = st.columns(5)
+        col0.metric(node_id, "Ready" if readiness.get("resident") else "Cold",
+                    help=f"Model {readiness.get('model', '?')} loaded on the inference server")
+        col1.metric("Queue depth", f"{queue_stats['queue_depth']}/{queue_stats['max_queue']}",
+                    help=f"Requests waiting for an LLM slot on {node_id}")
+        col2.metric("Interactive wait p95",
+                    f"{interactive_wait['p95_ms']:.0f} ms" if interactive_wait.get("count") else "–",
+                    help=f"Rejected: {sum(queue_stats['rejected'].values())}")
+        col3.metric("Running", f"{queue_stats['active']}/{queue_stats['max_concurrency']}",
+                    help=f"{node_id}, updated {metrics['updated_at']}")
+        col4.metric("Median generate latency",
+                    f"{readiness['median_latency_ms']} ms" if readiness.get("median_latency_ms") is not None else "–")
+
+st.title("📊 Interview Admin Dashboard")
+show_live_metrics()
@@ -1,26 +1,9 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from services.candidate_service import CandidateService
-from services.interview_service import InterviewService
-from services.llama_service import LlamaService
-from database.connection import get_database
-import streamlit as st
-from database.connection import get_database
+from models.catalog import TECH_CATEGORIES, DESIRED_POSITIONS
+from services.container import ServiceContainer
 
-# Import interview service last, passing dependencies
-def init_services():
-    db = get_database()
-    
-    # Initialize services in correct order
-    candidate_service = CandidateService(db)
-    llama_service = LlamaService()
-    
-    # Import interview service here to avoid circular import
-    from services.interview_service import InterviewService
-    interview_service = InterviewService(db, llama_service, candidate_service)
-    
-    return candidate_service, interview_service
 # Load environment variables
 load_dotenv()
 
@@ -31,16 +14,61 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize services
+# Initialize services once per process; each service is built on first use
 @st.cache_resource
-def init_services():
-    db = get_database()
-    llama_service = LlamaService()
-    candidate_service = CandidateService(db)
-    interview_service = InterviewService(db, llama_service, candidate_service)
-    return candidate_service, interview_service
+def init_services() -> ServiceContainer:
+    services = ServiceContainer()
+    services.start_background()
+    return services
+
+services = init_services()
+
+# Number of chat messages rendered before "Load earlier messages"
+CHAT_WINDOW = int(os.getenv("CHAT_WINDOW", "20"))
+
+# st.fragment reruns only the decorated function; older Streamlit versions
+# without it fall back to full-page reruns.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+FRAGMENT_RERUN = {"scope": "fragment"} if hasattr(st, "fragment") else {}
+polling_fragment = st.fragment(run_every=1.0) if hasattr(st, "fragment") else None
+
+def get_query_param(name: str):
+    if hasattr(st, "query_params"):
+        return st.query_params.get(name)
+    return (st.experimental_get_query_params().get(name) or [None])[0]
+
+def set_query_param(name: str, value: str):
+    if hasattr(st, "query_params"):
+        st.query_params[name] = value
+    else:
+        st.experimental_set_query_params(**{name: value})
+
+def redirect_to(url: str):
+    """Send the browser to another replica and stop rendering this page"""
+    st.markdown(f'<meta http-equiv="refresh" content="0; url={url}">', unsafe_allow_html=True)
+    st.info(f"Your interview continues on another server. [Open it]({url}) if you are not redirected.")
+    st.stop()
 
-candidate_service, interview_service = init_services()
+def resume_interview(session_id: str):
+    """Restore an interview from ?session= after a reconnect, possibly to another replica"""
+    route = services.interview_service.session_route(session_id)
+    if route:
+        redirect_to(f"{route.rstrip('/')}/?session={session_id}")
+    session = services.interview_service.get_session_status(session_id)
+    if not session:
+        return
+    st.session_state.session_id = session_id
+    st.session_state.candidate_id = session["candidate_id"]
+    if session["status"] in ("completed", "expired"):
+        st.session_state.step = "completed"
+        return
+    if session["status"] == "paused":
+        st.session_state.step = "paused"
+        return
+    st.session_state.step = "interview"
+    messages, start, _ = services.interview_service.get_history_page(session_id, CHAT_WINDOW)
+    st.session_state.chat_history = messages
+    st.session_state.history_start = start
 
 def main():
     st.title("🤖 AI Technical Interview Assistant")
@@ -55,6 +83,8 @@ def main():
         st.session_state.session_id = None
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
+    if st.session_state.session_id is None and get_query_param("session"):
+        resume_interview(get_query_param("session"))
     
     # Navigation
     if st.session_state.step == "registration":
@@ -63,6 +93,8 @@ def main():
         show_tech_stack_form()
     elif st.session_state.step == "interview":
         show_interview_interface()
+    elif st.session_state.step == "paused":
+        show_paused_page()
     elif st.session_state.step == "completed":
         show_completion_page()
 
@@ -89,12 +121,7 @@ def show_registration_form():
         # Desired positions (multi-select)
         positions = st.multiselect(
             "Desired Position(s) *",
-            options=[
-                "Software Engineer", "Senior Software Engineer", "Lead Developer",
-                "Full Stack Developer", "Frontend Developer", "Backend Developer",
-                "DevOps Engineer", "Data Scientist", "ML Engineer", 
-                "Product Manager", "Engineering Manager"
-            ],
+            options=DESIRED_POSITIONS,
             help="Select all positions you're interested in"
         )
         
@@ -130,7 +157,7 @@ def show_registration_form():
                 }
                 
                 try:
-                    candidate_id = candidate_service.create_candidate(candidate_data)
+                    candidate_id = services.candidate_service.create_candidate(candidate_data)
                     st.session_state.candidate_id = candidate_id
                     st.session_state.step = "tech_stack"
                     st.rerun()
@@ -142,44 +169,10 @@ def show_tech_stack_form():
     st.write("Please specify your technical proficiencies:")
     
     # Tech categories with comprehensive options
-    tech_categories = {
-        "Programming Languages": [
-            "Python", "JavaScript", "Java", "C++", "C#", "Go", "Rust", 
-            "TypeScript", "Swift", "Kotlin", "PHP", "Ruby", "Scala", "R"
-        ],
-        "Frontend Technologies": [
-            "React", "Vue.js", "Angular", "Svelte", "HTML/CSS", "Bootstrap", 
-            "Tailwind CSS", "Material-UI", "jQuery", "Next.js", "Nuxt.js"
-        ],
-        "Backend Frameworks": [
-            "Django", "Flask", "FastAPI", "Express.js", "Spring Boot", 
-            "ASP.NET", "Laravel", "Ruby on Rails", "Gin", "Echo"
-        ],
-        "Databases": [
-            "PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite", 
-            "Oracle", "Cassandra", "DynamoDB", "Elasticsearch"
-        ],
-        "Cloud Platforms": [
-            "AWS", "Google Cloud", "Azure", "Digital Ocean", "Heroku", 
-            "Vercel", "Netlify", "Firebase"
-        ],
-        "DevOps & Tools": [
-            "Docker", "Kubernetes", "Jenkins", "GitHub Actions", "GitLab CI", 
-            "Terraform", "Ansible", "Prometheus", "Grafana"
-        ],
-        "Data Science & ML": [
-            "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch", 
-            "Keras", "Apache Spark", "Jupyter", "Tableau", "Power BI"
-        ],
-        "Mobile Development": [
-            "React Native", "Flutter", "Swift (iOS)", "Kotlin (Android)", 
-            "Xamarin", "Ionic", "Cordova"
-        ]
-    }
     
     selected_skills = {}
     
-    for category, technologies in tech_categories.items():
+    for category, technologies in TECH_CATEGORIES.items():
         st.subheader(category)
         
         # Multi-select for technologies in this category
@@ -220,35 +213,61 @@ def show_tech_stack_form():
                 })
             
             try:
-                candidate_service.update_tech_stack(
+                services.candidate_service.update_tech_stack(
                     st.session_state.candidate_id, 
                     tech_stack_data
                 )
                 
                 # Start interview session
-                session_id = interview_service.start_interview(st.session_state.candidate_id)
+                session_id = services.interview_service.start_interview(st.session_state.candidate_id)
                 st.session_state.session_id = session_id
                 st.session_state.step = "interview"
-                session = interview_service.get_session(session_id)
-                st.session_state.chat_history = [msg.model_dump() for msg in session.conversation_history]
+                set_query_param("session", session_id)
+                messages, start, _ = services.interview_service.get_history_page(session_id, CHAT_WINDOW)
+                st.session_state.chat_history = messages
+                st.session_state.history_start = start
 
                 st.rerun()
             except Exception as e:
                 st.error(f"Error updating tech stack: {e}")
 
-def show_interview_interface():
-    st.header("💬 Technical Interview Session")
+def render_messages(messages: list):
+    """Render chat messages in order"""
+    for message in messages:
+        if message["role"] == "user":
+            st.chat_message("user").write(message["content"])
+        else:
+            st.chat_message("assistant").write(message["content"])
+
+def load_earlier_messages():
+    """Widen the window, fetching the previous page of history when needed"""
+    if len(st.session_state.chat_history) > st.session_state.chat_window:
+        st.session_state.chat_window += CHAT_WINDOW
+        return
+    start = st.session_state.get("history_start", 0)
+    if start <= 0:
+        return
+    messages, new_start, _ = services.interview_service.get_history_page(
+        st.session_state.session_id, CHAT_WINDOW, end=start
+    )
+    st.session_state.chat_history = messages + st.session_state.chat_history
+    st.session_state.history_start = new_start
+    st.session_state.chat_window += len(messages)
+
+@fragment
+def show_chat():
+    """Chat history and input; reruns on its own so only the chat redraws"""
+    history = st.session_state.chat_history
+    window = st.session_state.setdefault("chat_window", CHAT_WINDOW)
     
-    # Chat interface
-    chat_container = st.container()
+    hidden = st.session_state.get("history_start", 0) + max(0, len(history) - window)
+    if hidden:
+        st.button(f"⬆️ Load earlier messages ({hidden} hidden)", on_click=load_earlier_messages)
     
-    # Display chat history
-    with chat_container:
-        for message in st.session_state.chat_history:
-            if message["role"] == "user":
-                st.chat_message("user").write(message["content"])
-            else:
-                st.chat_message("assistant").write(message["content"])
+    # Display only the most recent messages
+    render_messages(history[-window:])
+    if st.session_state.get("pending_tickets"):
+        st.chat_message("assistant").write("🤔 Thinking...")
     
     # User input
     if prompt := st.chat_input("Type your response here..."):
@@ -260,19 +279,79 @@ def show_interview_interface():
         
         # Get AI response
         try:
+            if services.turn_workers:
+                # Hand the turn to a background worker and return at once;
+                # poll_pending_turns picks up the response
+                ticket = services.turn_workers.submit(st.session_state.session_id, prompt)
+                st.session_state.setdefault("pending_tickets", []).append(ticket.ticket_id)
+                st.rerun()
+            
             # Fix: Use 'prompt' instead of undefined 'user_input'
-            response = interview_service.process_user_input(st.session_state.session_id, prompt)
+            response = services.interview_service.process_user_input(st.session_state.session_id, prompt)
             st.session_state.chat_history.append({"role": "assistant", "content": response})
             
-            st.rerun()
+            st.rerun(**FRAGMENT_RERUN)
         except Exception as e:
             st.error(f"Error processing input: {e}")
+
+def collect_finished_turns() -> bool:
+    """Move finished background turns into the chat, in submission order"""
+    pending = st.session_state.get("pending_tickets", [])
+    collected = False
+    while pending:
+        ticket = services.turn_workers.get(pending[0])
+        if ticket is None:
+            pending.pop(0)
+            st.session_state.chat_history.append(
+                {"role": "assistant", "content": "Sorry, that response was lost. Please answer again."}
+            )
+            collected = True
+            continue
+        if not ticket.done:
+            break
+        pending.pop(0)
+        if ticket.status == "done":
+            st.session_state.chat_history.append({"role": "assistant", "content": ticket.result})
+        else:
+            st.session_state.chat_history.append(
+                {"role": "assistant", "content": f"Error processing input: {ticket.error}"}
+            )
+        collected = True
+    return collected
+
+def poll_pending_turns():
+    """Check background turns once a second without blocking the script thread"""
+    if collect_finished_turns():
+        st.rerun()
+
+if polling_fragment:
+    poll_pending_turns = polling_fragment(poll_pending_turns)
+
+def show_interview_interface():
+    st.header("💬 Technical Interview Session")
+    
+    # Chat interface
+    with st.container():
+        show_chat()
+    
+    if st.session_state.get("pending_tickets"):
+        if polling_fragment:
+            poll_pending_turns()
+        else:
+            # Without fragments, wait for the oldest turn on this rerun
+            ticket = services.turn_workers.get(st.session_state.pending_tickets[0])
+            if ticket:
+                ticket.wait(30)
+            if collect_finished_turns():
+                st.rerun()
     
     # Interview controls
     col1, col2, col3 = st.columns(3)
     with col1:
         if st.button("Pause Interview"):
-            st.info("Interview paused. You can resume anytime.")
+            services.interview_service.pause_interview(st.session_state.session_id)
+            st.session_state.step = "paused"
+            st.rerun()
     
     with col2:
         if st.button("End Interview"):
@@ -283,6 +362,18 @@ def show_interview_interface():
         if st.button("Get Help"):
             st.info("If you need clarification on a question, just ask!")
 
+def show_paused_page():
+    st.header("⏸️ Interview Paused")
+    st.info("Your progress is saved. Resume whenever you're ready; this link keeps your place.")
+    
+    if st.button("Resume Interview"):
+        services.interview_service.resume_interview(st.session_state.session_id)
+        st.session_state.step = "interview"
+        messages, start, _ = services.interview_service.get_history_page(st.session_state.session_id, CHAT_WINDOW)
+        st.session_state.chat_history = messages
+        st.session_state.history_start = start
+        st.rerun()
+
 def show_completion_page():
     st.header("✅ Interview Completed")
     st.success("Thank you for completing the technical interview!")
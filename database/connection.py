@@ -1,5 +1,6 @@
 import os
 import logging
+import threading
 from typing import Optional
 from pymongo import MongoClient
 
@@ -20,8 +21,12 @@ def get_connection_string() -> str:
     logger.info(f"Using MongoDB connection: {mongodb_url[:30]}...")
     return mongodb_url
 
-def get_database():
-    """Synchronous database connection for Streamlit"""
+def get_database(verify: bool = True):
+    """Synchronous database connection for Streamlit.
+
+    ``MongoClient`` connects lazily in the background; with ``verify`` the
+    call also blocks on a ``ping`` so connection errors surface here.
+    """
     connection_string = get_connection_string()
     
     try:
@@ -29,9 +34,10 @@ def get_database():
             # Basic connection with minimal options
             database.sync_client = MongoClient(connection_string)
             
-            # Test the connection
-            database.sync_client.admin.command('ping')
-            logger.info("✅ Successfully connected to MongoDB")
+            if verify:
+                # Test the connection
+                database.sync_client.admin.command('ping')
+                logger.info("✅ Successfully connected to MongoDB")
         
         db_name = os.getenv("MONGODB_DB", "interview_system")
         return database.sync_client[db_name]
@@ -40,6 +46,24 @@ def get_database():
         logger.error(f"❌ Failed to connect to MongoDB: {e}")
         raise ConnectionError(f"Cannot connect to MongoDB: {e}")
 
+def connect_in_background() -> threading.Thread:
+    """Create the client and ping the server on a daemon thread.
+
+    Startup does not wait for the network round trips; the first query
+    simply waits for server selection if the ping has not finished yet.
+    """
+    def ping():
+        try:
+            database.sync_client.admin.command('ping')
+            logger.info("✅ Successfully connected to MongoDB")
+        except Exception as e:
+            logger.error(f"❌ Failed to connect to MongoDB: {e}")
+
+    get_database(verify=False)
+    thread = threading.Thread(target=ping, name="mongo-connect", daemon=True)
+    thread.start()
+    return thread
+
 def close_connection():
     if database.sync_client:
         database.sync_client.close()
@@ -0,0 +1,34 @@
+import os
+from typing import Optional
+
+from pymongo import WriteConcern
+
+# Per-turn writes (chat messages, tech-plan progress, prefetched questions):
+# acknowledged by the primary only, without waiting for the journal.
+FAST = "fast"
+# Data that must survive a failover (profiles, completion, scores):
+# acknowledged by a majority of the replica set and journaled.
+DURABLE = "durable"
+
+
+def tiers_enabled() -> bool:
+    return os.getenv("MONGO_DURABILITY_TIERS", "true").lower() in ("1", "true", "yes")
+
+
+def write_concern(tier: str) -> Optional[WriteConcern]:
+    """Write concern of a tier, or None to keep the client's default"""
+    if not tiers_enabled():
+        return None
+    if tier == FAST:
+        # MONGO_FAST_W=0 makes these writes unacknowledged: lowest latency,
+        # but failed writes go unnoticed and are not retried
+        return WriteConcern(w=int(os.getenv("MONGO_FAST_W", "1")), j=False)
+    if tier == DURABLE:
+        return WriteConcern(w="majority", j=True, wtimeout=int(os.getenv("MONGO_DURABLE_WTIMEOUT_MS", "10000")))
+    raise ValueError(f"Unknown durability tier: {tier}")
+
+
+def with_tier(collection, tier: str):
+    """``collection`` with the write concern of ``tier``"""
+    concern = write_concern(tier)
+    return collection.with_options(write_concern=concern) if concern else collection
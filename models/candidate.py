@@ -17,6 +17,7 @@ class Candidate(BaseModel):
     desired_positions: list[str]
     current_location: str
     tech_stack: list[TechStack] = Field(default_factory=list)
+    tech_plan: list[dict] = Field(default_factory=list)  # Pre-built interview plan, see services.tech_plan
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     @field_validator("full_name")
@@ -0,0 +1,44 @@
+# models/catalog.py
+"""Static option lists for the registration and tech stack forms"""
+
+DESIRED_POSITIONS = [
+    "Software Engineer", "Senior Software Engineer", "Lead Developer",
+    "Full Stack Developer", "Frontend Developer", "Backend Developer",
+    "DevOps Engineer", "Data Scientist", "ML Engineer",
+    "Product Manager", "Engineering Manager"
+]
+
+TECH_CATEGORIES = {
+    "Programming Languages": [
+        "Python", "JavaScript", "Java", "C++", "C#", "Go", "Rust",
+        "TypeScript", "Swift", "Kotlin", "PHP", "Ruby", "Scala", "R"
+    ],
+    "Frontend Technologies": [
+        "React", "Vue.js", "Angular", "Svelte", "HTML/CSS", "Bootstrap",
+        "Tailwind CSS", "Material-UI", "jQuery", "Next.js", "Nuxt.js"
+    ],
+    "Backend Frameworks": [
+        "Django", "Flask", "FastAPI", "Express.js", "Spring Boot",
+        "ASP.NET", "Laravel", "Ruby on Rails", "Gin", "Echo"
+    ],
+    "Databases": [
+        "PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite",
+        "Oracle", "Cassandra", "DynamoDB", "Elasticsearch"
+    ],
+    "Cloud Platforms": [
+        "AWS", "Google Cloud", "Azure", "Digital Ocean", "Heroku",
+        "Vercel", "Netlify", "Firebase"
+    ],
+    "DevOps & Tools": [
+        "Docker", "Kubernetes", "Jenkins", "GitHub Actions", "GitLab CI",
+        "Terraform", "Ansible", "Prometheus", "Grafana"
+    ],
+    "Data Science & ML": [
+        "Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch",
+        "Keras", "Apache Spark", "Jupyter", "Tableau", "Power BI"
+    ],
+    "Mobile Development": [
+        "React Native", "Flutter", "Swift (iOS)", "Kotlin (Android)",
+        "Xamarin", "Ionic", "Cordova"
+    ]
+}
@@ -1,7 +1,13 @@
 # models/common.py
-from enum import Enum
+from enum import Enum, IntEnum
 
 class ProficiencyLevel(str, Enum):
     BEGINNER = "Beginner"
     INTERMEDIATE = "Intermediate"
     ADVANCED = "Advanced"
+
+class LLMPriority(IntEnum):
+    """Scheduling class for LLM requests (lower value is served first)"""
+    INTERACTIVE = 0  # A candidate is waiting for the next question
+    PREFETCH = 1     # Speculative pre-generation
+    BATCH = 2        # Background work such as re-scoring
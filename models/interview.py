@@ -12,14 +12,16 @@ class ConversationMessage(BaseModel):
 class InterviewSession(BaseModel):
     session_id: str = Field(default_factory=lambda: __import__('uuid').uuid4().hex)
     candidate_id: str
-    status: str = "active"  # "active", "paused", "completed"
+    status: str = "active"  # "active", "paused", "completed", "expired"
     tech_plan: list[dict] = Field(default_factory=list)
     current_tech_index: int = 0
+    planned_questions: dict = Field(default_factory=dict)  # Pre-generated questions keyed by tech index
     conversation_history: list[ConversationMessage] = Field(default_factory=list)
     tech_ratings: dict = Field(default_factory=dict)  # Technology-wise ratings
     answer_ratings: list[dict] = Field(default_factory=list)  # Individual answer ratings
     started_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
+    last_activity_at: Optional[datetime] = None  # Last candidate message; drives idle pausing
     average_rating: Optional[float] = None
     total_points: float = 0  # Accumulate total points
     max_possible_points: float = 0  # Track maximum possible points
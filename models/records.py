@@ -0,0 +1,51 @@
+# models/records.py
+"""Lean hot-path records.
+
+Pydantic models validate on construction and walk the model again on
+``model_dump()``. For data the service builds itself on every turn that
+work buys nothing, so these records are plain ``__slots__`` classes with a
+precompiled encoder straight to a BSON-ready dict. Pydantic models in
+``models.interview`` remain the API-boundary representation.
+"""
+from datetime import datetime
+from typing import Optional
+
+
+def _compile_encoder(fields: tuple):
+    """Build a ``to_doc`` that maps slots to dict keys without reflection"""
+    body = ", ".join(f"{name!r}: self.{name}" for name in fields)
+    namespace = {}
+    exec(f"def to_doc(self):\n    return {{{body}}}", namespace)
+    return namespace["to_doc"]
+
+
+class MessageRecord:
+    """Conversation message, field-compatible with ``ConversationMessage``"""
+
+    __slots__ = ("role", "content", "timestamp", "question_id", "technology")
+
+    def __init__(self, role: str, content: str, timestamp: Optional[datetime] = None,
+                 question_id: Optional[str] = None, technology: Optional[str] = None):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp or datetime.utcnow()
+        self.question_id = question_id
+        self.technology = technology
+
+    to_doc = _compile_encoder(__slots__)
+
+
+class AnswerRatingRecord:
+    """One entry of ``InterviewSession.answer_ratings``"""
+
+    __slots__ = ("answer_id", "technology", "question_number", "rating", "timestamp")
+
+    def __init__(self, answer_id: str, technology: str, question_number: int, rating: float,
+                 timestamp: Optional[datetime] = None):
+        self.answer_id = answer_id
+        self.technology = technology
+        self.question_number = question_number
+        self.rating = rating
+        self.timestamp = timestamp or datetime.utcnow()
+
+    to_doc = _compile_encoder(__slots__)
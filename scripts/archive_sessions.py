@@ -0,0 +1,37 @@
+"""Move old completed interviews into the compressed archive collection.
+
+Sessions completed more than ``--days`` days ago are stored compressed in
+``interview_sessions_archive``; a summary stub stays in
+``interview_sessions`` and the app reads the full session through to the
+archive when it is opened. Safe to run repeatedly, e.g. from cron:
+
+    python scripts/archive_sessions.py --days 30
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_database
+from services.archive_service import ArchiveService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=int(os.getenv("ARCHIVE_AFTER_DAYS", "30")))
+    parser.add_argument("--limit", type=int, help="archive at most this many sessions")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stats = ArchiveService(get_database()).archive_completed(args.days, limit=args.limit)
+    ratio = stats["raw_bytes"] / stats["archived_bytes"] if stats["archived_bytes"] else 0
+    print(f"Archived {stats['sessions']} sessions in {time.perf_counter() - started:.1f}s: "
+          f"{stats['raw_bytes'] / 1e6:.1f} MB -> {stats['archived_bytes'] / 1e6:.1f} MB ({ratio:.1f}x)")
+    if stats["skipped"]:
+        print(f"Skipped {stats['skipped']} sessions that changed while archiving; the next run retries them")
+
+
+if __name__ == "__main__":
+    main()
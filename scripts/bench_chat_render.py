@@ -0,0 +1,122 @@
+"""Benchmark chat redraw time of app.py as the conversation grows.
+
+Runs the real interview page through Streamlit's AppTest harness with a
+stubbed ServiceContainer (no MongoDB or Ollama needed), resumes an interview
+with 10, 100 and 1000 stored messages via ?session=, submits answers and
+times each redraw. Exits non-zero if more than the chat window is rendered
+or if the redraw at the largest size is slower than ``--max-ratio`` times
+the redraw at the smallest size that fills the window.
+
+    python scripts/bench_chat_render.py --sizes 10 100 1000 --repeats 5
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import services.container
+
+SESSION_ID = "bench-session"
+
+
+class StubInterviewService:
+    """Just enough of InterviewService for the interview page"""
+
+    def __init__(self, message_count: int):
+        self.history = [
+            {"role": "assistant" if i % 2 == 0 else "user", "content": f"Message {i}: " + "lorem ipsum " * 20}
+            for i in range(message_count)
+        ]
+
+    def get_session_status(self, session_id: str) -> dict:
+        return {"candidate_id": "bench-candidate", "status": "active"}
+
+    def get_history_page(self, session_id: str, limit: int, end=None):
+        end = len(self.history) if end is None else end
+        start = max(0, end - limit)
+        return [dict(message) for message in self.history[start:end]], start, len(self.history)
+
+    def process_user_input(self, session_id: str, user_input: str) -> str:
+        self.history.append({"role": "user", "content": user_input})
+        self.history.append({"role": "assistant", "content": "Can you give a concrete example?"})
+        return self.history[-1]["content"]
+
+
+class StubContainer:
+    """Replaces ServiceContainer while app.py runs under AppTest"""
+
+    message_count = 0
+
+    def __init__(self):
+        self.interview_service = StubInterviewService(self.message_count)
+        self.turn_workers = None
+
+    def start_background(self):
+        pass
+
+
+def redraw_ms(message_count: int, repeats: int) -> tuple:
+    """Median redraw time after submitting an answer, and the chat messages rendered"""
+    StubContainer.message_count = message_count
+    app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=30)
+    app.query_params["session"] = SESSION_ID
+    app.run()  # first run compiles the script and resumes the interview
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    app.session_state["pending_tickets"] = []
+
+    samples = []
+    for turn in range(repeats):
+        app.chat_input[0].set_value(f"Answer {turn}")
+        started = time.perf_counter()
+        app.run()
+        samples.append((time.perf_counter() - started) * 1000)
+        if app.exception:
+            raise RuntimeError(app.exception[0].value)
+    return statistics.median(samples), len(app.chat_message)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="allowed slowdown of the largest size over the smallest")
+    args = parser.parse_args()
+
+    window = int(os.getenv("CHAT_WINDOW", "20"))
+    services.container.ServiceContainer = StubContainer
+
+    results = {}
+    print(f"{'messages':>9} {'redraw (ms)':>12} {'rendered':>9}")
+    for size in args.sizes:
+        # init_services is cached per process; each size needs its own stub
+        st.cache_resource.clear()
+        results[size] = redraw_ms(size, args.repeats)
+        print(f"{size:>9} {results[size][0]:>12.1f} {results[size][1]:>9}")
+
+    failures = []
+    for size, (_, rendered) in results.items():
+        # The window plus the answer and reply of the last turn
+        if rendered > window + 2:
+            failures.append(f"{size} messages: rendered {rendered} chat messages, window is {window}")
+    # Compare against the smallest history that already fills the window
+    baseline = min([size for size in results if size >= window] or results)
+    smallest, largest = results[baseline][0], results[max(results)][0]
+    if largest > smallest * args.max_ratio:
+        failures.append(f"redraw at {max(results)} messages is {largest / smallest:.1f}x "
+                        f"the redraw at {baseline} (limit {args.max_ratio}x)")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
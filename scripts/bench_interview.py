@@ -0,0 +1,93 @@
+"""Benchmark complete interviews end to end through InterviewService.
+
+Drives scripted candidates through start_interview and process_user_input
+against the configured MongoDB and prints per-turn latency. Run once with
+--record against a live Ollama to fill the cassette, then replay offline
+(e.g. in CI) at full speed, or with --latency 1.0 to simulate the recorded
+generation times. Replays still go through the real prompt rendering,
+parsing and fallback paths.
+
+    python scripts/bench_interview.py --record --interviews 3
+    python scripts/bench_interview.py --interviews 3
+"""
+import os
+import sys
+import random
+import argparse
+import statistics
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TECH_STACK = [
+    {"category": "Programming Languages", "technologies": [{"name": "Python", "proficiency": "Intermediate"}]},
+    {"category": "Databases", "technologies": [{"name": "PostgreSQL", "proficiency": "Beginner"}]},
+]
+
+ANSWERS = [
+    "I would profile the endpoint first, then add an index on the filtered columns and cache the hot query.",
+    "In my last project I used generators to stream large CSV exports without loading them into memory.",
+    "I am not sure, but I think it depends on the isolation level and how long the transaction stays open.",
+    "We wrapped the writes in a transaction and retried on serialization failures with exponential backoff.",
+]
+
+
+def run_interview(services, index: int) -> list:
+    candidate_id = services.candidate_service.create_candidate({
+        "full_name": f"Bench Candidate {index}",
+        "email": f"bench{index}@example.com",
+        "phone_number": "+10000000000",
+        "years_experience": 3,
+        "desired_positions": ["Backend Developer"],
+        "current_location": "Remote",
+        "tech_stack": [],
+    })
+    services.candidate_service.update_tech_stack(candidate_id, TECH_STACK)
+
+    started = time.perf_counter()
+    session_id = services.interview_service.start_interview(candidate_id)
+    timings = [time.perf_counter() - started]
+    # At most three answers per technology complete the interview
+    for turn in range(3 * len(TECH_STACK)):
+        started = time.perf_counter()
+        services.interview_service.process_user_input(session_id, ANSWERS[(index + turn) % len(ANSWERS)])
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interviews", type=int, default=3)
+    parser.add_argument("--record", action="store_true", help="call Ollama and record the generations")
+    parser.add_argument("--cassette", default=os.getenv("LLM_CASSETTE_DIR", "cassettes"))
+    parser.add_argument("--latency", type=float, default=0.0, help="replay at this fraction of recorded latency")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Same inputs, same prompts: fallback and variant choices must not drift between runs
+    random.seed(args.seed)
+    os.environ["LLM_CASSETTE"] = "record" if args.record else "replay"
+    os.environ["LLM_CASSETTE_DIR"] = args.cassette
+    os.environ["LLM_CASSETTE_LATENCY"] = str(args.latency)
+    os.environ.setdefault("LLM_GRADING", "false")
+
+    from services.container import ServiceContainer
+    services = ServiceContainer()
+
+    timings = []
+    for index in range(args.interviews):
+        timings.extend(run_interview(services, index))
+        print(f"interview {index + 1}/{args.interviews} done", file=sys.stderr)
+    if services.state_store:
+        services.state_store.flush()
+
+    timings_ms = sorted(t * 1000 for t in timings)
+    print(f"turns={len(timings_ms)}  p50={statistics.median(timings_ms):.1f}ms  "
+          f"p95={timings_ms[int(len(timings_ms) * 0.95) - 1]:.1f}ms  max={timings_ms[-1]:.1f}ms")
+    cassette = services.llama_service.cassette
+    if cassette.replaying:
+        print(f"cassette misses={cassette.misses} (each fell back as if Ollama were down)")
+
+
+if __name__ == "__main__":
+    main()
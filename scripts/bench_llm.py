@@ -0,0 +1,168 @@
+"""Benchmark time-to-first-token of the Ollama prompts used by LlamaService.
+
+Compares a cold configuration (no keep_alive, model unloaded between runs)
+with the cached configuration (keep_alive plus the stable PROMPT_PREFIX),
+and the follow-up path with and without reused context. With --variants it
+instead runs every prompt template variant and prints its output length,
+clean-extraction rate and latency.
+
+    python scripts/bench_llm.py --runs 5 --url http://localhost:11434
+    python scripts/bench_llm.py --variants --runs 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from models.common import ProficiencyLevel
+from services.llama_service import LlamaService, PROMPT_PREFIX
+
+TECHNOLOGIES = [
+    ("Python", ProficiencyLevel.INTERMEDIATE),
+    ("Django", ProficiencyLevel.ADVANCED),
+    ("PostgreSQL", ProficiencyLevel.BEGINNER),
+    ("Docker", ProficiencyLevel.INTERMEDIATE),
+]
+
+SAMPLE_ANSWER = ("I used Django signals in a project to invalidate a Redis cache whenever "
+                 "an order was saved, and later replaced them with explicit service calls.")
+
+
+def question_prompt(technology: str, proficiency: ProficiencyLevel) -> str:
+    return PROMPT_PREFIX + f"""Task: Generate 1 specific technical interview question for {technology}.
+
+Level: {proficiency.value}
+
+Question:"""
+
+
+def stream_generate(url: str, payload: dict) -> dict:
+    """Run a streaming generation and return timing figures"""
+    payload = dict(payload, stream=True)
+    started = time.perf_counter()
+    ttft = None
+    final = {}
+    with requests.post(f"{url}/api/generate", json=payload, stream=True, timeout=120) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if ttft is None and chunk.get("response"):
+                ttft = time.perf_counter() - started
+            if chunk.get("done"):
+                final = chunk
+    return {
+        "ttft": ttft if ttft is not None else time.perf_counter() - started,
+        "total": time.perf_counter() - started,
+        "prompt_eval_ms": final.get("prompt_eval_duration", 0) / 1e6,
+        "prompt_tokens": final.get("prompt_eval_count", 0),
+        "context": final.get("context"),
+    }
+
+
+def unload(url: str, model: str):
+    requests.post(f"{url}/api/generate", json={"model": model, "keep_alive": 0}, timeout=60)
+
+
+def summarize(label: str, samples: list):
+    ttft = [s["ttft"] * 1000 for s in samples]
+    prompt_eval = [s["prompt_eval_ms"] for s in samples]
+    tokens = [s["prompt_tokens"] for s in samples]
+    print(f"{label:<28} ttft p50={statistics.median(ttft):8.1f}ms  max={max(ttft):8.1f}ms  "
+          f"prompt_eval p50={statistics.median(prompt_eval):8.1f}ms  prompt_tokens p50={statistics.median(tokens):.0f}")
+
+
+def run_template(service: LlamaService, template, technology: str, **values):
+    """One generation through the same budget and stats bookkeeping as LlamaService"""
+    budget_key = f"{template.name}/{template.version}"
+    num_predict, stop = service.output_budget.options(budget_key, technology)
+    response = service._call_llama(PROMPT_PREFIX + template.render(technology=technology, **values),
+                                   num_predict=num_predict, stop=stop)
+    question = service._extract_clean_question(response)
+    service.prompts.record(template, response, len(question) > 15, service._local.latency)
+    service.output_budget.record(budget_key, technology, service._local.raw_response, num_predict,
+                                 service._local.eval_count)
+
+
+def bench_variants(service: LlamaService, runs: int):
+    """Run every question and follow-up template variant and print its stats"""
+    for run in range(runs):
+        for technology, proficiency in TECHNOLOGIES:
+            for template in service.prompts.variants("question"):
+                run_template(service, template, technology, level=proficiency.value)
+            for template in service.prompts.variants("followup"):
+                run_template(service, template, technology, answer=SAMPLE_ANSWER,
+                             question=f"How have you used {technology} in production?")
+        print(f"run {run + 1}/{runs} done", file=sys.stderr)
+
+    for row in service.prompt_stats():
+        if not row["calls"]:
+            continue
+        print(f"{row['template'] + '/' + row['version']:<28} calls={row['calls']:<4} "
+              f"output mean={row['mean_output_chars']:6.1f} chars  valid={row['valid_rate']:.0%}  "
+              f"latency p50={row['median_latency_ms']}ms")
+    print()
+    for row in service.output_stats():
+        print(f"{row['template'] + ' ' + row['technology']:<34} generated={row['tokens_generated']:<6} "
+              f"kept={row['tokens_kept']:<6} ratio={row['kept_ratio']}  num_predict={row['num_predict']}  "
+              f"truncated={row['truncated']}  newline_stop={row['stop_at_newline']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/"))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--keep-alive", default="30m")
+    parser.add_argument("--variants", action="store_true", help="compare the prompt template variants")
+    args = parser.parse_args()
+
+    service = LlamaService(ollama_url=args.url, keep_alive=args.keep_alive)
+    if args.variants:
+        bench_variants(service, args.runs)
+        return
+
+    cold, warm, followup_plain, followup_context = [], [], [], []
+    for run in range(args.runs):
+        for position, (technology, proficiency) in enumerate(TECHNOLOGIES):
+            payload = service._build_payload(question_prompt(technology, proficiency))
+            other_technology, other_proficiency = TECHNOLOGIES[(position + 1) % len(TECHNOLOGIES)]
+
+            # Cold: model unloaded and no keep_alive, as before this mode existed
+            unload(args.url, service.model)
+            cold_payload = dict(payload)
+            cold_payload.pop("keep_alive", None)
+            cold.append(stream_generate(args.url, cold_payload))
+
+            # Warm: model resident and the shared prefix evaluated by a prompt
+            # for another technology, so only PROMPT_PREFIX can be reused
+            stream_generate(args.url, service._build_payload(question_prompt(other_technology, other_proficiency)))
+            first = stream_generate(args.url, payload)
+            warm.append(first)
+
+            followup = PROMPT_PREFIX + f"""Task: Based on this technical interview answer, ask 1 focused follow-up question.
+
+Technology: {technology}
+Previous Answer: {SAMPLE_ANSWER}
+
+Follow-up question:"""
+            followup_plain.append(stream_generate(args.url, service._build_payload(followup)))
+            followup_context.append(stream_generate(args.url, service._build_payload(
+                followup[len(PROMPT_PREFIX):], context=first["context"]
+            )))
+        print(f"run {run + 1}/{args.runs} done", file=sys.stderr)
+
+    summarize("question, cold", cold)
+    summarize("question, keep_alive+prefix", warm)
+    summarize("follow-up, full prompt", followup_plain)
+    summarize("follow-up, reused context", followup_context)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark near-duplicate lookups in QuestionIndex at question-bank scale.
+
+Builds a bank of clustered synthetic questions (technologies x topics, so
+many questions share their technology and topic words, as generated
+questions do), then times ``find_duplicate`` for fresh questions and for
+paraphrases of stored ones and reports how many paraphrases were caught.
+Exits non-zero if the median lookup exceeds ``--max-ms``.
+
+    python scripts/bench_question_index.py --size 100000 --lookups 2000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.question_index import QuestionIndex, question_key
+
+TECHNOLOGIES = ["Python", "Django", "React", "Java", "Kubernetes", "PostgreSQL", "Go", "Rust", "AWS", "Docker"]
+TOPICS = [
+    "memory management", "error handling", "concurrency", "caching strategy", "unit testing",
+    "dependency injection", "query optimization", "state management", "logging", "security hardening",
+    "deployment pipeline", "schema migrations", "rate limiting", "authentication flow", "performance profiling",
+    "data validation", "connection pooling", "background jobs", "configuration management", "api versioning",
+]
+TEMPLATES = [
+    "How would you approach {topic} in a {technology} {context} that {constraint}?",
+    "What trade-offs do you weigh for {topic} when a {technology} {context} {constraint}?",
+    "Describe how you would debug {topic} problems in a {technology} {context} that {constraint}.",
+    "Which {technology} features would you rely on for {topic} in a {context} that {constraint}?",
+]
+CONTEXTS = ["service", "monolith", "microservice", "batch job", "web application", "CLI tool", "data pipeline",
+            "mobile backend", "internal dashboard", "payment system", "search service", "chat server"]
+CONSTRAINTS = ["must serve thousands of requests per second", "runs on a single small VM",
+               "shares a database with legacy code", "has strict latency budgets", "is deployed many times a day",
+               "handles personal health data", "must keep working offline", "is maintained by a new team",
+               "processes nightly batch imports", "needs zero downtime upgrades", "stores years of audit logs",
+               "integrates with flaky third-party APIs"]
+GOALS = ["readability", "observability", "cost", "reliability", "speed of delivery", "test coverage",
+         "onboarding", "resilience", "throughput", "correctness", "maintainability", "portability"]
+
+
+def make_question(rng: random.Random) -> str:
+    question = rng.choice(TEMPLATES).format(topic=rng.choice(TOPICS), technology=rng.choice(TECHNOLOGIES),
+                                            context=rng.choice(CONTEXTS), constraint=rng.choice(CONSTRAINTS))
+    return f"{question} Focus on {rng.choice(GOALS)}."
+
+
+def paraphrase(question: str) -> str:
+    return question.replace("How would you approach", "How do you handle").replace("Describe how", "Explain how") \
+        .replace(" in a ", " within a ") + " Give an example."
+
+
+def time_lookups(index: QuestionIndex, questions: list) -> tuple:
+    samples, found = [], 0
+    for question in questions:
+        started = time.perf_counter()
+        key = index.find_duplicate(question)
+        samples.append((time.perf_counter() - started) * 1000)
+        found += key is not None
+    return statistics.median(samples), sorted(samples)[int(len(samples) * 0.99)], found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--max-ms", type=float, default=1.0, help="allowed median lookup time")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    stored = [make_question(rng) for _ in range(args.size)]
+    index = QuestionIndex()
+    started = time.perf_counter()
+    for question in stored:
+        index.add(question_key(question), question)
+    print(f"Added {len(index)} distinct questions in {time.perf_counter() - started:.1f}s")
+
+    fresh = [make_question(rng) for _ in range(args.lookups)]
+    paraphrases = [paraphrase(rng.choice(stored)) for _ in range(args.lookups)]
+    fresh_median, fresh_p99, _ = time_lookups(index, fresh)
+    para_median, para_p99, caught = time_lookups(index, paraphrases)
+    print(f"{'lookup':>11} {'median (ms)':>12} {'p99 (ms)':>9}")
+    print(f"{'fresh':>11} {fresh_median:>12.3f} {fresh_p99:>9.3f}")
+    print(f"{'paraphrase':>11} {para_median:>12.3f} {para_p99:>9.3f}   caught {caught}/{len(paraphrases)}")
+
+    median = max(fresh_median, para_median)
+    if median > args.max_ms:
+        print(f"FAIL: median lookup {median:.3f} ms exceeds {args.max_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
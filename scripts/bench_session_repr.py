@@ -0,0 +1,101 @@
+"""Benchmark per-turn CPU time and allocations of the session representations.
+
+Compares the Pydantic path (ConversationMessage + model_dump per message,
+full InterviewSession validation to read the history) with the lean path
+(MessageRecord/AnswerRatingRecord encoders, plain projected history).
+
+    python scripts/bench_session_repr.py --history 60 --turns 2000
+"""
+import os
+import sys
+import time
+import uuid
+import argparse
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.interview import InterviewSession, ConversationMessage
+from models.records import MessageRecord, AnswerRatingRecord
+
+ANSWER = "I would profile first, then cache the hot query and add an index on the filter columns. " * 3
+
+
+def pydantic_turn(session_doc: dict):
+    user = ConversationMessage(role="user", content=ANSWER, timestamp=datetime.utcnow(), technology="Python")
+    rating = {
+        "answer_id": uuid.uuid4().hex, "technology": "Python", "question_number": 1,
+        "rating": 6.5, "timestamp": datetime.utcnow(),
+    }
+    assistant = ConversationMessage(role="assistant", content="Next question?", timestamp=datetime.utcnow(),
+                                    technology="Python")
+    docs = [user.model_dump(), rating, assistant.model_dump()]
+    # Reading the history back for display
+    session = InterviewSession(**session_doc)
+    history = [message.model_dump() for message in session.conversation_history]
+    return docs, history
+
+
+def lean_turn(session_doc: dict):
+    user = MessageRecord(role="user", content=ANSWER, technology="Python")
+    rating = AnswerRatingRecord(answer_id=uuid.uuid4().hex, technology="Python", question_number=1, rating=6.5)
+    assistant = MessageRecord(role="assistant", content="Next question?", technology="Python")
+    docs = [user.to_doc(), rating.to_doc(), assistant.to_doc()]
+    # Reading the history back for display: the projected documents as-is
+    history = [{"role": m["role"], "content": m["content"]} for m in session_doc["conversation_history"]]
+    return docs, history
+
+
+def make_session_doc(history: int) -> dict:
+    return {
+        "session_id": uuid.uuid4().hex,
+        "candidate_id": uuid.uuid4().hex,
+        "tech_plan": [{"name": "Python", "proficiency": "Advanced", "questions_asked": 1, "completed": False}],
+        "conversation_history": [
+            MessageRecord(role="user" if i % 2 else "assistant", content=ANSWER, technology="Python").to_doc()
+            for i in range(history)
+        ],
+        "answer_ratings": [],
+    }
+
+
+def measure_allocations(turn, session_doc: dict, turns: int = 200) -> float:
+    """Average peak bytes allocated while running one turn"""
+    tracemalloc.start()
+    total = 0
+    for _ in range(turns):
+        tracemalloc.reset_peak()
+        current_before = tracemalloc.get_traced_memory()[0]
+        turn(session_doc)
+        total += max(0, tracemalloc.get_traced_memory()[1] - current_before)
+    tracemalloc.stop()
+    return total / turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=60, help="messages already in the session")
+    parser.add_argument("--turns", type=int, default=2000)
+    args = parser.parse_args()
+
+    session_doc = make_session_doc(args.history)
+    print(f"history={args.history} messages, turns={args.turns}")
+
+    results = {}
+    for label, turn in (("pydantic", pydantic_turn), ("lean", lean_turn)):
+        turn(session_doc)
+        started = time.perf_counter()
+        for _ in range(args.turns):
+            turn(session_doc)
+        cpu_us = (time.perf_counter() - started) / args.turns * 1e6
+        peak_bytes = measure_allocations(turn, session_doc)
+        results[label] = (cpu_us, peak_bytes)
+        print(f"{label:<10} {cpu_us:9.1f} us/turn  {peak_bytes / 1024:8.1f} KiB peak allocation/turn")
+
+    (p_cpu, p_mem), (l_cpu, l_mem) = results["pydantic"], results["lean"]
+    print(f"saving     {p_cpu / l_cpu:9.1f}x CPU  {p_mem / max(l_mem, 1):8.1f}x allocation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Measure cold-start import cost with ``python -X importtime``.
+
+Imports what app.py loads before the first page is rendered in a fresh
+interpreter and reports the slowest modules. With ``--budget-ms`` the exit
+status is non-zero when the total exceeds the budget, so a module that
+starts importing heavy dependencies at startup is caught in CI.
+
+    python scripts/bench_startup.py --top 15 --budget-ms 1500
+    python scripts/bench_startup.py --modules services.interview_service   # one module's cost
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported by app.py at startup; services load lazily through the container
+STARTUP_MODULES = ["streamlit", "dotenv", "models.catalog", "services.container"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(modules: list) -> list:
+    """(module, self_us, cumulative_us, depth) for every import in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=STARTUP_MODULES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, help="fail if the median total exceeds this")
+    args = parser.parse_args()
+
+    totals = []
+    rows = []
+    for _ in range(args.repeats):
+        rows = import_profile(args.modules)
+        totals.append(sum(us for _, _, us, depth in rows if depth == 0) / 1000)
+    total = statistics.median(totals)
+
+    print(f"Importing {', '.join(args.modules)}: {total:.0f} ms (median of {args.repeats}), {len(rows)} modules")
+    print(f"\n{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[2])[:args.top]:
+        print(f"{cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}  {name}")
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"\nStartup import time {total:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Export completed interview results to Parquet, Arrow IPC or CSV.
+
+Sessions are streamed from ``interview_sessions`` joined with
+``candidates`` and flattened into two tables:
+
+- answers:      one row per entry of ``answer_ratings``
+- technologies: one row per technology of the session's tech plan, from
+                its ``tech_ratings`` aggregates
+
+Rows are written in batches, so memory depends on ``--batch-size`` only.
+With ``--state`` the export is incremental: only sessions completed after
+the watermark saved by the previous run are exported.
+
+    python scripts/export_results.py --out exports --format parquet --state exports/state.json
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_database
+from services.archive_service import ArchiveService
+from services.rating_service import tech_key, tech_stats
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV export still works without pyarrow
+    pa = None
+    pq = None
+
+ANSWER_FIELDS = [
+    "session_id", "candidate_id", "full_name", "email", "technology", "question_number",
+    "rating", "llm_rating", "graded_by", "answered_at", "completed_at",
+]
+TECHNOLOGY_FIELDS = [
+    "session_id", "candidate_id", "full_name", "email", "technology", "proficiency",
+    "answers", "average_rating", "std_rating", "min_rating", "max_rating", "completed_at",
+]
+
+
+def stream_sessions(db, since: Optional[datetime], batch_size: int) -> Iterator[dict]:
+    match = {"status": "completed", "completed_at": {"$ne": None}}
+    if since:
+        match["completed_at"] = {"$gt": since}
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"completed_at": 1}},
+        {"$project": {"_id": 0, "conversation_history": 0, "planned_questions": 0}},
+        {"$lookup": {
+            "from": "candidates",
+            "localField": "candidate_id",
+            "foreignField": "candidate_id",
+            "as": "candidate",
+            "pipeline": [{"$project": {"_id": 0, "full_name": 1, "email": 1}}],
+        }},
+    ]
+    return db.interview_sessions.aggregate(pipeline, batchSize=batch_size, allowDiskUse=True)
+
+
+def flatten(session: dict) -> tuple:
+    candidate = (session.get("candidate") or [{}])[0]
+    base = {
+        "session_id": session.get("session_id"),
+        "candidate_id": session.get("candidate_id"),
+        "full_name": candidate.get("full_name"),
+        "email": candidate.get("email"),
+        "completed_at": session.get("completed_at"),
+    }
+
+    answers = []
+    for rating in session.get("answer_ratings", []):
+        answers.append(dict(
+            base,
+            technology=rating.get("technology"),
+            question_number=rating.get("question_number"),
+            rating=rating.get("rating"),
+            llm_rating=rating.get("llm_rating"),
+            graded_by=rating.get("graded_by", "heuristic"),
+            answered_at=rating.get("timestamp"),
+        ))
+
+    technologies = []
+    tech_ratings = session.get("tech_ratings") or {}
+    for tech in session.get("tech_plan", []):
+        stats = tech_stats(tech_ratings.get(tech_key(tech.get("name", ""))))
+        technologies.append(dict(
+            base,
+            technology=tech.get("name"),
+            proficiency=tech.get("proficiency"),
+            answers=stats["count"],
+            average_rating=stats["mean"],
+            std_rating=stats["std"],
+            min_rating=stats["min"],
+            max_rating=stats["max"],
+        ))
+    return answers, technologies
+
+
+class TableWriter:
+    """Append batches of row dicts to a Parquet, Arrow IPC or CSV file"""
+
+    def __init__(self, path: str, fields: List[str], fmt: str):
+        self.path = path
+        self.fields = fields
+        self.fmt = fmt
+        self.rows = 0
+        self._writer = None
+        self._handle = None
+        self._arrow_schema = None
+
+    def write(self, rows: List[dict]):
+        if not rows:
+            return
+        self.rows += len(rows)
+        if self.fmt == "csv":
+            if self._writer is None:
+                self._handle = open(self.path, "w", newline="", encoding="utf-8")
+                self._writer = csv.DictWriter(self._handle, fieldnames=self.fields)
+                self._writer.writeheader()
+            self._writer.writerows(rows)
+            return
+
+        table = pa.Table.from_pylist(rows, schema=self._schema(rows))
+        if self._writer is None:
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+            else:
+                self._handle = pa.OSFile(self.path, "wb")
+                self._writer = pa.ipc.new_file(self._handle, table.schema)
+        self._writer.write_table(table)
+
+    def _schema(self, rows: List[dict]):
+        # Built once and reused: the Arrow IPC writer does not expose its schema
+        if self._arrow_schema is None:
+            types = {
+                "question_number": pa.int32(), "answers": pa.int32(),
+                "rating": pa.float64(), "llm_rating": pa.float64(), "average_rating": pa.float64(),
+                "std_rating": pa.float64(), "min_rating": pa.float64(), "max_rating": pa.float64(),
+                "answered_at": pa.timestamp("ms"), "completed_at": pa.timestamp("ms"),
+            }
+            self._arrow_schema = pa.schema([(name, types.get(name, pa.string())) for name in self.fields])
+        return self._arrow_schema
+
+    def close(self):
+        if self._writer is not None and self.fmt != "csv":
+            self._writer.close()
+        if self._handle is not None:
+            self._handle.close()
+
+
+def load_watermark(path: Optional[str]) -> Optional[datetime]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        value = json.load(handle).get("completed_at")
+    return datetime.fromisoformat(value) if value else None
+
+
+def save_watermark(path: str, watermark: datetime):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as handle:
+        json.dump({"completed_at": watermark.isoformat()}, handle)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="exports")
+    parser.add_argument("--format", choices=["parquet", "arrow", "csv"], default="parquet")
+    parser.add_argument("--state", help="watermark file for incremental exports")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt != "csv" and pa is None:
+        print("pyarrow is not installed, falling back to CSV")
+        fmt = "csv"
+    extension = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}[fmt]
+
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    answers = TableWriter(os.path.join(args.out, f"answers-{stamp}.{extension}"), ANSWER_FIELDS, fmt)
+    technologies = TableWriter(os.path.join(args.out, f"technologies-{stamp}.{extension}"), TECHNOLOGY_FIELDS, fmt)
+
+    since = load_watermark(args.state)
+    watermark = since
+    sessions = 0
+    answer_rows, tech_rows = [], []
+    try:
+        db = get_database()
+        archive = ArchiveService(db)
+        for session in stream_sessions(db, since, args.batch_size):
+            if session.get("archived"):
+                # Answers of archived sessions live in the compressed copy
+                session = dict(archive.load(session["session_id"]) or session, candidate=session.get("candidate"))
+            session_answers, session_techs = flatten(session)
+            answer_rows.extend(session_answers)
+            tech_rows.extend(session_techs)
+            sessions += 1
+            watermark = session["completed_at"]
+
+            if len(answer_rows) >= args.batch_size:
+                answers.write(answer_rows)
+                technologies.write(tech_rows)
+                answer_rows, tech_rows = [], []
+
+        answers.write(answer_rows)
+        technologies.write(tech_rows)
+    finally:
+        answers.close()
+        technologies.close()
+
+    # Only advance the watermark once both files are complete
+    if args.state and watermark and watermark != since:
+        save_watermark(args.state, watermark)
+
+    print(f"Exported {sessions} sessions: {answers.rows} answer rows, {technologies.rows} technology rows"
+          + (f" (since {since.isoformat()})" if since else ""))
+
+
+if __name__ == "__main__":
+    main()
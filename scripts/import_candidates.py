@@ -0,0 +1,187 @@
+"""Bulk-import candidates from CSV or JSONL.
+
+The file is streamed in chunks: each chunk is validated as a batch, given a
+pre-built tech plan and written with one unordered ``insert_many``.
+Duplicate emails are rejected by the unique index without stopping the
+rest of the chunk, and memory use depends on the chunk size only.
+
+CSV columns: full_name, email, phone_number, years_experience,
+desired_positions (";"-separated), current_location, tech_stack (either the
+JSON list used by the app, or "Python:Advanced;PostgreSQL:Intermediate").
+Proficiencies must be Beginner, Intermediate or Advanced (any case); rows
+with another value are counted as invalid.
+
+    python scripts/import_candidates.py candidates.csv --chunk-size 1000
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from typing import Dict, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter, ValidationError
+from pymongo.errors import BulkWriteError
+
+from database.connection import get_database
+from models.candidate import Candidate
+from models.common import ProficiencyLevel
+from services.tech_plan import build_tech_plan
+
+DUPLICATE_KEY = 11000
+
+candidate_batch = TypeAdapter(List[Candidate])
+
+PROFICIENCY_LEVELS = {level.value.lower(): level.value for level in ProficiencyLevel}
+
+
+def read_rows(path: str, fmt: str) -> Iterator[Optional[dict]]:
+    """Rows of the file; a malformed JSONL line yields None so it is counted as invalid"""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            yield from csv.DictReader(handle)
+        else:
+            for number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    print(f"[ERROR] Line {number} is not valid JSON: {e}")
+                    yield None
+
+
+def normalize_proficiency(value) -> str:
+    """Canonical ``ProficiencyLevel`` value ("advanced" -> "Advanced"); other values are rejected"""
+    proficiency = str(value or "").strip()
+    if not proficiency:
+        return ProficiencyLevel.INTERMEDIATE.value
+    try:
+        return PROFICIENCY_LEVELS[proficiency.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown proficiency: {proficiency}")
+
+
+def parse_tech_stack(value) -> list:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.startswith("["):
+            technologies = []
+            for item in value.split(";"):
+                name, _, proficiency = item.partition(":")
+                if name.strip():
+                    technologies.append({"name": name.strip(), "proficiency": normalize_proficiency(proficiency)})
+            return [{"category": "Imported", "technologies": technologies}] if technologies else []
+        value = json.loads(value)
+
+    # The JSON list used by the app: [{"category": ..., "technologies": [{"name", "proficiency"}]}]
+    stack = []
+    for category in value:
+        technologies = [
+            dict(tech, proficiency=normalize_proficiency(tech.get("proficiency")))
+            for tech in category.get("technologies", [])
+        ]
+        stack.append(dict(category, technologies=technologies))
+    return stack
+
+
+def normalize_row(row: dict) -> dict:
+    positions = row.get("desired_positions") or []
+    if isinstance(positions, str):
+        positions = [p.strip() for p in positions.split(";") if p.strip()]
+    return {
+        "full_name": (row.get("full_name") or "").strip(),
+        "email": (row.get("email") or "").strip().lower(),
+        "phone_number": str(row.get("phone_number") or "").strip(),
+        "years_experience": int(row.get("years_experience") or 0),
+        "desired_positions": positions,
+        "current_location": (row.get("current_location") or "").strip(),
+        "tech_stack": parse_tech_stack(row.get("tech_stack")),
+    }
+
+
+def chunked(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_chunk(rows: List[dict], stats: Dict[str, int]) -> List[Candidate]:
+    """Validate a chunk in one pass; invalid rows are dropped and counted"""
+    normalized = []
+    for row in rows:
+        try:
+            normalized.append(normalize_row(row))
+        except (ValueError, TypeError, AttributeError):
+            stats["invalid"] += 1
+
+    try:
+        return candidate_batch.validate_python(normalized)
+    except ValidationError as e:
+        bad = {error["loc"][0] for error in e.errors() if error["loc"] and isinstance(error["loc"][0], int)}
+        stats["invalid"] += len(bad)
+        remaining = [row for index, row in enumerate(normalized) if index not in bad]
+        return candidate_batch.validate_python(remaining) if remaining else []
+
+
+def insert_chunk(collection, candidates: List[Candidate], stats: Dict[str, int]):
+    docs = []
+    for candidate in candidates:
+        doc = candidate.model_dump()
+        doc["tech_plan"] = build_tech_plan(doc["tech_stack"])
+        docs.append(doc)
+    if not docs:
+        return
+
+    try:
+        result = collection.insert_many(docs, ordered=False)
+        stats["inserted"] += len(result.inserted_ids)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        duplicates = sum(1 for error in errors if error.get("code") == DUPLICATE_KEY)
+        stats["inserted"] += e.details.get("nInserted", 0)
+        stats["duplicates"] += duplicates
+        stats["failed"] += len(errors) - duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="validate only")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    collection = None if args.dry_run else get_database().candidates
+
+    stats = {"rows": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+    started = time.perf_counter()
+
+    for chunk in chunked(read_rows(args.path, fmt), args.chunk_size):
+        stats["rows"] += len(chunk)
+        candidates = validate_chunk(chunk, stats)
+        if collection is not None:
+            insert_chunk(collection, candidates, stats)
+
+        elapsed = time.perf_counter() - started
+        print(f"{stats['rows']} rows, {stats['rows'] / elapsed:.0f} rows/s "
+              f"(inserted={stats['inserted']} duplicates={stats['duplicates']} invalid={stats['invalid']})")
+
+    elapsed = time.perf_counter() - started
+    print(f"Done in {elapsed:.1f}s: {stats['rows'] / max(elapsed, 1e-9):.0f} rows/s, {stats}")
+
+
+if __name__ == "__main__":
+    main()
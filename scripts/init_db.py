@@ -12,6 +12,28 @@ def create_indexes():
     db.interview_sessions.create_index("session_id", unique=True)
     db.interview_sessions.create_index("candidate_id")
     db.interview_sessions.create_index("status")
+    db.interview_sessions.create_index([("status", 1), ("completed_at", 1)])  # Incremental exports
+    db.interview_sessions.create_index("started_at")  # Live metrics polling
+    db.interview_sessions.create_index([("status", 1), ("last_activity_at", 1)])  # Idle reaper
+    db.interview_sessions.create_index([("status", 1), ("paused_at", 1)])  # Expiry of paused sessions
+    
+    # tech_percentiles is keyed by "<technology>|<proficiency>" in _id, so
+    # percentile lookups use the default _id index
+    db.tech_percentiles.create_index([("technology", 1), ("proficiency", 1)])
+    
+    # Candidate ranking: one index per filter, each ending in the sort key so
+    # top-K stops after K index entries
+    db.candidate_scores.create_index("candidate_id", unique=True)
+    db.candidate_scores.create_index([("overall_score", -1), ("candidate_id", 1)])
+    db.candidate_scores.create_index([("positions", 1), ("overall_score", -1), ("candidate_id", 1)])
+    db.candidate_scores.create_index([("skill_tags", 1), ("overall_score", -1), ("candidate_id", 1)])
+    
+    # Shared state of a multi-replica deployment (CLUSTER_MODE); expired
+    # heartbeats and leases are removed by the TTL monitor
+    db.cluster_state.create_index("expires_at", expireAfterSeconds=0)
+    
+    # Calibrated question bank for adaptive difficulty
+    db.question_bank.create_index([("technology", 1), ("difficulty", 1)])
     
     print("Database indexes created successfully!")
 
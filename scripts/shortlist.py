@@ -0,0 +1,66 @@
+"""Print a ranked candidate shortlist from ``candidate_scores``.
+
+    python scripts/shortlist.py --position "Backend Developer" --skill Python:Advanced \
+        --skill PostgreSQL:Intermediate --limit 50
+    python scripts/shortlist.py --rebuild   # backfill from completed sessions
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_database
+from services.ranking_service import RankingService
+
+
+def parse_skill(value: str) -> tuple:
+    name, _, level = value.partition(":")
+    return name.strip(), (level.strip() or "Beginner").capitalize()
+
+
+def rebuild(db, ranking_service: RankingService):
+    refreshed = 0
+    for session in db.interview_sessions.find({"status": "completed"}, {"_id": 0, "session_id": 1}):
+        if ranking_service.refresh(session["session_id"]):
+            refreshed += 1
+    print(f"Refreshed {refreshed} candidate scores")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--position")
+    parser.add_argument("--skill", action="append", default=[], help="Technology:MinimumLevel")
+    parser.add_argument("--min-experience", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--after", help="cursor printed by the previous page")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    db = get_database()
+    ranking_service = RankingService(db)
+    if args.rebuild:
+        rebuild(db, ranking_service)
+        return
+
+    after = None
+    if args.after:
+        score, _, candidate_id = args.after.partition("/")
+        after = (float(score), candidate_id)
+
+    results, cursor = ranking_service.top_candidates(
+        position=args.position,
+        skills=dict(parse_skill(skill) for skill in args.skill),
+        min_experience=args.min_experience,
+        limit=args.limit,
+        after=after,
+    )
+    for rank, row in enumerate(results, 1):
+        print(f"{rank:3}. {row['overall_score']:5.2f}  {row['full_name']} <{row['email']}>  "
+              f"{row['years_experience']}y  {', '.join(row['desired_positions'])}")
+    if cursor:
+        print(f"\nNext page: --after {cursor[0]}/{cursor[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# services/adaptive_engine.py
+import hashlib
+from typing import Callable, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from models.common import ProficiencyLevel
+
+# Elo-scale anchors for the self-reported levels; they seed both the
+# candidate's ability and the difficulty of new questions
+LEVEL_RATINGS = {
+    ProficiencyLevel.BEGINNER.value: 1200.0,
+    ProficiencyLevel.INTERMEDIATE.value: 1500.0,
+    ProficiencyLevel.ADVANCED.value: 1800.0,
+}
+
+
+def question_key(technology: str, question_text: str) -> str:
+    return hashlib.sha1(f"{technology}|{question_text.strip().lower()}".encode("utf-8")).hexdigest()
+
+
+class AdaptiveEngine:
+    """Elo-style ability estimate per (candidate, technology) and question selection.
+
+    Each answer is a match between the candidate's ability and the
+    question's difficulty, scored by the 0-10 rating. The ability moves by
+    ``k`` (shrinking with every answer) times the surprise; the question's
+    difficulty moves the other way by ``question_k``, which calibrates the
+    shared ``question_bank`` over time. A technology ends once the estimate
+    stops moving (``convergence`` Elo points) after ``min_questions``
+    answers, or at ``max_questions``.
+    """
+
+    def __init__(self, db, k: float = 120.0, question_k: float = 16.0, min_questions: int = 2,
+                 max_questions: int = 3, convergence: float = 20.0, search_width: float = 150.0):
+        self.bank = db.question_bank
+        self.k = k
+        self.question_k = question_k
+        self.min_questions = min_questions
+        self.max_questions = max_questions
+        self.convergence = convergence
+        self.search_width = search_width
+
+    @staticmethod
+    def expected_score(ability: float, difficulty: float) -> float:
+        return 1.0 / (1.0 + 10 ** ((difficulty - ability) / 400.0))
+
+    @staticmethod
+    def level_for(ability: float) -> str:
+        """Proficiency band whose anchor is closest to ``ability``"""
+        return min(LEVEL_RATINGS, key=lambda level: abs(LEVEL_RATINGS[level] - ability))
+
+    def ability(self, tech: dict) -> float:
+        return tech.get("ability", LEVEL_RATINGS.get(tech["proficiency"], LEVEL_RATINGS["Intermediate"]))
+
+    def update(self, tech: dict, rating: float) -> float:
+        """Fold one answer into the tech plan entry; returns the ability change"""
+        ability = self.ability(tech)
+        difficulty = tech.get("difficulty", ability)
+        answers = tech.get("answers", 0)
+
+        surprise = rating / 10.0 - self.expected_score(ability, difficulty)
+        delta = self.k / (1 + 0.5 * answers) * surprise
+        tech["ability"] = round(ability + delta, 1)
+        tech["answers"] = answers + 1
+        tech["last_delta"] = round(delta, 1)
+
+        if tech.get("question_id"):
+            try:
+                self.bank.update_one(
+                    {"_id": tech["question_id"]},
+                    {"$inc": {"difficulty": -self.question_k * surprise, "answers": 1}}
+                )
+            except PyMongoError as e:
+                print(f"[ERROR] Error calibrating question: {e}")
+        return delta
+
+    def converged(self, tech: dict) -> bool:
+        answers = tech.get("answers", 0)
+        if answers >= self.max_questions:
+            return True
+        return answers >= self.min_questions and abs(tech.get("last_delta", self.convergence)) < self.convergence
+
+    def question_range(self) -> Tuple[int, int]:
+        """Fewest and most questions asked about one technology"""
+        return min(self.min_questions, self.max_questions), self.max_questions
+
+    def pick_question(self, technology: str, ability: float,
+                      is_repeat: Callable[[str], bool]) -> Optional[Tuple[str, str, float]]:
+        """Closest-difficulty calibrated question not yet asked: (id, text, difficulty)"""
+        # Walk the (technology, difficulty) index outwards from the target in
+        # both directions, so the nearest questions are read first
+        above = self.bank.find(
+            {"technology": technology, "difficulty": {"$gte": ability, "$lte": ability + self.search_width}},
+            {"text": 1, "difficulty": 1}
+        ).sort("difficulty", 1).limit(25)
+        below = self.bank.find(
+            {"technology": technology, "difficulty": {"$gte": ability - self.search_width, "$lt": ability}},
+            {"text": 1, "difficulty": 1}
+        ).sort("difficulty", -1).limit(25)
+        candidates = list(above) + list(below)
+        for doc in sorted(candidates, key=lambda doc: abs(doc["difficulty"] - ability)):
+            if not is_repeat(doc["text"]):
+                return doc["_id"], doc["text"], doc["difficulty"]
+        return None
+
+    def register_question(self, technology: str, proficiency: str, question_text: str) -> Tuple[str, float]:
+        """Add a generated question to the bank at its level's difficulty; returns (id, difficulty)"""
+        key = question_key(technology, question_text)
+        difficulty = LEVEL_RATINGS.get(proficiency, LEVEL_RATINGS["Intermediate"])
+        try:
+            doc = self.bank.find_one_and_update(
+                {"_id": key},
+                {"$setOnInsert": {"technology": technology, "text": question_text,
+                                  "difficulty": difficulty, "answers": 0}},
+                upsert=True,
+                projection={"difficulty": 1},
+                return_document=ReturnDocument.AFTER
+            )
+            difficulty = doc.get("difficulty", difficulty) if doc else difficulty
+        except PyMongoError as e:
+            print(f"[ERROR] Error registering question: {e}")
+        return key, difficulty
@@ -0,0 +1,112 @@
+# services/archive_service.py
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+import bson
+from bson.binary import Binary
+
+try:
+    import zstandard
+except ImportError:  # zlib is used when zstandard is not installed
+    zstandard = None
+
+# Fields left on the hot document of an archived session: enough for
+# listings, rankings, exports of totals and the live dashboard
+STUB_FIELDS = [
+    "session_id", "candidate_id", "status", "tech_plan", "tech_ratings", "started_at", "completed_at",
+    "average_rating", "total_points", "max_possible_points", "total_rating_display",
+]
+
+
+class ArchiveService:
+    """Moves old completed sessions out of the hot ``interview_sessions`` collection.
+
+    The full document is BSON-encoded, compressed (zstd, or zlib without
+    the ``zstandard`` package) and stored in ``interview_sessions_archive``
+    under the session id; the hot document is shrunk to a stub with
+    ``archived: True``. ``load`` restores the original document.
+    """
+
+    def __init__(self, db, compression_level: int = 9):
+        self.sessions = db.interview_sessions
+        self.archive = db.interview_sessions_archive
+        self.compression_level = compression_level
+
+    def _compress(self, data: bytes) -> tuple:
+        if zstandard is not None:
+            return "zstd", zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+        return "zlib", zlib.compress(data, self.compression_level)
+
+    @staticmethod
+    def _decompress(codec: str, data: bytes) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read this archived session")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def archive_session(self, doc: dict) -> Optional[int]:
+        """Archive one full session document; returns the compressed size, or None if it changed meanwhile"""
+        doc.pop("_id", None)
+        codec, data = self._compress(bson.encode(doc))
+        # Write the archive copy first: if the job stops in between, the
+        # session is still complete in the hot collection and is simply
+        # archived again on the next run
+        self.archive.replace_one(
+            {"_id": doc["session_id"]},
+            {
+                "_id": doc["session_id"],
+                "candidate_id": doc.get("candidate_id"),
+                "completed_at": doc.get("completed_at"),
+                "archived_at": datetime.utcnow(),
+                "codec": codec,
+                "data": Binary(data),
+            },
+            upsert=True
+        )
+        # Only replace the document that was read: an LLM regrade written in
+        # between changes answer_ratings, and the next run archives it again
+        result = self.sessions.replace_one(
+            {"session_id": doc["session_id"], "answer_ratings": doc.get("answer_ratings"),
+             "archived": {"$ne": True}},
+            {
+                **{field: doc[field] for field in STUB_FIELDS if field in doc},
+                "archived": True,
+                "archived_at": datetime.utcnow(),
+                "message_count": len(doc.get("conversation_history", [])),
+            }
+        )
+        if not result.matched_count:
+            print(f"[DEBUG] Session {doc['session_id']} changed while archiving; skipped")
+            return None
+        return len(data)
+
+    def archive_completed(self, older_than_days: int = 30, limit: Optional[int] = None) -> dict:
+        """Archive sessions completed more than ``older_than_days`` ago"""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        cursor = self.sessions.find(
+            {"status": "completed", "completed_at": {"$lt": cutoff}, "archived": {"$ne": True}},
+            batch_size=50
+        )
+        if limit:
+            cursor = cursor.limit(limit)
+
+        stats = {"sessions": 0, "raw_bytes": 0, "archived_bytes": 0, "skipped": 0}
+        for doc in cursor:
+            raw_bytes = len(bson.encode(doc))
+            archived_bytes = self.archive_session(doc)
+            if archived_bytes is None:
+                stats["skipped"] += 1
+                continue
+            stats["raw_bytes"] += raw_bytes
+            stats["archived_bytes"] += archived_bytes
+            stats["sessions"] += 1
+        return stats
+
+    def load(self, session_id: str) -> Optional[dict]:
+        """The full, original document of an archived session"""
+        entry = self.archive.find_one({"_id": session_id})
+        if not entry:
+            return None
+        return bson.decode(self._decompress(entry["codec"], bytes(entry["data"])))
@@ -1,10 +1,13 @@
 from models.candidate import Candidate
+from services.tech_plan import build_tech_plan
+from database.durability import with_tier, DURABLE
 from typing import Optional, List
 
 class CandidateService:
     def __init__(self, db):
         self.db = db
-        self.collection = db.candidates
+        # Profiles are written once per candidate; keep them through a failover
+        self.collection = with_tier(db.candidates, DURABLE)
 
     def create_candidate(self, candidate_data: dict) -> str:
         """Create new candidate profile"""
@@ -23,6 +26,6 @@ class CandidateService:
         """Update candidate's tech stack"""
         result = self.collection.update_one(
             {"candidate_id": candidate_id},
-            {"$set": {"tech_stack": tech_stack}}
+            {"$set": {"tech_stack": tech_stack, "tech_plan": build_tech_plan(tech_stack)}}
         )
         return result
@@ -0,0 +1,257 @@
+# services/cluster.py
+import os
+import bisect
+import socket
+import hashlib
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from services.shared_store import SharedStore
+
+NODE_PREFIX = "node:"
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes.
+
+    Adding or removing a node only moves the sessions on the ring segments
+    next to its virtual nodes, about 1/N of all sessions.
+    """
+
+    def __init__(self, nodes: Optional[List[str]] = None, vnodes: int = 100):
+        self.vnodes = vnodes
+        self._hashes: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes or []:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def add(self, node: str):
+        for i in range(self.vnodes):
+            point = self._hash(f"{node}#{i}")
+            if point not in self._owners:
+                bisect.insort(self._hashes, point)
+                self._owners[point] = node
+
+    def remove(self, node: str):
+        self._hashes = [point for point in self._hashes if self._owners[point] != node]
+        self._owners = {point: self._owners[point] for point in self._hashes}
+
+    def node_for(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._owners[self._hashes[index]]
+
+    @property
+    def nodes(self) -> set:
+        return set(self._owners.values())
+
+
+class SessionBusyError(Exception):
+    """Raised when a session is still owned by another live replica"""
+
+
+class ClusterNode:
+    """Membership, session affinity and session handoff for one replica.
+
+    Replicas heartbeat into the shared store; the live ones form a hash ring
+    that assigns each session a home replica. ``route`` tells the app where
+    to send a client on first contact: the replica holding the session's
+    lease, or else its ring home. A replica only runs turns for sessions it
+    holds a lease on, so a session's in-memory state lives on one replica at
+    a time. Leases of sessions with a turn in the last ``idle_release``
+    seconds are renewed with the heartbeat; idle sessions are flushed and
+    released, and when a replica dies its leases expire after ``lease_ttl``
+    and it drops out of the ring. The next replica to see the session
+    reloads it from Mongo.
+    """
+
+    def __init__(self, store: SharedStore, node_id: Optional[str] = None, url: str = "",
+                 heartbeat_interval: float = 5.0, lease_ttl: float = 15.0, idle_release: float = 300.0):
+        self.store = store
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.url = url
+        self.heartbeat_interval = heartbeat_interval
+        self.lease_ttl = lease_ttl
+        self.idle_release = idle_release
+        self.ring = HashRing([self.node_id])
+        self.nodes: Dict[str, dict] = {}
+        self.on_release: Optional[Callable[[str], None]] = None  # Flush and evict a handed-off session
+        self.on_lost: Optional[Callable[[str], None]] = None     # Drop a session whose lease was taken over
+        self._owned = set()
+        self._active: Dict[str, int] = {}  # session_id -> turns running on this node
+        self._last_used: Dict[str, float] = {}  # session_id -> monotonic time its last turn ended
+        self._releasing = set()  # Sessions being flushed and handed off right now
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, store: SharedStore) -> "ClusterNode":
+        return cls(
+            store,
+            node_id=os.getenv("NODE_ID") or None,
+            url=os.getenv("NODE_URL", ""),
+            lease_ttl=float(os.getenv("SESSION_LEASE_TTL", "15")),
+            idle_release=float(os.getenv("SESSION_HANDOFF_IDLE", "300")),
+        )
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.heartbeat()
+        self._thread = threading.Thread(target=self._run, name="cluster-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Leave the cluster, handing every owned session back"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.heartbeat_interval * 2)
+        for session_id in list(self._owned):
+            self.release(session_id)
+        self.store.delete(f"{NODE_PREFIX}{self.node_id}")
+
+    def _run(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                print(f"[ERROR] Cluster heartbeat failed: {e}")
+
+    def heartbeat(self):
+        """Announce this node, renew the leases of sessions in use and hand off idle ones"""
+        self.store.set(f"{NODE_PREFIX}{self.node_id}", {"url": self.url, "sessions": len(self._owned)},
+                       ttl=self.lease_ttl)
+        self.nodes = {key[len(NODE_PREFIX):]: value for key, value in self.store.scan(NODE_PREFIX).items()}
+        self.nodes.setdefault(self.node_id, {"url": self.url})
+        if set(self.nodes) != self.ring.nodes:
+            self.ring = HashRing(sorted(self.nodes))
+            print(f"[DEBUG] Cluster ring: {sorted(self.nodes)}")
+
+        now = time.monotonic()
+        for session_id in list(self._owned):
+            if now - self._last_used.get(session_id, now) >= self.idle_release:
+                self.release(session_id, only_idle=True)
+            elif not self.store.acquire_lease(f"session:{session_id}", self.node_id, self.lease_ttl):
+                # Another replica took over (e.g. after a pause in this one);
+                # buffered changes must not be written over its progress
+                with self._lock:
+                    self._owned.discard(session_id)
+                    self._last_used.pop(session_id, None)
+                if self.on_lost:
+                    self.on_lost(session_id)
+
+    def can_reap(self, session_id: str) -> bool:
+        """Whether this replica may pause the session: no other replica holds it and no turn is running here"""
+        owner = self.store.lease_owner(f"session:{session_id}")
+        if owner is None:
+            return True
+        return owner == self.node_id and not self._active.get(session_id)
+
+    def owner_url(self, session_id: str) -> str:
+        """URL of the live replica holding the session's lease, if another one does"""
+        owner = self.store.lease_owner(f"session:{session_id}")
+        if not owner or owner == self.node_id:
+            return ""
+        return self.nodes.get(owner, {}).get("url", "")
+
+    def home_node(self, session_id: str) -> Optional[str]:
+        return self.ring.node_for(session_id)
+
+    def route(self, session_id: str) -> str:
+        """URL of the replica a client of the session belongs on, or "" to serve it here.
+
+        The lease holder wins, so a session in use is never split; a free
+        session goes to its ring home if that replica can be reached.
+        """
+        owner = self.store.lease_owner(f"session:{session_id}")
+        if owner:
+            return self.owner_url(session_id)
+        home = self.home_node(session_id)
+        if not home or home == self.node_id:
+            return ""
+        return self.nodes.get(home, {}).get("url", "")
+
+    def new_session_id(self, attempts: int = 64) -> str:
+        """A fresh session id whose ring home is this replica, so it never needs a redirect"""
+        session_id = uuid.uuid4().hex
+        for _ in range(attempts):
+            if self.home_node(session_id) == self.node_id:
+                break
+            session_id = uuid.uuid4().hex
+        return session_id
+
+    def owns(self, session_id: str) -> bool:
+        return session_id in self._owned
+
+    def claim(self, session_id: str, timeout: Optional[float] = None) -> bool:
+        """Take the session's lease, waiting for a previous owner to hand it off.
+
+        Returns True if this replica just acquired the session (its
+        in-memory state must be rebuilt from Mongo), False if it already
+        owned it. Raises ``SessionBusyError`` if the lease stays taken.
+        """
+        deadline = time.monotonic() + (self.lease_ttl if timeout is None else timeout)
+        while session_id in self._releasing and time.monotonic() < deadline:
+            # A handoff of this session is still flushing; adopt it afterwards
+            time.sleep(0.05)
+        if session_id in self._owned:
+            return False
+        while True:
+            if self.store.acquire_lease(f"session:{session_id}", self.node_id, self.lease_ttl):
+                with self._lock:
+                    self._owned.add(session_id)
+                    self._last_used[session_id] = time.monotonic()
+                return True
+            if time.monotonic() >= deadline:
+                raise SessionBusyError(f"Session {session_id} is owned by {self.store.lease_owner(f'session:{session_id}')}")
+            time.sleep(0.25)
+
+    @contextmanager
+    def session(self, session_id: str):
+        """Hold a session for the duration of a turn; yields whether it was just acquired"""
+        with self._lock:
+            self._active[session_id] = self._active.get(session_id, 0) + 1
+        try:
+            yield self.claim(session_id)
+        finally:
+            with self._lock:
+                self._active[session_id] -= 1
+                if not self._active[session_id]:
+                    del self._active[session_id]
+                if session_id in self._owned:
+                    self._last_used[session_id] = time.monotonic()
+
+    def release(self, session_id: str, only_idle: bool = False) -> bool:
+        """Flush and give up a session so another replica can take it.
+
+        With ``only_idle`` nothing happens while a turn is running; the check
+        and the ownership change are atomic, so a turn starting meanwhile
+        waits in ``claim`` for the flush and then adopts the session again.
+        """
+        with self._lock:
+            if only_idle and self._active.get(session_id):
+                return False
+            self._owned.discard(session_id)
+            self._last_used.pop(session_id, None)
+            self._releasing.add(session_id)
+        try:
+            if self.on_release:
+                try:
+                    self.on_release(session_id)
+                except Exception as e:
+                    print(f"[ERROR] Error handing off session {session_id}: {e}")
+            self.store.release_lease(f"session:{session_id}", self.node_id)
+        finally:
+            with self._lock:
+                self._releasing.discard(session_id)
+        return True
@@ -0,0 +1,179 @@
+# services/container.py
+import os
+import threading
+
+
+def env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+class ServiceContainer:
+    """Builds the app's services on first use.
+
+    Importing this module is cheap: service modules (and pymongo, requests,
+    pydantic behind them) are imported inside the properties, so the first
+    page renders before the interview stack is loaded. ``start_background``
+    connects to Mongo and warms up Ollama off the request path.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._services = {}
+
+    def _get(self, name: str, build):
+        service = self._services.get(name)
+        if service is None and name not in self._services:
+            with self._lock:
+                if name not in self._services:
+                    self._services[name] = build()
+                service = self._services[name]
+        return service
+
+    def start_background(self):
+        """Connect to Mongo and keep the LLM loaded without blocking startup"""
+        from database.connection import connect_in_background
+        connect_in_background()
+        threading.Thread(target=self._start_workers, name="service-start", daemon=True).start()
+
+    def _start_workers(self):
+        self.llama_service.start_keep_warm()
+        if self.reaper:
+            self.reaper.start()
+        if self.metrics_publisher:
+            self.metrics_publisher.start()
+
+    @property
+    def db(self):
+        def build():
+            from database.connection import get_database
+            return get_database(verify=False)
+        return self._get("db", build)
+
+    @property
+    def llama_service(self):
+        def build():
+            from services.llama_service import LlamaService
+            return LlamaService()
+        return self._get("llama_service", build)
+
+    @property
+    def candidate_service(self):
+        def build():
+            from services.candidate_service import CandidateService
+            return CandidateService(self.db)
+        return self._get("candidate_service", build)
+
+    @property
+    def state_store(self):
+        def build():
+            if not env_flag("SESSION_WRITE_BEHIND", "true"):
+                return None
+            from services.session_state import SessionStateStore
+            store = SessionStateStore(self.db.interview_sessions,
+                                      flush_interval=float(os.getenv("SESSION_FLUSH_INTERVAL", "1.0")))
+            store.start()
+            return store
+        return self._get("state_store", build)
+
+    @property
+    def ranking_service(self):
+        def build():
+            from services.ranking_service import RankingService
+            return RankingService(self.db)
+        return self._get("ranking_service", build)
+
+    @property
+    def grading_service(self):
+        def build():
+            if not env_flag("LLM_GRADING", "false"):
+                return None
+            from services.grading_service import GradingService
+            grading_service = GradingService.from_env(self.db, self.llama_service, self.state_store,
+                                                      self.ranking_service)
+            grading_service.start()
+            return grading_service
+        return self._get("grading_service", build)
+
+    @property
+    def cluster(self):
+        def build():
+            if not env_flag("CLUSTER_MODE", "false"):
+                return None
+            from services.cluster import ClusterNode
+            from services.shared_store import LocalSharedStore, MongoSharedStore
+            if os.getenv("SHARED_STORE", "mongo") == "local":
+                store = LocalSharedStore()
+            else:
+                store = MongoSharedStore(self.db.cluster_state)
+            node = ClusterNode.from_env(store)
+            node.start()
+            return node
+        return self._get("cluster", build)
+
+    @property
+    def interview_service(self):
+        def build():
+            from services.interview_service import InterviewService
+            from services.rating_service import RatingService
+            from services.archive_service import ArchiveService
+            return InterviewService(self.db, self.llama_service, self.candidate_service, self.grading_service,
+                                    self.state_store, rating_service=RatingService(self.db),
+                                    ranking_service=self.ranking_service, cluster=self.cluster,
+                                    archive_service=ArchiveService(self.db),
+                                    session_service=self.session_service, adaptive_engine=self.adaptive_engine)
+        return self._get("interview_service", build)
+
+    @property
+    def adaptive_engine(self):
+        def build():
+            if not env_flag("ADAPTIVE_DIFFICULTY", "true"):
+                return None
+            from services.adaptive_engine import AdaptiveEngine
+            return AdaptiveEngine(self.db, min_questions=int(os.getenv("ADAPTIVE_MIN_QUESTIONS", "2")))
+        return self._get("adaptive_engine", build)
+
+    @property
+    def session_service(self):
+        def build():
+            from services.session_service import SessionService
+            return SessionService(self.db)
+        return self._get("session_service", build)
+
+    @property
+    def reaper(self):
+        def build():
+            if not env_flag("SESSION_REAPER", "true"):
+                return None
+            from datetime import timedelta
+            from services.session_service import SessionReaper
+            return SessionReaper(
+                self.session_service,
+                idle_after=timedelta(minutes=float(os.getenv("SESSION_IDLE_MINUTES", "30"))),
+                expire_after=timedelta(days=float(os.getenv("SESSION_EXPIRE_DAYS", "7"))),
+                on_paused=self.interview_service.release_session,
+                can_pause=self.cluster.can_reap if self.cluster else None
+            )
+        return self._get("reaper", build)
+
+    @property
+    def metrics_publisher(self):
+        def build():
+            interval = float(os.getenv("LLM_METRICS_INTERVAL", "10"))
+            if interval <= 0:
+                return None
+            from services.metrics_publisher import MetricsPublisher
+            from services.shared_store import MongoSharedStore
+            return MetricsPublisher(self.cluster.store if self.cluster else MongoSharedStore(self.db.cluster_state),
+                                    self.llama_service, node_id=self.cluster.node_id if self.cluster else None,
+                                    interval=interval)
+        return self._get("metrics_publisher", build)
+
+    @property
+    def turn_workers(self):
+        def build():
+            if not env_flag("ASYNC_SUBMIT", "true"):
+                return None
+            from services.turn_worker import TurnWorkerPool
+            return TurnWorkerPool(self.interview_service.process_user_input,
+                                  max_workers=int(os.getenv("TURN_WORKERS", "4")))
+        return self._get("turn_workers", build)
@@ -0,0 +1,236 @@
+# services/grading_service.py
+import os
+import time
+import queue
+import threading
+from typing import List, Optional
+
+from models.common import LLMPriority
+from services.llama_service import LlamaService
+from services.session_state import SessionStateStore
+from services.rating_service import tech_key
+from services.ranking_service import RankingService
+from database.durability import with_tier, DURABLE
+
+
+class GradingJob:
+    __slots__ = ("session_id", "answer_id", "question", "answer", "technology", "proficiency", "heuristic_rating",
+                 "attempts", "grade")
+
+    def __init__(self, session_id: str, answer_id: str, question: str, answer: str,
+                 technology: str, proficiency: str, heuristic_rating: float):
+        self.session_id = session_id
+        self.answer_id = answer_id
+        self.question = question
+        self.answer = answer
+        self.technology = technology
+        self.proficiency = proficiency
+        self.heuristic_rating = heuristic_rating
+        self.attempts = 0
+        self.grade: Optional[float] = None  # LLM grade, kept while its write-back is retried
+
+
+class GradingService:
+    """Asynchronous, batched LLM grading of answers.
+
+    The interview keeps using the heuristic score for the live turn; answers
+    queued here are re-graded in the background at BATCH priority and the
+    LLM score replaces the heuristic one in ``answer_ratings`` and
+    ``total_points``. Write-back is conditional on the answer not having
+    been graded yet, so replays and duplicate submissions are harmless.
+    """
+
+    def __init__(self, db, llama_service: LlamaService, batch_size: int = 4, max_wait: float = 5.0,
+                 min_interval: float = 2.0, max_queue: int = 1000, state_store: Optional[SessionStateStore] = None,
+                 ranking_service: Optional[RankingService] = None):
+        # Rating write-backs change final scores
+        self.collection = with_tier(db.interview_sessions, DURABLE)
+        self.llama_service = llama_service
+        self.state_store = state_store
+        self.ranking_service = ranking_service  # Regrades of completed sessions re-rank the candidate
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait          # Seconds to wait for a batch to fill up
+        self.min_interval = min_interval  # Minimum seconds between two grading calls
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"queued": 0, "dropped": 0, "graded": 0, "failed": 0, "batches": 0}
+
+    @classmethod
+    def from_env(cls, db, llama_service: LlamaService,
+                 state_store: Optional[SessionStateStore] = None,
+                 ranking_service: Optional[RankingService] = None) -> "GradingService":
+        return cls(
+            db,
+            llama_service,
+            state_store=state_store,
+            ranking_service=ranking_service,
+            batch_size=int(os.getenv("LLM_GRADING_BATCH_SIZE", "4")),
+            min_interval=float(os.getenv("LLM_GRADING_MIN_INTERVAL", "2.0")),
+        )
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="llm-grader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def submit(self, session_id: str, answer_id: str, question: str, answer: str,
+               technology: str, proficiency: str, heuristic_rating: float) -> bool:
+        """Queue an answer for LLM grading; returns False if the queue is full"""
+        job = GradingJob(session_id, answer_id, question, answer, technology, proficiency, heuristic_rating)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            # The heuristic score simply stays in place
+            self.stats["dropped"] += 1
+            return False
+        self.stats["queued"] += 1
+        return True
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        last_batch = 0.0
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+
+            # Throughput controls: keep a gap between grading calls and never
+            # compete with a candidate who is waiting for a question.
+            wait = self.min_interval - (time.monotonic() - last_batch)
+            if wait > 0:
+                self._stop.wait(wait)
+            self._yield_to_live_traffic()
+
+            last_batch = time.monotonic()
+            self.grade_batch(batch)
+
+    def _next_batch(self) -> List[GradingJob]:
+        try:
+            batch = [self._queue.get(timeout=1.0)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _yield_to_live_traffic(self):
+        scheduler = self.llama_service.scheduler
+        while not self._stop.is_set() and (scheduler.waiting(LLMPriority.PREFETCH) or scheduler.saturated()):
+            self._stop.wait(0.5)
+
+    def grade_batch(self, batch: List[GradingJob]):
+        # Jobs re-queued only for their write-back already carry a grade
+        ungraded = [job for job in batch if job.grade is None]
+        if ungraded:
+            try:
+                grades = self.llama_service.grade_answers([
+                    {
+                        "question": job.question,
+                        "answer": job.answer,
+                        "technology": job.technology,
+                        "proficiency": job.proficiency,
+                    }
+                    for job in ungraded
+                ], priority=LLMPriority.BATCH)
+                self.stats["batches"] += 1
+            except Exception as e:
+                print(f"[ERROR] LLM grading failed: {e}")
+                self.stats["failed"] += len(ungraded)
+                batch = [job for job in batch if job.grade is not None]
+            else:
+                for job, grade in zip(ungraded, grades):
+                    job.grade = grade
+
+        for job in batch:
+            if job.grade is None:
+                self.stats["failed"] += 1
+                continue
+            try:
+                if self._write_back(job, job.grade):
+                    self.stats["graded"] += 1
+                elif job.attempts < 3 and not self._is_persisted(job):
+                    # The rating may still be waiting in the write-behind
+                    # buffer; retry the write-back (not the grading) later
+                    job.attempts += 1
+                    try:
+                        self._queue.put_nowait(job)
+                    except queue.Full:
+                        self.stats["dropped"] += 1
+            except Exception as e:
+                print(f"[ERROR] Error writing LLM grade: {e}")
+                self.stats["failed"] += 1
+
+    def _is_persisted(self, job: GradingJob) -> bool:
+        return self.collection.count_documents(
+            {"session_id": job.session_id, "answer_ratings.answer_id": job.answer_id}, limit=1
+        ) > 0
+
+    def _write_back(self, job: GradingJob, llm_rating: float) -> bool:
+        """Replace the heuristic rating with the LLM rating, at most once per answer"""
+        key = tech_key(job.technology)
+        result = self.collection.update_one(
+            {
+                "session_id": job.session_id,
+                "answer_ratings": {"$elemMatch": {"answer_id": job.answer_id, "llm_rating": {"$exists": False}}}
+            },
+            {
+                "$set": {
+                    "answer_ratings.$.rating": llm_rating,
+                    "answer_ratings.$.llm_rating": llm_rating,
+                    "answer_ratings.$.heuristic_rating": job.heuristic_rating,
+                    "answer_ratings.$.graded_by": "llm"
+                },
+                # Per-technology aggregates follow the new rating; min/max can
+                # only widen, so a replaced extreme stays until recomputed
+                "$inc": {
+                    "total_points": llm_rating - job.heuristic_rating,
+                    f"tech_ratings.{key}.sum": llm_rating - job.heuristic_rating,
+                    f"tech_ratings.{key}.sum_sq": llm_rating ** 2 - job.heuristic_rating ** 2
+                },
+                "$min": {f"tech_ratings.{key}.min": llm_rating},
+                "$max": {f"tech_ratings.{key}.max": llm_rating}
+            }
+        )
+        if not result.modified_count:
+            return False
+        if self.state_store:
+            self.state_store.adjust_points(job.session_id, llm_rating - job.heuristic_rating)
+            self.state_store.adjust_rating(job.session_id, key, job.heuristic_rating, llm_rating)
+
+        # Derived fields follow the new total
+        self.collection.update_one(
+            {"session_id": job.session_id},
+            [{"$set": {
+                "average_rating": {"$cond": [
+                    {"$gt": ["$max_possible_points", 0]},
+                    {"$multiply": [{"$divide": ["$total_points", "$max_possible_points"]}, 10]},
+                    0
+                ]},
+                "total_rating_display": {"$concat": [
+                    {"$toString": {"$round": ["$total_points", 0]}},
+                    "/",
+                    {"$toString": {"$round": ["$max_possible_points", 0]}}
+                ]}
+            }}]
+        )
+        if self.ranking_service:
+            self.ranking_service.refresh(job.session_id)
+        return True
@@ -1,31 +1,62 @@
 # services/interview_service.py
 from services.llama_service import LlamaService
 from services.candidate_service import CandidateService
+from services.grading_service import GradingService
+from services.tech_plan import build_tech_plan
+from services.rating_service import RatingService, tech_key, tech_stats
+from services.ranking_service import RankingService
+from services.cluster import ClusterNode, SessionBusyError
+from services.archive_service import ArchiveService
+from services.session_service import SessionService
+from services.adaptive_engine import AdaptiveEngine
+from services.session_state import SessionState, SessionStateStore, STATE_PROJECTION
+from database.durability import with_tier, FAST, DURABLE
 from models.interview import InterviewSession, ConversationMessage
-from models.common import ProficiencyLevel
-from typing import List, Dict, Optional
+from models.records import MessageRecord, AnswerRatingRecord
+from models.common import ProficiencyLevel, LLMPriority
+from typing import List, Dict, Optional, Tuple
 import uuid
+import threading
 from datetime import datetime
 import traceback
 
 class InterviewService:
-    def __init__(self, db, llama_service: LlamaService, candidate_service: CandidateService):
+    def __init__(self, db, llama_service: LlamaService, candidate_service: CandidateService,
+                 grading_service: Optional[GradingService] = None, state_store: Optional[SessionStateStore] = None,
+                 rating_service: Optional[RatingService] = None, ranking_service: Optional[RankingService] = None,
+                 cluster: Optional[ClusterNode] = None, archive_service: Optional[ArchiveService] = None,
+                 session_service: Optional[SessionService] = None, adaptive_engine: Optional[AdaptiveEngine] = None):
         self.db = db
         self.collection = db.interview_sessions
+        # Per-turn writes acknowledge fast; session creation and completion wait for a majority
+        self.fast_collection = with_tier(self.collection, FAST)
+        self.durable_collection = with_tier(self.collection, DURABLE)
         self.llama_service = llama_service
         self.candidate_service = candidate_service
+        self.grading_service = grading_service
+        self.state_store = state_store  # Write-behind session state; None writes every turn through
+        self.rating_service = rating_service
+        self.ranking_service = ranking_service
+        self.cluster = cluster  # Session ownership across replicas; None on a single node
+        self.archive_service = archive_service  # Read-through for archived sessions
+        self.session_service = session_service or SessionService(db)
+        self.adaptive_engine = adaptive_engine  # None keeps three questions per technology
+        if cluster:
+            cluster.on_release = self._hand_off
+            cluster.on_lost = self._forget_session
 
     def start_interview(self, candidate_id: str) -> str:
         """Start interview and generate first question"""
         try:
             print(f"[DEBUG] Starting interview for candidate: {candidate_id}")
-            session_id = uuid.uuid4().hex
+            session_id = self.cluster.new_session_id() if self.cluster else uuid.uuid4().hex
             
             candidate = self.candidate_service.get_candidate(candidate_id)
             if not candidate or not candidate.tech_stack:
                 return "Error: No candidate tech stack found."
             
-            tech_plan = self._build_tech_plan(candidate.tech_stack)
+            # Candidates imported in bulk come with a pre-built plan
+            tech_plan = [dict(tech) for tech in candidate.tech_plan] or self._build_tech_plan(candidate.tech_stack)
             
             if not tech_plan:
                 return "Error: No technologies found."
@@ -44,31 +75,23 @@ class InterviewService:
                 "current_tech_index": 0,
                 "conversation_history": [],
                 "started_at": datetime.utcnow(),
+                "last_activity_at": datetime.utcnow(),
                 "total_points": 0.0,
                 "max_possible_points": 0.0,
                 "answer_ratings": [],
                 "tech_ratings": {}
             }
             
-            session = InterviewSession(**session_data)
-            self.collection.insert_one(session.model_dump())
-            
-            # Generate first question
+            # Generate the static questions (first and final) of the first
+            # technology in one call; the rest of the plan is prefetched in
+            # the background with a second call.
             current_tech = tech_plan[0]
-            print(f"[DEBUG] Generating first question for {current_tech['name']}")
+            print(f"[DEBUG] Generating first questions for {current_tech['name']}")
             
-            first_question = self.generate_question(
-                technology=current_tech["name"], 
-                proficiency=current_tech["proficiency"], 
-                session_id=session_id
-            )
-            
-            # Update question count - start with 0, will increment to 1 after first answer
-            tech_plan[0]["questions_asked"] = 0
-            self.collection.update_one(
-                {"session_id": session_id},
-                {"$set": {"tech_plan": tech_plan}}
-            )
+            planned = self._generate_planned_questions(tech_plan[:1], session_id, LLMPriority.INTERACTIVE)
+            session_data["planned_questions"] = planned
+            first_question = planned["0"]["first"]
+            self._track_question(current_tech, first_question, current_tech["proficiency"])
             
             welcome_content = f"""🎯 **Technical Interview Started**
 
@@ -76,14 +99,35 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
 
 **Starting with {current_tech['name']}** (Level: {current_tech['proficiency']})
 
-**Question 1/3:** {first_question}"""
+**{self._question_heading(1)}:** {first_question}"""
             
-            self.add_message(session_id, ConversationMessage(
+            # The session is created with its welcome message in one insert
+            session_data["conversation_history"] = [ConversationMessage(
                 role="assistant",
                 content=welcome_content,
                 timestamp=datetime.utcnow(),
                 technology=current_tech["name"]
-            ))
+            )]
+            session = InterviewSession(**session_data)
+            self.durable_collection.insert_one(session.model_dump())
+            
+            if self.cluster:
+                self.cluster.claim(session_id)
+            if self.state_store:
+                self.state_store.put(SessionState(
+                    session_id=session_id,
+                    candidate_id=candidate_id,
+                    tech_plan=tech_plan,
+                    planned_questions=planned,
+                    last_question=welcome_content
+                ))
+            
+            if len(tech_plan) > 1:
+                threading.Thread(
+                    target=self._prefetch_planned_questions,
+                    args=(session_id, tech_plan),
+                    daemon=True
+                ).start()
             
             print(f"[DEBUG] Interview started successfully: {session_id}")
             return session_id
@@ -93,29 +137,96 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             print(f"[ERROR] Traceback: {traceback.format_exc()}")
             return f"Error starting interview: {str(e)}"
 
+    def _generate_planned_questions(self, tech_plan: List[Dict], session_id: str, priority: LLMPriority,
+                                    offset: int = 0) -> Dict[str, Dict[str, str]]:
+        """Generate first and final questions for each technology with one batched LLM call"""
+        if priority == LLMPriority.INTERACTIVE and not self.llama_service.is_ready():
+            # Don't keep the candidate waiting on a model load
+            print(f"[DEBUG] Model not ready, using cached questions")
+            return {
+                str(offset + i): {
+                    "first": self._cold_question(tech["name"], tech["proficiency"], session_id),
+                    "final": self._cold_question(tech["name"], tech["proficiency"], session_id)
+                }
+                for i, tech in enumerate(tech_plan)
+            }
+        
+        items = []
+        for tech in tech_plan:
+            items.append((tech["name"], tech["proficiency"]))  # first question
+            items.append((tech["name"], tech["proficiency"]))  # final question
+        
+        questions = self.llama_service.generate_question_batch(items, session_id=session_id, priority=priority)
+        
+        planned = {}
+        for i, tech in enumerate(tech_plan):
+            first, final = questions[2 * i], questions[2 * i + 1]
+            planned[str(offset + i)] = {
+                "first": first["question_text"],
+                "final": final["question_text"]
+            }
+        return planned
+
+    def _prefetch_planned_questions(self, session_id: str, tech_plan: List[Dict]):
+        """Background prefetch of the static questions for the remaining technologies"""
+        try:
+            planned = self._generate_planned_questions(tech_plan[1:], session_id, LLMPriority.PREFETCH, offset=1)
+            if self.state_store:
+                state = self.state_store.get(session_id)
+                if state:
+                    state.planned_questions.update(planned)
+            self.fast_collection.update_one(
+                {"session_id": session_id},
+                {"$set": {f"planned_questions.{index}": questions for index, questions in planned.items()}}
+            )
+            print(f"[DEBUG] Prefetched questions for {len(planned)} technologies")
+        except Exception as e:
+            print(f"[ERROR] Error prefetching questions: {e}")
+
+    def _cold_question(self, technology: str, proficiency: str, session_id: str) -> str:
+        """Question served without an LLM call: a cached generated one, else a fallback"""
+        return (self.llama_service.cached_question(technology, ProficiencyLevel(proficiency), session_id)
+                or self.get_fallback_question(technology, proficiency))
+
+    def _planned_question(self, state: SessionState, tech_index: int, slot: str) -> Optional[str]:
+        """Return a pre-generated question for the technology, if one is ready"""
+        return state.planned_questions.get(str(tech_index), {}).get(slot)
+
+    def _track_question(self, tech: dict, question_text: str, level: str):
+        """Remember which bank question (and difficulty) the next answer responds to"""
+        if not self.adaptive_engine:
+            return
+        tech["question_id"], tech["difficulty"] = self.adaptive_engine.register_question(
+            tech["name"], level, question_text
+        )
+
+    def _adaptive_question(self, session_id: str, state: SessionState, tech_index: int) -> str:
+        """Question pitched at the current ability estimate: a calibrated one from the bank if possible"""
+        tech = state.tech_plan[tech_index]
+        ability = self.adaptive_engine.ability(tech)
+        picked = self.adaptive_engine.pick_question(
+            tech["name"], ability, lambda text: not self.llama_service.claim_question(session_id, text)
+        )
+        if picked:
+            tech["question_id"], question_text, tech["difficulty"] = picked
+            print(f"[DEBUG] Using bank question at difficulty {tech['difficulty']:.0f} (ability {ability:.0f})")
+            return question_text
+
+        level = self.adaptive_engine.level_for(ability)
+        planned = self._planned_question(state, tech_index, "final")
+        if planned and level == tech["proficiency"]:
+            question_text = planned
+        else:
+            question_text = self.generate_question(tech["name"], level, session_id, question_type="final")
+        self._track_question(tech, question_text, level)
+        return question_text
+
     def _build_tech_plan(self, tech_stack) -> List[Dict]:
         """Build technology plan from candidate's tech stack"""
         try:
             print(f"[DEBUG] Building tech plan from stack: {tech_stack}")
-            tech_plan = []
-            
-            for category in tech_stack:
-                print(f"[DEBUG] Processing category: {category.category if hasattr(category, 'category') else category.get('category')}")
-                technologies = category.technologies if hasattr(category, 'technologies') else category.get('technologies', [])
-                
-                for tech in technologies:
-                    name = tech.name if hasattr(tech, 'name') else tech.get('name')
-                    proficiency = tech.proficiency if hasattr(tech, 'proficiency') else tech.get('proficiency')
-                    
-                    if name and proficiency:
-                        tech_plan.append({
-                            "name": name,
-                            "proficiency": proficiency,
-                            "questions_asked": 0,
-                            "completed": False
-                        })
-                        print(f"[DEBUG] Added tech: {name} ({proficiency})")
-            
+            tech_plan = build_tech_plan(tech_stack)
+            print(f"[DEBUG] Added techs: {[(t['name'], t['proficiency']) for t in tech_plan]}")
             return tech_plan
             
         except Exception as e:
@@ -124,24 +235,110 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             return []
 
     def process_user_input(self, session_id: str, user_input: str) -> str:
+        if not self.cluster:
+            return self._pinned_turn(session_id, user_input)
+        try:
+            with self.cluster.session(session_id) as acquired:
+                if acquired:
+                    self._adopt_session(session_id)
+                return self._pinned_turn(session_id, user_input)
+        except SessionBusyError as e:
+            print(f"[ERROR] {e}")
+            owner_url = self.cluster.owner_url(session_id)
+            if owner_url:
+                return (f"⏳ Your interview is running on another server. "
+                        f"[Continue it there]({owner_url.rstrip('/')}/?session={session_id}).")
+            return "⏳ Your interview is being moved to another server. Please send your answer again in a few seconds."
+
+    def session_route(self, session_id: str) -> str:
+        """URL of the replica that should serve the session, or "" when it is this one"""
+        if not self.cluster:
+            return ""
+        try:
+            return self.cluster.route(session_id)
+        except Exception as e:
+            print(f"[ERROR] Error routing session {session_id}: {e}")
+            return ""
+
+    def _adopt_session(self, session_id: str):
+        """Take over a session from another replica: reload state and question history from Mongo"""
+        print(f"[DEBUG] Adopting session {session_id} on {self.cluster.node_id}")
+        self._forget_session(session_id)
+        docs = self.collection.aggregate([
+            {"$match": {"session_id": session_id}},
+            {"$project": {"_id": 0, "questions": {"$filter": {
+                "input": "$conversation_history", "cond": {"$eq": ["$$this.role", "assistant"]}
+            }}}},
+            {"$project": {"questions": "$questions.content"}}
+        ])
+        for doc in docs:
+            self.llama_service.seed_session(session_id, doc.get("questions", []))
+
+    def _hand_off(self, session_id: str):
+        """Write out and release a session that now belongs to another replica"""
+        if self.state_store:
+            self.state_store.evict(session_id)
+        self.llama_service.clear_session_cache(session_id)
+
+    def pause_interview(self, session_id: str) -> bool:
+        """Pause at the candidate's request; the session leaves this process's memory"""
+        self.flush_session(session_id, durable=True)
+        paused = self.session_service.pause_session(session_id)
+        self.release_session(session_id)
+        return paused
+
+    def resume_interview(self, session_id: str) -> bool:
+        return self.session_service.resume_session(session_id)
+
+    def release_session(self, session_id: str):
+        """Write out and drop a session that is no longer being worked on (paused or idle)"""
+        self._hand_off(session_id)
+        if self.cluster and self.cluster.owns(session_id):
+            self.cluster.release(session_id)
+
+    def _forget_session(self, session_id: str):
+        """Drop local copies of a session without writing them"""
+        if self.state_store:
+            self.state_store.drop(session_id)
+        self.llama_service.clear_session_cache(session_id)
+
+    def _pinned_turn(self, session_id: str, user_input: str) -> str:
+        """Run a turn with its state kept in memory until the turn's writes are recorded"""
+        if not self.state_store:
+            return self._process_turn(session_id, user_input)
+        with self.state_store.pinned(session_id):
+            return self._process_turn(session_id, user_input)
+
+    def _process_turn(self, session_id: str, user_input: str) -> str:
         try:
             print(f"[DEBUG] Processing user input for session: {session_id}")
             print(f"[DEBUG] User input: {user_input[:100]}...")
             
             # Validate session
-            session_doc = self.collection.find_one({"session_id": session_id})
-            if not session_doc:
+            state = self._load_state(session_id)
+            if not state:
                 raise ValueError("Session not found")
+            if state.status == "expired":
+                return "⌛ This interview has expired after a long pause. Please start a new interview."
+            if state.status == "paused":
+                # Answering a paused interview (e.g. one paused for being idle) resumes it
+                print(f"[DEBUG] Resuming paused session: {session_id}")
+                state.status = "active"
+                state.set("status", "active")
+                state.set("resumed_at", datetime.utcnow())
+            state.set("last_activity_at", datetime.utcnow())
 
             # Get current tech and question count
-            current_tech_index = session_doc.get("current_tech_index", 0)
-            tech_plan = session_doc.get("tech_plan", [])
+            current_tech_index = state.current_tech_index
+            tech_plan = state.tech_plan
             
             print(f"[DEBUG] Current tech index: {current_tech_index}")
             print(f"[DEBUG] Tech plan length: {len(tech_plan)}")
             
             if current_tech_index >= len(tech_plan):
-                return self._complete_interview(session_id)
+                response_text = self._complete_interview(session_id, state)
+                self._save_state(state, flush=True)
+                return response_text
 
             current_tech = tech_plan[current_tech_index]
             questions_asked = current_tech.get("questions_asked", 0)
@@ -152,82 +349,96 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             # Rate answer
             answer_rating = self._rate_answer(user_input, current_tech["name"], current_tech["proficiency"])
             print(f"[DEBUG] Answer rating: {answer_rating}")
-            
-            # Calculate totals
-            current_total = float(session_doc.get('total_points', 0))
-            current_max = float(session_doc.get('max_possible_points', 0))
-            new_total = current_total + answer_rating
-            new_max = current_max + 10
+            if self.adaptive_engine:
+                delta = self.adaptive_engine.update(current_tech, answer_rating)
+                print(f"[DEBUG] Ability {current_tech['ability']} ({delta:+.1f})")
+            
+            # Calculate totals. Stored totals are incremented rather than
+            # overwritten so asynchronous LLM grading can adjust them too.
+            state.total_points += answer_rating
+            state.max_possible_points += 10
+            new_total = state.total_points
+            new_max = state.max_possible_points
+            answer_id = uuid.uuid4().hex
 
             # Add user message
-            user_message = ConversationMessage(
+            user_message = MessageRecord(
                 role="user",
                 content=user_input,
-                timestamp=datetime.utcnow(),
                 technology=current_tech["name"]
             )
             
-            # Atomic update for message, ratings, and totals
-            update_result = self.collection.update_one(
-                {"session_id": session_id},
-                {
-                    "$push": {
-                        "conversation_history": user_message.model_dump(),
-                        "answer_ratings": {
-                            "technology": current_tech["name"],
-                            "question_number": questions_asked + 1,  # This is the question they just answered
-                            "rating": answer_rating,
-                            "timestamp": datetime.utcnow()
-                        }
-                    },
-                    "$set": {
-                        "total_points": float(new_total),
-                        "max_possible_points": float(new_max),
-                        "total_rating_display": f"{round(new_total)}/{round(new_max)}",
-                        "average_rating": float((new_total / new_max) * 10) if new_max > 0 else 0
-                    }
-                }
-            )
-
-            if not update_result.modified_count:
-                raise ValueError("Failed to update session")
+            # Message, rating and totals are recorded on the state and written
+            # together with the rest of the turn in one update
+            state.push("conversation_history", user_message.to_doc())
+            state.push("answer_ratings", AnswerRatingRecord(
+                answer_id=answer_id,
+                technology=current_tech["name"],
+                question_number=questions_asked + 1,  # This is the question they just answered
+                rating=answer_rating
+            ).to_doc())
+            state.inc("total_points", float(answer_rating))
+            state.inc("max_possible_points", 10.0)
+            self._record_tech_rating(state, current_tech["name"], answer_rating)
+            state.set("total_rating_display", f"{round(new_total)}/{round(new_max)}")
+            state.set("average_rating", float((new_total / new_max) * 10) if new_max > 0 else 0)
+
+            if self.grading_service:
+                self.grading_service.submit(
+                    session_id=session_id,
+                    answer_id=answer_id,
+                    question=self._question_text(state.last_question),
+                    answer=user_input,
+                    technology=current_tech["name"],
+                    proficiency=current_tech["proficiency"],
+                    heuristic_rating=answer_rating
+                )
 
             # Increment questions_asked AFTER processing the answer
             questions_asked += 1
             tech_plan[current_tech_index]["questions_asked"] = questions_asked
+            state.save_tech_plan()
             
             print(f"[DEBUG] Questions asked AFTER increment: {questions_asked}")
-            
-            # Update tech plan in database
-            self.collection.update_one(
-                {"session_id": session_id},
-                {"$set": {"tech_plan": tech_plan}}
-            )
 
-            # Determine next action based on question count
-            if questions_asked >= 3:
-                print(f"[DEBUG] Moving to next technology (3 questions completed)")
-                response_text = self._move_to_next_technology(session_id, session_doc, updated_tech_plan=tech_plan)
+            # Determine next action based on question count, or earlier once
+            # the adaptive ability estimate has converged
+            if questions_asked >= self._question_range()[1] or (self.adaptive_engine and self.adaptive_engine.converged(current_tech)):
+                print(f"[DEBUG] Moving to next technology ({questions_asked} questions completed)")
+                response_text = self._move_to_next_technology(session_id, state)
             else:
                 print(f"[DEBUG] Getting next question - we've answered {questions_asked} questions")
+                if questions_asked == 2 and self.adaptive_engine:
+                    planned_question = self._adaptive_question(session_id, state, current_tech_index)
+                else:
+                    planned_question = self._planned_question(state, current_tech_index, "final")
                 response_text = self._get_next_question(
                     session_id=session_id,
                     current_tech=current_tech,
                     questions_answered=questions_asked,  # FIXED: Pass questions answered, not next question number
-                    user_input=user_input
+                    user_input=user_input,
+                    planned_question=planned_question,
+                    previous_question=state.last_question
                 )
+                if questions_asked == 1 and self.adaptive_engine:
+                    # Follow-ups are tailored to the answer; treat them as pitched at the current estimate
+                    current_tech["question_id"] = None
+                    current_tech["difficulty"] = self.adaptive_engine.ability(current_tech)
+
+            if self.adaptive_engine:
+                # Pick up the metadata of the question just asked
+                state.save_tech_plan()
 
             # Add assistant message
-            assistant_message = ConversationMessage(
+            assistant_message = MessageRecord(
                 role="assistant",
                 content=response_text,
-                timestamp=datetime.utcnow(),
                 technology=current_tech["name"]
             )
-            self.collection.update_one(
-                {"session_id": session_id},
-                {"$push": {"conversation_history": assistant_message.model_dump()}}
-            )
+            state.push("conversation_history", assistant_message.to_doc())
+            state.last_question = response_text
+            
+            self._save_state(state, flush=state.status == "completed")
 
             print(f"[DEBUG] Response generated successfully")
             return response_text
@@ -237,6 +448,64 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             print(f"[ERROR] Full traceback: {traceback.format_exc()}")
             return f"Error processing input: {str(e)}"
 
+    def _record_tech_rating(self, state: SessionState, technology: str, rating: float):
+        """Maintain running count/sum/sum of squares/min/max for the technology"""
+        key = tech_key(technology)
+        prefix = f"tech_ratings.{key}"
+        state.inc(f"{prefix}.count", 1)
+        state.inc(f"{prefix}.sum", float(rating))
+        state.inc(f"{prefix}.sum_sq", float(rating) ** 2)
+        state.min(f"{prefix}.min", float(rating))
+        state.max(f"{prefix}.max", float(rating))
+        
+        stats = state.tech_ratings.setdefault(key, {"count": 0, "sum": 0.0, "sum_sq": 0.0})
+        stats["count"] = stats.get("count", 0) + 1
+        stats["sum"] = stats.get("sum", 0.0) + rating
+        stats["sum_sq"] = stats.get("sum_sq", 0.0) + rating ** 2
+        stats["min"] = min(rating, stats.get("min", rating))
+        stats["max"] = max(rating, stats.get("max", rating))
+
+    def _load_state(self, session_id: str) -> Optional[SessionState]:
+        """Turn state from the in-memory store, or from Mongo when write-behind is off"""
+        if self.state_store:
+            return self.state_store.get(session_id)
+        doc = self.collection.find_one({"session_id": session_id}, STATE_PROJECTION)
+        return SessionState.from_doc(doc) if doc else None
+
+    def _save_state(self, state: SessionState, flush: bool = False):
+        """Persist pending state changes, write-behind unless ``flush`` is set"""
+        if self.state_store:
+            self.state_store.mark_dirty(state)
+            if flush:
+                self.state_store.flush(state.session_id)
+            if state.status == "completed":
+                self.state_store.evict(state.session_id)
+                self._release_completed(state.session_id)
+            return
+        update = state.take_update()
+        if update:
+            collection = self.durable_collection if state.status == "completed" else self.fast_collection
+            result = collection.update_one({"session_id": state.session_id}, update)
+            # Unacknowledged writes (MONGO_FAST_W=0) report no counts
+            if result.acknowledged and not result.matched_count:
+                raise ValueError("Failed to update session")
+        if state.status == "completed":
+            self._release_completed(state.session_id)
+
+    def _release_completed(self, session_id: str):
+        self._refresh_ranking(session_id)
+        if self.cluster:
+            self.cluster.release(session_id)
+
+    def _refresh_ranking(self, session_id: str):
+        """Publish a completed session's scores to the candidate ranking"""
+        if not self.ranking_service:
+            return
+        try:
+            self.ranking_service.refresh(session_id)
+        except Exception as e:
+            print(f"[ERROR] Error refreshing candidate ranking: {e}")
+
     def _rate_answer(self, answer: str, technology: str, proficiency: str) -> float:
         """Enhanced answer rating system"""
         try:
@@ -304,7 +573,8 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             print(f"[ERROR] Error in _rate_answer: {e}")
             return 5.0  # Default rating on error
 
-    def _get_next_question(self, session_id: str, current_tech: dict, questions_answered: int, user_input: str) -> str:
+    def _get_next_question(self, session_id: str, current_tech: dict, questions_answered: int, user_input: str,
+                           planned_question: Optional[str] = None, previous_question: str = "") -> str:
         """Get next question with proper progression logic - FIXED parameter name"""
         print(f"[DEBUG] === GETTING NEXT QUESTION ===")
         print(f"[DEBUG] Questions answered so far: {questions_answered}")
@@ -318,23 +588,24 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             # - questions_answered = 2: Generate final question (question 3)
             
             if questions_answered == 1:  # After 1st answer, give follow-up
-                print(f"[DEBUG] Generating follow-up question (2/3)...")
+                print(f"[DEBUG] Generating follow-up question...")
                 followup = self.generate_followup(
                     technology=tech_name, 
                     user_input=user_input,
-                    session_id=session_id
+                    session_id=session_id,
+                    original_question=self._question_text(previous_question)
                 )
-                return f"**Follow-up Question (2/3):**\n\n{followup}"
+                return f"**{self._question_heading(2, 'Follow-up Question')}:**\n\n{followup}"
             
             elif questions_answered == 2:  # After 2nd answer, give final question
-                print(f"[DEBUG] Generating final question (3/3)...")
-                final_question = self.generate_question(
+                print(f"[DEBUG] Generating third question...")
+                final_question = planned_question or self.generate_question(
                     technology=tech_name, 
                     proficiency=proficiency, 
                     session_id=session_id,
                     question_type="final"
                 )
-                return f"**Final Question (3/3):**\n\n{final_question}"
+                return f"**{self._question_heading(3)}:**\n\n{final_question}"
             
             else:  # This shouldn't happen, but fallback
                 print(f"[DEBUG] Unexpected questions_answered count: {questions_answered}")
@@ -350,12 +621,12 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             print(f"[ERROR] Full traceback: {traceback.format_exc()}")
             return self.get_fallback_question(current_tech["name"], current_tech["proficiency"])
 
-    def _move_to_next_technology(self, session_id: str, session_doc: dict, updated_tech_plan: List[Dict] = None) -> str:
+    def _move_to_next_technology(self, session_id: str, state: SessionState) -> str:
         """Move to next technology"""
         print(f"[DEBUG] === MOVING TO NEXT TECHNOLOGY ===")
         try:
-            current_tech_index = session_doc.get("current_tech_index", 0)
-            tech_plan = updated_tech_plan or session_doc.get("tech_plan", [])
+            current_tech_index = state.current_tech_index
+            tech_plan = state.tech_plan
             
             print(f"[DEBUG] Current tech index: {current_tech_index}")
             
@@ -363,35 +634,34 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             if current_tech_index < len(tech_plan):
                 tech_plan[current_tech_index]["completed"] = True
                 print(f"[DEBUG] Marked {tech_plan[current_tech_index]['name']} as completed")
+                self._record_percentile(state, tech_plan[current_tech_index])
             
             # Move to next tech
             next_tech_index = current_tech_index + 1
             
             if next_tech_index >= len(tech_plan):
                 print(f"[DEBUG] No more technologies, completing interview")
-                return self._complete_interview(session_id)
+                state.save_tech_plan()
+                return self._complete_interview(session_id, state)
             
             next_tech = tech_plan[next_tech_index]
             print(f"[DEBUG] Next technology: {next_tech['name']}")
             
             # Update session with next tech - start with 0 questions asked
             next_tech["questions_asked"] = 0  # Reset to 0 for next tech
-            self.collection.update_one(
-                {"session_id": session_id},
-                {"$set": {
-                    "current_tech_index": next_tech_index,
-                    "tech_plan": tech_plan
-                }}
-            )
+            state.current_tech_index = next_tech_index
+            state.save_tech_plan()
             
             # Generate first question for next tech
             print(f"[DEBUG] Generating first question for {next_tech['name']}")
-            first_question = self.generate_question(
+            first_question = self._planned_question(state, next_tech_index, "first") or self.generate_question(
                 technology=next_tech["name"], 
                 proficiency=next_tech["proficiency"], 
                 session_id=session_id
             )
             
+            self._track_question(next_tech, first_question, next_tech["proficiency"])
+            
             completed = sum(1 for t in tech_plan if t.get("completed", False))
             total = len(tech_plan)
             
@@ -401,13 +671,24 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
 
 🎯 **Now discussing {next_tech['name']}** (Level: {next_tech['proficiency']})
 
-**Question 1/3:** {first_question}"""
+**{self._question_heading(1)}:** {first_question}"""
 
         except Exception as e:
             print(f"[ERROR] Error in _move_to_next_technology: {e}")
             print(f"[ERROR] Full traceback: {traceback.format_exc()}")
             return f"Error moving to next technology: {str(e)}"
 
+    def _record_percentile(self, state: SessionState, tech: dict):
+        """Add the finished technology's average to the cross-candidate index"""
+        if not self.rating_service:
+            return
+        try:
+            stats = tech_stats(state.tech_ratings.get(tech_key(tech["name"])))
+            if stats["mean"] is not None:
+                self.rating_service.record(tech["name"], tech["proficiency"], stats["mean"])
+        except Exception as e:
+            print(f"[ERROR] Error recording percentile: {e}")
+
     def generate_question(self, technology: str, proficiency: str, session_id: str, question_type: str = "regular") -> str:
         """Generate question with comprehensive error handling and variety"""
         print(f"[DEBUG] === GENERATING QUESTION ===")
@@ -415,6 +696,10 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
         print(f"[DEBUG] Proficiency: {proficiency}")
         print(f"[DEBUG] Question type: {question_type}")
         
+        if not self.llama_service.is_ready():
+            print(f"[DEBUG] Model not ready, using cached or fallback question")
+            return self._cold_question(technology, proficiency, session_id)
+        
         try:
             questions = self.llama_service.generate_questions(
                 technology=technology,
@@ -425,8 +710,8 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             
             print(f"[DEBUG] LlamaService returned: {len(questions) if questions else 0} questions")
             
-            if questions and questions.get("question_text"):
-                question = questions["question_text"]
+            if questions and questions[0].get("question_text"):
+                question = questions[0]["question_text"]
                 if len(question) > 20 and question.endswith('?'):
                     print(f"[DEBUG] Using LlamaService question")
                     return question
@@ -439,14 +724,40 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             print(f"[ERROR] Full traceback: {traceback.format_exc()}")
             return self.get_fallback_question(technology, proficiency)
 
-    def generate_followup(self, technology: str, user_input: str, session_id: str) -> str:
+    def _question_range(self) -> Tuple[int, int]:
+        """Fewest and most questions per technology"""
+        if self.adaptive_engine:
+            return self.adaptive_engine.question_range()
+        return 3, 3
+
+    def _question_heading(self, number: int, kind: str = "Question") -> str:
+        """Heading of a technology's ``number``-th question, e.g. "Follow-up Question (2/3)" """
+        fewest, most = self._question_range()
+        if number >= most:
+            return f"Final Question ({number}/{most})"
+        if fewest == most:
+            return f"{kind} ({number}/{most})"
+        # The adaptive engine may move on after any answer from ``fewest`` on
+        return f"{kind} ({number}, up to {most})"
+
+    @staticmethod
+    def _question_text(message: str) -> str:
+        """The question itself, without the intro and "**Question (1/3):**" heading of the message"""
+        return message.rsplit(":**", 1)[-1].strip() if ":**" in message else message.strip()
+
+    def generate_followup(self, technology: str, user_input: str, session_id: str,
+                          original_question: str = "") -> str:
         """Generate follow-up question based on user's answer"""
         print(f"[DEBUG] === GENERATING FOLLOWUP ===")
         print(f"[DEBUG] Technology: {technology}")
         
+        if not self.llama_service.is_ready():
+            print(f"[DEBUG] Model not ready, using fallback followup")
+            return self.get_fallback_followup(technology, user_input)
+        
         try:
             followup = self.llama_service.generate_followup(
-                original_question="Previous question",
+                original_question=original_question or "Previous question",
                 candidate_answer=user_input,
                 technology=technology,
                 session_id=session_id
@@ -536,20 +847,16 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             return tech_plan[current_tech_index]
         return None
 
-    def _complete_interview(self, session_id: str) -> str:
+    def _complete_interview(self, session_id: str, state: SessionState) -> str:
         """Complete interview and clear caches"""
         try:
             # Clear LLM cache for this session
             self.llama_service.clear_session_cache(session_id)
             
-            # Update session status
-            self.collection.update_one(
-                {"session_id": session_id},
-                {"$set": {
-                    "status": "completed",
-                    "completed_at": datetime.utcnow()
-                }}
-            )
+            # Update session status; the caller writes it through with the turn
+            state.status = "completed"
+            state.set("status", "completed")
+            state.set("completed_at", datetime.utcnow())
             
             return """🎉 **Interview Complete!**
 
@@ -566,21 +873,99 @@ Hello {candidate.full_name}! We'll cover **{len(tech_plan)} technologies**: {',
             print(f"[ERROR] Error in _complete_interview: {e}")
             return "Interview completed with some technical issues. Please contact support."
 
+    def flush_session(self, session_id: str, durable: bool = False):
+        """Write any pending write-behind changes of a session to Mongo"""
+        if self.state_store:
+            self.state_store.flush(session_id, durable=durable)
+
     def add_message(self, session_id: str, message: ConversationMessage):
         """Add message to conversation"""
         try:
-            self.collection.update_one(
+            self.fast_collection.update_one(
                 {"session_id": session_id},
                 {"$push": {"conversation_history": message.model_dump()}}
             )
         except Exception as e:
             print(f"[ERROR] Error adding message: {e}")
 
+    def get_history(self, session_id: str) -> List[dict]:
+        """Conversation history as plain dicts, without validating the session"""
+        try:
+            self.flush_session(session_id)
+            session_doc = self.collection.find_one(
+                {"session_id": session_id},
+                {"_id": 0, "archived": 1, "conversation_history.role": 1, "conversation_history.content": 1}
+            )
+            if session_doc and session_doc.get("archived"):
+                session_doc = self._load_archived(session_id)
+            if not session_doc:
+                return []
+            return [
+                {"role": message["role"], "content": message["content"]}
+                for message in session_doc.get("conversation_history", [])
+            ]
+        except Exception as e:
+            print(f"[ERROR] Error getting history: {e}")
+            return []
+
+    def get_history_page(self, session_id: str, limit: int, end: Optional[int] = None) -> tuple:
+        """Up to ``limit`` messages ending before index ``end`` (latest when None).
+
+        Returns (messages, start index of the page, total message count) so
+        callers can page backwards without reading the whole conversation.
+        """
+        try:
+            self.flush_session(session_id)
+            if end is None:
+                page = {"$slice": ["$conversation_history", -limit]}
+            else:
+                start = max(0, end - limit)
+                page = {"$slice": ["$conversation_history", start, max(1, end - start)]}
+            docs = list(self.collection.aggregate([
+                {"$match": {"session_id": session_id}},
+                {"$project": {
+                    "_id": 0,
+                    "archived": 1,
+                    "total": {"$size": {"$ifNull": ["$conversation_history", []]}},
+                    "messages": page
+                }},
+                {"$project": {"archived": 1, "total": 1, "messages.role": 1, "messages.content": 1}}
+            ]))
+            if not docs:
+                return [], 0, 0
+            if docs[0].get("archived"):
+                history = self.get_history(session_id)
+                end = len(history) if end is None else end
+                start = max(0, end - limit)
+                return history[start:end], start, len(history)
+            total = docs[0]["total"]
+            messages = docs[0]["messages"] if end is None or end > 0 else []
+            start = total - len(messages) if end is None else max(0, end - limit)
+            return messages, start, total
+        except Exception as e:
+            print(f"[ERROR] Error getting history page: {e}")
+            return [], 0, 0
+
+    def get_session_status(self, session_id: str) -> Optional[dict]:
+        """Candidate and status of a session, without its history"""
+        return self.collection.find_one(
+            {"session_id": session_id}, {"_id": 0, "candidate_id": 1, "status": 1}
+        )
+
     def get_session(self, session_id: str) -> Optional[InterviewSession]:
         """Get session"""
         try:
             session_doc = self.collection.find_one({"session_id": session_id})
+            if session_doc and session_doc.get("archived"):
+                session_doc = self._load_archived(session_id)
             return InterviewSession(**session_doc) if session_doc else None
         except Exception as e:
             print(f"[ERROR] Error getting session: {e}")
             return None
+
+    def _load_archived(self, session_id: str) -> Optional[dict]:
+        """Full document of an archived session, if the archive is configured"""
+        if not self.archive_service:
+            print(f"[ERROR] Session {session_id} is archived but no archive service is configured")
+            return None
+        return self.archive_service.load(session_id)
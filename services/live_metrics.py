@@ -0,0 +1,257 @@
+# services/live_metrics.py
+import queue
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import List, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Only session creation and status changes move the counters; per-turn
+# updates are filtered out on the server
+CHANGE_PIPELINE = [
+    {"$match": {"$or": [
+        {"operationType": "insert"},
+        {"updateDescription.updatedFields.status": {"$exists": True}},
+    ]}},
+    {"$project": {
+        "operationType": 1,
+        "fullDocument.session_id": 1,
+        "fullDocument.status": 1,
+        "fullDocument.tech_plan.name": 1,
+        "fullDocument.average_rating": 1,
+        "fullDocument.started_at": 1,
+        "fullDocument.completed_at": 1,
+    }},
+]
+
+
+class LiveMetrics:
+    """Incrementally maintained interview counters shared by all dashboard viewers.
+
+    One change stream on ``interview_sessions`` (or, where change streams
+    are unavailable, one polling loop) updates the counters; every viewer
+    reads ``snapshot`` or receives deltas through ``subscribe``, so the cost
+    does not grow with the number of open dashboards.
+    """
+
+    def __init__(self, collection, poll_interval: float = 2.0, rating_window: int = 100):
+        self.collection = collection
+        self.poll_interval = poll_interval
+        self.active = 0
+        self._active_ids = set()  # Sessions counted in ``active`` (change stream mode)
+        self.completed_today = 0
+        self.technologies = Counter()
+        self.recent_ratings = deque(maxlen=rating_window)
+        self.mode = "starting"  # "change_stream" or "polling" once running
+        self._day = datetime.utcnow().date()
+        self._last_started: Optional[datetime] = None
+        self._last_completed: Optional[datetime] = None
+        self._resume_token = None
+        self._start_at = None  # Cluster time read before the snapshot; the stream starts there
+        # Sessions the snapshot already counted, so the stream's replay of
+        # the gap between ``_start_at`` and the snapshot does not count them again
+        self._counted_started = set()
+        self._counted_completed = set()
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._start_at = self._cluster_time()
+        self._load_snapshot()
+        self._thread = threading.Thread(target=self._run, name="live-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _today_start(self) -> datetime:
+        return datetime.combine(self._day, datetime.min.time())
+
+    def _cluster_time(self):
+        """Current cluster time, or None on servers without one (standalone)"""
+        try:
+            return self.collection.database.command("hello").get("operationTime")
+        except PyMongoError as e:
+            print(f"[ERROR] Error reading cluster time: {e}")
+            return None
+
+    def _load_snapshot(self):
+        """Initial counters, the only full queries this class runs"""
+        today = self._today_start()
+        with self._lock:
+            self._active_ids = {doc["session_id"] for doc in self.collection.find(
+                {"status": "active"}, {"_id": 0, "session_id": 1}
+            )}
+            self.active = len(self._active_ids)
+            self._counted_completed = {doc["session_id"] for doc in self.collection.find(
+                {"status": "completed", "completed_at": {"$gte": today}}, {"_id": 0, "session_id": 1}
+            )}
+            self.completed_today = len(self._counted_completed)
+            self.recent_ratings.clear()
+            for doc in self.collection.find(
+                {"status": "completed", "completed_at": {"$ne": None}}, {"_id": 0, "average_rating": 1}
+            ).sort("completed_at", -1).limit(self.recent_ratings.maxlen):
+                self.recent_ratings.appendleft(float(doc.get("average_rating") or 0.0))
+            self.technologies = Counter()
+            self._counted_started = set()
+            for doc in self.collection.find(
+                {"started_at": {"$gte": today}}, {"_id": 0, "session_id": 1, "tech_plan.name": 1}
+            ):
+                self._counted_started.add(doc.get("session_id"))
+                self.technologies.update(tech.get("name") for tech in doc.get("tech_plan", []) if tech.get("name"))
+            self._last_started = self._last_completed = datetime.utcnow()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._watch()
+            except OperationFailure as e:
+                # Standalone servers have no change streams
+                print(f"[DEBUG] Change streams unavailable ({e}), polling every {self.poll_interval}s")
+                self._poll()
+            except PyMongoError as e:
+                print(f"[ERROR] Live metrics stream failed: {e}")
+                self._stop.wait(self.poll_interval)
+
+    def _watch(self):
+        if self._resume_token is not None:
+            position = {"resume_after": self._resume_token}
+        else:
+            # Replay from before the snapshot so nothing in between is missed
+            position = {"start_at_operation_time": self._start_at}
+        with self.collection.watch(CHANGE_PIPELINE, full_document="updateLookup", **position) as stream:
+            self.mode = "change_stream"
+            while not self._stop.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is None:
+                    self._roll_day()
+                    self._stop.wait(0.2)
+                    continue
+                self._resume_token = change["_id"]
+                document = change.get("fullDocument") or {}
+                if change["operationType"] == "insert":
+                    self._on_started(document)
+                else:
+                    self._on_status(document.get("status"), document)
+
+    def _poll(self):
+        self.mode = "polling"
+        while not self._stop.wait(self.poll_interval):
+            self._roll_day()
+            # Pauses, resumes and expiries are not visible from timestamps;
+            # recount instead of applying deltas
+            active = self.collection.count_documents({"status": "active"})
+            with self._lock:
+                delta, self.active = active - self.active, active
+            if delta:
+                self._publish({"active": delta})
+            started = list(self.collection.find(
+                {"started_at": {"$gt": self._last_started}},
+                {"_id": 0, "started_at": 1, "tech_plan.name": 1}
+            ).sort("started_at", 1))
+            completed = list(self.collection.find(
+                {"status": "completed", "completed_at": {"$gt": self._last_completed}},
+                {"_id": 0, "status": 1, "completed_at": 1, "average_rating": 1}
+            ).sort("completed_at", 1))
+            for document in started:
+                self._last_started = document["started_at"]
+                self._on_started(document, count_active=False)
+            for document in completed:
+                self._last_completed = document["completed_at"]
+                self._on_completed(document)
+
+    def _roll_day(self):
+        today = datetime.utcnow().date()
+        if today != self._day:
+            with self._lock:
+                self._day = today
+                self.completed_today = 0
+                self.technologies = Counter()
+                self._counted_started.clear()
+                self._counted_completed.clear()
+            self._publish({"reset": True})
+
+    def _on_started(self, document: dict, count_active: bool = True):
+        names = [tech.get("name") for tech in document.get("tech_plan", []) if tech.get("name")]
+        delta = {"technologies": names}
+        with self._lock:
+            if document.get("session_id") in self._counted_started:
+                self._counted_started.discard(document.get("session_id"))
+                names = delta["technologies"] = []
+            self.technologies.update(names)
+            if count_active and document.get("session_id") not in self._active_ids:
+                self._active_ids.add(document.get("session_id"))
+                self.active = len(self._active_ids)
+                delta["active"] = 1
+        if names or "active" in delta:
+            self._publish(delta)
+
+    def _on_status(self, status: Optional[str], document: dict):
+        """Apply a status change seen on the change stream"""
+        session_id = document.get("session_id")
+        delta = {}
+        with self._lock:
+            # Only transitions into or out of "active" move the counter, so
+            # e.g. paused -> expired does not count a session twice
+            if status == "active" and session_id not in self._active_ids:
+                self._active_ids.add(session_id)
+                delta["active"] = 1
+            elif status != "active" and session_id in self._active_ids:
+                self._active_ids.discard(session_id)
+                delta["active"] = -1
+            self.active = len(self._active_ids)
+        if delta:
+            self._publish(delta)
+        if status == "completed":
+            self._on_completed(document)
+
+    def _on_completed(self, document: dict):
+        rating = float(document.get("average_rating") or 0.0)
+        with self._lock:
+            if document.get("session_id") in self._counted_completed:
+                self._counted_completed.discard(document.get("session_id"))
+                return
+            self.completed_today += 1
+            self.recent_ratings.append(rating)
+        self._publish({"completed_today": 1, "rating": rating})
+
+    def snapshot(self, top_n: int = 10) -> dict:
+        with self._lock:
+            ratings = list(self.recent_ratings)
+            return {
+                "active": self.active,
+                "completed_today": self.completed_today,
+                "average_rating": round(sum(ratings) / len(ratings), 2) if ratings else None,
+                "technologies": self.technologies.most_common(top_n),
+                "mode": self.mode,
+                "as_of": time.time(),
+            }
+
+    def subscribe(self, max_pending: int = 1000) -> queue.Queue:
+        """Queue that receives every delta from now on"""
+        subscriber = queue.Queue(maxsize=max_pending)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def _publish(self, delta: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(delta)
+            except queue.Full:
+                # The viewer stopped reading (e.g. closed the tab)
+                self.unsubscribe(subscriber)
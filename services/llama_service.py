@@ -1,35 +1,109 @@
+import os
+import time
 import requests
 import json
 import random
+import statistics
+import threading
+from collections import deque
 from typing import List, Dict, Set, Optional
 
-from models.common import ProficiencyLevel
+from models.common import ProficiencyLevel, LLMPriority
+from services.llm_scheduler import LLMScheduler
+from services.prompt_templates import PromptRegistry
+from services.output_budget import OutputBudget, DEFAULT_STOP
+from services.llm_cassette import LLMCassette
+from services.llm_backends import LLMBackend, backend_from_env
+from services.question_index import QuestionIndex, question_key
+
+# Every prompt starts with exactly this text so Ollama's prompt cache can
+# reuse the evaluated prefix across requests. Keep request-specific values
+# out of it and append them after.
+PROMPT_PREFIX = """You are an experienced technical interviewer running a live interview.
+Write questions that are specific, practical and answerable in a few paragraphs.
+Output only what is asked for, without preamble.
+
+"""
+
+# Ollama returns the token context of a generation; follow-ups only reuse it
+# while it is small enough to be cheaper than re-sending the prompt.
+MAX_REUSED_CONTEXT_TOKENS = 2048
+
+# Upper bound on distinct questions kept in the in-memory question bank
+MAX_QUESTION_BANK_SIZE = 100_000
+
+# Recently generated questions kept per (technology, proficiency), served
+# without an LLM call while the model is cold
+RECENT_QUESTIONS_PER_TOPIC = 20
 
 class LlamaService:
-    def __init__(self, ollama_url: str = "http://localhost:11434"):
-        self.ollama_url = ollama_url
-        self.model = "llama3.2"
-        self.asked_questions_cache = {}
+    def __init__(self, ollama_url: Optional[str] = None, scheduler: Optional[LLMScheduler] = None,
+                 keep_alive: Optional[str] = None, reuse_context: Optional[bool] = None,
+                 prompts: Optional[PromptRegistry] = None, output_budget: Optional[OutputBudget] = None,
+                 cassette: Optional[LLMCassette] = None, backend: Optional[LLMBackend] = None):
+        # Inference server (LLM_BACKEND); ``ollama_url`` overrides its base URL
+        self.backend = backend or backend_from_env(ollama_url)
+        self.model = os.getenv("LLM_MODEL", "llama3.2")
+        self.asked_questions_cache = {}  # session_id -> QuestionIndex of questions already asked
+        self.question_bank = QuestionIndex()  # Distinct generated questions across sessions
+        self.scheduler = scheduler or LLMScheduler.from_env()
+        self.prompts = prompts or PromptRegistry.load()
+        # num_predict and stop sequences learned per template and technology
+        self.output_budget = output_budget or OutputBudget(
+            enabled=os.getenv("LLM_OUTPUT_BUDGET", "true").lower() in ("1", "true", "yes")
+        )
+        # Record/replay of generations (LLM_CASSETTE), e.g. for offline benchmarks
+        self.cassette = cassette if cassette is not None else LLMCassette.from_env()
+        self._local = threading.local()  # Latency and raw result of this thread's last call
+        # How long Ollama keeps the model loaded after a request ("30m", "-1" = forever)
+        self.keep_alive = keep_alive if keep_alive is not None else os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        if reuse_context is None:
+            reuse_context = os.getenv("OLLAMA_REUSE_CONTEXT", "true").lower() in ("1", "true", "yes")
+        self.reuse_context = reuse_context and self.backend.supports_context
+        self.session_contexts = {}
+        self.recent_questions = {}  # (technology, proficiency) -> deque of generated question texts
+        # Readiness: whether the model is loaded in Ollama, refreshed from
+        # /api/ps at most every ``readiness_ttl`` seconds and by every call
+        self.readiness_ttl = 30.0
+        self._resident = False
+        self._resident_checked_at = 0.0
+        self._last_call_at = 0.0
+        self._latencies = deque(maxlen=50)  # Seconds per successful generate call
+        self._keep_warm_stop = threading.Event()
+        self._keep_warm_thread = None
 
-    def generate_questions(self, technology: str, proficiency: ProficiencyLevel, count: int = 1, session_id: str = None) -> List[dict]:
+    def generate_questions(self, technology: str, proficiency: ProficiencyLevel, count: int = 1, session_id: str = None,
+                           priority: LLMPriority = LLMPriority.INTERACTIVE) -> List[dict]:
         """Generate clean, well-formed questions"""
         
-        prompt = f"""Generate 1 specific technical interview question for {technology}.
+        if count > 1:
+            return self.generate_question_batch([(technology, proficiency)] * count, session_id=session_id, priority=priority)
 
-Level: {proficiency.value}
-Requirements:
-- Must be answerable by a {proficiency.value} level developer
-- Requires detailed explanation with examples
-- Tests practical {technology} knowledge
-- Must end with a question mark
+        template = self.prompts.choose("question", key=session_id)
+        prompt = PROMPT_PREFIX + template.render(technology=technology, level=proficiency.value)
+        budget_key = f"{template.name}/{template.version}"
 
-Question:"""
-        
         try:
-            response = self._call_llama(prompt)
-            question_text = self._extract_clean_question(response)
+            question_text = ""
+            for attempt in range(2):
+                num_predict, stop = self.output_budget.options(budget_key, technology)
+                response = self._call_llama(prompt, priority=priority, num_predict=num_predict, stop=stop,
+                                            session_id=session_id)
+                question_text = self._extract_clean_question(response)
+                self.prompts.record(template, response, len(question_text) > 15, self._local.latency)
+                self.output_budget.record(budget_key, technology, self._local.raw_response, num_predict,
+                                          self._local.eval_count)
+                duplicate_of = self._find_repeat(session_id, question_text)
+                if not duplicate_of:
+                    break
+                # Regenerate once, steering away from the question already asked
+                print(f"[DEBUG] Rejected near-duplicate question: {question_text}")
+                prompt += f"\n\nDo not ask anything similar to: {duplicate_of}\n\nQuestion:"
+                question_text = ""
             
             if question_text and len(question_text) > 15:
+                self._remember_question(session_id, question_text)
+                self._cache_question(technology, proficiency, question_text)
                 return [{
                     "question_id": f"{technology}_{session_id}_{random.randint(1000,9999)}",
                     "technology": technology,
@@ -44,26 +118,183 @@ Question:"""
             print(f"Question generation failed: {e}")
             return [self._get_simple_fallback(technology, proficiency, session_id)]
 
-    def generate_followup(self, original_question: str, candidate_answer: str, technology: str, session_id: str = None) -> str:
-        """Generate clean follow-up questions"""
-        
-        prompt = f"""Based on this technical interview answer, ask 1 focused follow-up question.
+    def generate_question_batch(self, items: List[tuple], session_id: str = None,
+                                priority: LLMPriority = LLMPriority.PREFETCH) -> List[dict]:
+        """Generate one question per (technology, proficiency) pair in a single JSON-mode call.
+
+        The result is aligned with ``items``; any item the model omits or
+        garbles is replaced by the simple fallback for that pair.
+        """
+        if not items:
+            return []
+
+        items = [(tech, ProficiencyLevel(prof)) for tech, prof in items]
+        if self.backend.native_batch:
+            parsed = self._generate_separately(items, session_id, priority)
+            return self._batch_results(items, parsed, session_id)
+        requests_block = "\n".join(
+            f"{i}. {tech} ({prof.value} level)" for i, (tech, prof) in enumerate(items, start=1)
+        )
+        prompt = PROMPT_PREFIX + f"""Task: Generate technical interview questions, one for each numbered request below.
+
+Requests:
+{requests_block}
+
+Requirements for every question:
+- Must be answerable by a developer at the stated level
+- Requires detailed explanation with examples
+- Tests practical knowledge of the stated technology
+- Must end with a question mark
+- Questions for the same technology must be different from each other
+
+Respond with JSON only, in this format:
+{{"questions": [{{"id": 1, "question": "..."}}, {{"id": 2, "question": "..."}}]}}"""
+
+        parsed = {}
+        try:
+            response = self._call_llama(
+                prompt,
+                priority=priority,
+                num_predict=80 * len(items) + 40,
+                stop=[],
+                response_format="json"
+            )
+            parsed = self._parse_question_batch(response, len(items))
+        except Exception as e:
+            print(f"Batch question generation failed: {e}")
+        return self._batch_results(items, parsed, session_id)
 
-Technology: {technology}
-Previous Answer: {candidate_answer}
+    def _generate_separately(self, items: List[tuple], session_id: Optional[str],
+                             priority: LLMPriority) -> Dict[int, str]:
+        """One single-question prompt per item, sent together to a backend with native batching.
 
-Generate a follow-up that:
-- Explores {technology} deeper
-- Tests practical application
-- Asks for specific examples
+        Items repeating a technology (the first and final question of a plan)
+        go out in later rounds, told which question they are and what was
+        already accepted for that technology, so they do not get the same prompt.
+        """
+        rounds, totals = [], {}
+        for index, (technology, proficiency) in enumerate(items, start=1):
+            slot = totals.get(technology, 0)
+            totals[technology] = slot + 1
+            if slot == len(rounds):
+                rounds.append([])
+            rounds[slot].append((index, technology, proficiency, slot))
 
-Follow-up question:"""
+        parsed = {}
+        accepted = {}  # technology -> questions generated so far in this batch
+        for batch in rounds:
+            payloads, templates = [], []
+            for _, technology, proficiency, slot in batch:
+                template = self.prompts.choose("question", key=session_id)
+                num_predict, stop = self.output_budget.options(f"{template.name}/{template.version}", technology)
+                prompt = PROMPT_PREFIX + template.render(technology=technology, level=proficiency.value)
+                if totals[technology] > 1:
+                    prompt += f"\n\nThis is question {slot + 1} of {totals[technology]} about {technology}."
+                    if accepted.get(technology):
+                        previous = "\n".join(f"- {question}" for question in accepted[technology])
+                        prompt += f" Do not ask anything similar to:\n{previous}"
+                    prompt += "\n\nQuestion:"
+                payloads.append(self._build_payload(prompt, num_predict=num_predict, stop=stop))
+                templates.append(template)
+
+            try:
+                with self.scheduler.slot(priority):
+                    started = time.monotonic()
+                    results = self._generate_many(payloads, timeout=60)
+                latency = time.monotonic() - started
+            except Exception as e:
+                print(f"Batch question generation failed: {e}")
+                return parsed
+            for (index, technology, _, _), template, payload, data in zip(batch, templates, payloads, results):
+                response = data.get("response", "")
+                question = self._extract_clean_question(response)
+                self.prompts.record(template, response, len(question) > 15, latency)
+                self.output_budget.record(f"{template.name}/{template.version}", technology, response,
+                                          payload["options"]["num_predict"], data.get("eval_count"))
+                if question:
+                    parsed[index] = question
+                    accepted.setdefault(technology, []).append(question)
+        return parsed
+
+    def _batch_results(self, items: List[tuple], parsed: Dict[int, str], session_id: Optional[str]) -> List[dict]:
+        """Question dicts aligned with ``items``, with fallbacks for missing or repeated questions"""
+        questions = []
+        for index, (technology, proficiency) in enumerate(items, start=1):
+            question_text = parsed.get(index, "")
+            if question_text and self._find_repeat(session_id, question_text):
+                print(f"[DEBUG] Rejected near-duplicate question: {question_text}")
+                question_text = ""
+            if question_text and len(question_text) > 15:
+                self._remember_question(session_id, question_text)
+                self._cache_question(technology, proficiency, question_text)
+                questions.append({
+                    "question_id": f"{technology}_{session_id}_{random.randint(1000,9999)}",
+                    "technology": technology,
+                    "question_text": question_text,
+                    "question_type": "technical",
+                    "difficulty_score": self._get_difficulty_score(proficiency)
+                })
+            else:
+                questions.append(self._get_simple_fallback(technology, proficiency, session_id))
+        return questions
+
+    def _parse_question_batch(self, response: str, expected: int) -> Dict[int, str]:
+        """Parse a JSON batch response into {request number: clean question}"""
+        try:
+            data = json.loads(response)
+        except ValueError:
+            # Models sometimes wrap the JSON in prose; take the outermost object
+            start, end = response.find("{"), response.rfind("}")
+            if start == -1 or end <= start:
+                return {}
+            try:
+                data = json.loads(response[start:end + 1])
+            except ValueError:
+                return {}
+
+        entries = data.get("questions", []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return {}
+
+        parsed = {}
+        for position, entry in enumerate(entries, start=1):
+            if isinstance(entry, dict):
+                text = entry.get("question") or entry.get("question_text") or ""
+                try:
+                    index = int(entry.get("id", position))
+                except (TypeError, ValueError):
+                    index = position
+            else:
+                text, index = entry, position
+
+            if not isinstance(text, str) or not 1 <= index <= expected or index in parsed:
+                continue
+            question = self._extract_clean_question(text)
+            if question:
+                parsed[index] = question
+        return parsed
+
+    def generate_followup(self, original_question: str, candidate_answer: str, technology: str, session_id: str = None) -> str:
+        """Generate clean follow-up questions"""
         
+        template = self.prompts.choose("followup", key=session_id)
+        prompt = PROMPT_PREFIX + template.render(technology=technology, question=original_question,
+                                                 answer=candidate_answer)
+
         try:
-            response = self._call_llama(prompt)
+            # With context reuse the earlier exchange is already evaluated on
+            # the server, so only the follow-up instructions are new tokens.
+            budget_key = f"{template.name}/{template.version}"
+            num_predict, stop = self.output_budget.options(budget_key, technology)
+            response = self._call_llama(prompt, num_predict=num_predict, stop=stop, session_id=session_id,
+                                        use_context=True)
             followup = self._extract_clean_question(response)
+            self.prompts.record(template, response, len(followup) > 15, self._local.latency)
+            self.output_budget.record(budget_key, technology, self._local.raw_response, num_predict,
+                                      self._local.eval_count)
             
-            if followup and len(followup) > 15:
+            if followup and len(followup) > 15 and not self._find_repeat(session_id, followup):
+                self._remember_question(session_id, followup)
                 return followup
             else:
                 return self._get_simple_followup_fallback(technology, candidate_answer)
@@ -71,6 +302,95 @@ Follow-up question:"""
         except Exception:
             return self._get_simple_followup_fallback(technology, candidate_answer)
 
+    def grade_answers(self, items: List[dict], priority: LLMPriority = LLMPriority.BATCH) -> List[Optional[float]]:
+        """Grade several answers in one JSON-mode call.
+
+        Each item has question, answer, technology and proficiency. Returns a
+        0-10 score per item, or None where the model gave no usable grade.
+        """
+        if not items:
+            return []
+
+        blocks = []
+        for i, item in enumerate(items, start=1):
+            blocks.append(f"""### {i}
+Technology: {item['technology']} ({item['proficiency']} level)
+Question: {item['question'][:500]}
+Answer: {item['answer'][:1500]}""")
+        answers_block = "\n\n".join(blocks)
+
+        prompt = PROMPT_PREFIX + f"""Task: Grade each numbered candidate answer below from 0 to 10.
+
+Score technical correctness, depth and relevance to the question for the stated level.
+Ignore length, keyword stuffing and answers that do not address the question.
+
+{answers_block}
+
+Respond with JSON only, in this format:
+{{"grades": [{{"id": 1, "score": 7}}, {{"id": 2, "score": 4}}]}}"""
+
+        response = self._call_llama(
+            prompt,
+            priority=priority,
+            num_predict=20 * len(items) + 40,
+            stop=[],
+            response_format="json"
+        )
+        return self._parse_grades(response, len(items))
+
+    def _parse_grades(self, response: str, expected: int) -> List[Optional[float]]:
+        """Parse a JSON grading response into a list aligned with the request"""
+        grades = [None] * expected
+        try:
+            data = json.loads(response[response.find("{"):response.rfind("}") + 1])
+        except ValueError:
+            return grades
+
+        entries = data.get("grades", []) if isinstance(data, dict) else []
+        for position, entry in enumerate(entries if isinstance(entries, list) else [], start=1):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("id", position))
+                score = float(entry.get("score"))
+            except (TypeError, ValueError):
+                continue
+            if 1 <= index <= expected and grades[index - 1] is None:
+                grades[index - 1] = min(max(score, 0.0), 10.0)
+        return grades
+
+    def _session_index(self, session_id: str) -> QuestionIndex:
+        return self.asked_questions_cache.setdefault(session_id, QuestionIndex())
+
+    def _find_repeat(self, session_id: Optional[str], question_text: str) -> Optional[str]:
+        """Return the already-asked question that ``question_text`` nearly duplicates"""
+        if not session_id or not question_text:
+            return None
+        index = self._session_index(session_id)
+        key = index.find_duplicate(question_text)
+        return index.get_text(key) if key else None
+
+    def _remember_question(self, session_id: Optional[str], question_text: str):
+        """Record an asked question for the session and in the shared question bank"""
+        if session_id:
+            self._session_index(session_id).add(question_key(question_text), question_text)
+        # Near-duplicates collapse onto the first phrasing already in the bank.
+        # Keys are question hashes, so concurrent adds never overwrite each other.
+        if len(self.question_bank) < MAX_QUESTION_BANK_SIZE and self.question_bank.find_duplicate(question_text) is None:
+            self.question_bank.add(question_key(question_text), question_text)
+
+    def _cache_question(self, technology: str, proficiency: ProficiencyLevel, question_text: str):
+        key = (technology, ProficiencyLevel(proficiency).value)
+        self.recent_questions.setdefault(key, deque(maxlen=RECENT_QUESTIONS_PER_TOPIC)).append(question_text)
+
+    def cached_question(self, technology: str, proficiency: ProficiencyLevel, session_id: str = None) -> Optional[str]:
+        """A previously generated question for the topic that this session has not been asked"""
+        for question_text in reversed(self.recent_questions.get((technology, ProficiencyLevel(proficiency).value), ())):
+            if not self._find_repeat(session_id, question_text):
+                self._remember_question(session_id, question_text)
+                return question_text
+        return None
+
     def _extract_clean_question(self, response: str) -> str:
         """Extract clean question from LLM response"""
         lines = [line.strip() for line in response.split('\n') if line.strip()]
@@ -134,23 +454,181 @@ Follow-up question:"""
         else:
             return f"How would you explain this {technology} concept to a junior developer?"
 
-    def _call_llama(self, prompt: str) -> str:
-        """Optimized Llama call"""
+    def _build_payload(self, prompt: str, num_predict: int = 100, stop: Optional[List[str]] = None,
+                       response_format: Optional[str] = None, context: Optional[List[int]] = None,
+                       stream: bool = False) -> dict:
+        """Build an /api/generate payload"""
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": 0.6,
                 "top_p": 0.8,
-                "num_predict": 100,
-                "stop": ["\n\n", "Answer:", "Response:", "Follow-up Question:"]
+                "num_predict": num_predict,
+                "stop": DEFAULT_STOP if stop is None else stop
             }
         }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        if response_format:
+            payload["format"] = response_format
+        if context:
+            payload["context"] = context
+        return payload
+
+    def _call_llama(self, prompt: str, priority: LLMPriority = LLMPriority.INTERACTIVE, num_predict: int = 100,
+                    stop: Optional[List[str]] = None, response_format: Optional[str] = None,
+                    session_id: Optional[str] = None, use_context: bool = False) -> str:
+        """Optimized Llama call, admitted through the scheduler"""
+        context = None
+        if self.reuse_context and use_context and session_id:
+            context = self.session_contexts.get(session_id)
+            if context and prompt.startswith(PROMPT_PREFIX):
+                # The shared prefix is already part of the reused context
+                prompt = prompt[len(PROMPT_PREFIX):]
+        payload = self._build_payload(prompt, num_predict=num_predict, stop=stop,
+                                      response_format=response_format, context=context)
+        
+        # Raises AdmissionError when the queue is full or the deadline passes,
+        # which callers treat like any other failure and fall back.
+        with self.scheduler.slot(priority):
+            started = time.monotonic()
+            try:
+                data = self._generate(payload, timeout=25)
+            except requests.RequestException:
+                # Most likely still loading (or down); serve cached questions until warm
+                self._set_resident(False)
+                raise
+        self._local.latency = time.monotonic() - started
+        self._latencies.append(self._local.latency)
+        self._set_resident(True)
+        self._local.raw_response = data.get("response", "")
+        self._local.eval_count = data.get("eval_count")
         
-        response = requests.post(f"{self.ollama_url}/api/generate", json=payload, timeout=25)
-        response.raise_for_status()
-        return response.json().get("response", "").strip()
+        if self.reuse_context and session_id and not response_format:
+            new_context = data.get("context")
+            if new_context and len(new_context) <= MAX_REUSED_CONTEXT_TOKENS:
+                self.session_contexts[session_id] = new_context
+            else:
+                self.session_contexts.pop(session_id, None)
+        
+        return data.get("response", "").strip()
+
+    def _generate(self, payload: dict, timeout: float) -> dict:
+        """One generation on the backend, through the cassette when one is configured"""
+        if self.cassette:
+            return self.cassette.generate(payload, lambda: self.backend.generate(payload, timeout))
+        return self.backend.generate(payload, timeout)
+
+    def _generate_many(self, payloads: List[dict], timeout: float) -> List[dict]:
+        """Several generations in as few backend requests as the backend allows"""
+        if self.cassette:
+            return [self._generate(payload, timeout) for payload in payloads]
+        return self.backend.batch(payloads, timeout)
+
+    def warm_up(self, timeout: float = 120.0) -> bool:
+        """Load the model (and the shared prompt prefix) with a one-token generation"""
+        payload = self._build_payload(PROMPT_PREFIX, num_predict=1, stop=[])
+        try:
+            if self.cassette and self.cassette.replaying:
+                self._set_resident(True)
+                return True
+            with self.scheduler.slot(LLMPriority.BATCH):
+                self._generate(payload, timeout=timeout)
+            self._set_resident(True)
+            print(f"[DEBUG] Warmed up {self.model}")
+            return True
+        except Exception as e:
+            print(f"[ERROR] Model warm-up failed: {e}")
+            return False
+
+    def start_keep_warm(self, interval: Optional[float] = None):
+        """Warm up now, then again whenever the model has been idle for ``interval`` seconds.
+
+        Ollama unloads a model ``keep_alive`` after its last request; the
+        periodic warm-up keeps it resident between interviews. While the
+        model is cold the loop retries more often.
+        """
+        if self._keep_warm_thread and self._keep_warm_thread.is_alive():
+            return
+        if interval is None:
+            interval = float(os.getenv("OLLAMA_WARM_INTERVAL", "240"))
+        self._keep_warm_stop.clear()
+
+        def run():
+            self.warm_up()
+            while not self._keep_warm_stop.wait(interval if self._resident else min(interval, 15.0)):
+                if not self.is_ready() or time.monotonic() - self._last_call_at >= interval:
+                    self.warm_up()
+
+        self._keep_warm_thread = threading.Thread(target=run, name="llm-keep-warm", daemon=True)
+        self._keep_warm_thread.start()
+
+    def stop_keep_warm(self):
+        self._keep_warm_stop.set()
+
+    def _set_resident(self, resident: bool):
+        self._resident = resident
+        self._resident_checked_at = time.monotonic()
+        if resident:
+            self._last_call_at = self._resident_checked_at
+
+    def model_resident(self) -> bool:
+        """Whether the inference server has the model loaded (Ollama: /api/ps)"""
+        if self.cassette and self.cassette.replaying:
+            # Replays need no server; report warm so the LLM paths are exercised
+            self._set_resident(True)
+            return True
+        try:
+            resident = self.backend.model_loaded(self.model)
+        except Exception:
+            resident = False
+        self._resident = resident
+        self._resident_checked_at = time.monotonic()
+        return resident
+
+    def is_ready(self) -> bool:
+        """Cheap readiness check for the request path (cached for ``readiness_ttl``)"""
+        if time.monotonic() - self._resident_checked_at > self.readiness_ttl:
+            return self.model_resident()
+        return self._resident
+
+    def readiness(self) -> dict:
+        """Readiness probe: model residency and recent generate latency"""
+        latencies = list(self._latencies)
+        return {
+            "model": self.model,
+            "resident": self.model_resident(),
+            "median_latency_ms": round(statistics.median(latencies) * 1000) if latencies else None,
+            "samples": len(latencies),
+        }
+
+    def prompt_stats(self) -> List[dict]:
+        """Per-variant output length, clean-extraction rate and latency of the prompt templates"""
+        return self.prompts.stats()
+
+    def output_stats(self) -> List[dict]:
+        """Tokens generated versus kept and the learned num_predict per template and technology"""
+        return self.output_budget.report()
+
+    def queue_metrics(self) -> dict:
+        """Queue depth and wait-time metrics of the LLM scheduler"""
+        return self.scheduler.metrics()
+
+    def claim_question(self, session_id: str, question_text: str) -> bool:
+        """Record ``question_text`` as asked in the session unless it repeats an earlier question"""
+        if self._find_repeat(session_id, question_text):
+            return False
+        self._remember_question(session_id, question_text)
+        return True
+
+    def seed_session(self, session_id: str, questions: List[str]):
+        """Rebuild a session's asked-question index, e.g. after it moved to this replica"""
+        index = QuestionIndex()
+        for question_text in questions:
+            index.add(question_key(question_text), question_text)
+        self.asked_questions_cache[session_id] = index
 
     def clear_session_cache(self, session_id: str):
         """Clear cache for session"""
@@ -158,7 +636,9 @@ Follow-up question:"""
                          if key.startswith(session_id)]
         for key in keys_to_remove:
             del self.asked_questions_cache[key]
+        self.session_contexts.pop(session_id, None)
 
     def clear_all_cache(self):
         """Clear all caches"""
-        self.asked_questions_cache.clear()
\ No newline at end of file
+        self.asked_questions_cache.clear()
+        self.session_contexts.clear()
\ No newline at end of file
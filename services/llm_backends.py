@@ -0,0 +1,198 @@
+# services/llm_backends.py
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+# Requests are Ollama /api/generate payloads (model, prompt, options with
+# temperature, top_p, num_predict and stop, optional format, context and
+# keep_alive); every backend returns {"response", "eval_count"}, and
+# Ollama also the "context" to send back with the next prompt.
+
+
+class LLMBackend:
+    """Interface of an inference server used by LlamaService"""
+
+    name = "base"
+    # Whether ``batch`` sends several prompts in one request
+    native_batch = False
+    # Whether ``generate`` returns a context that can be sent back with the next prompt
+    supports_context = False
+
+    def generate(self, payload: dict, timeout: float) -> dict:
+        raise NotImplementedError
+
+    def stream(self, payload: dict, timeout: float) -> Iterator[str]:
+        """Yield the generated text as it arrives; closing the generator early
+        drops the connection, which stops the generation on the server"""
+        raise NotImplementedError
+
+    def batch(self, payloads: List[dict], timeout: float) -> List[dict]:
+        """Generate every payload; results are aligned with ``payloads``"""
+        return [self.generate(payload, timeout) for payload in payloads]
+
+    def model_loaded(self, model: str) -> bool:
+        raise NotImplementedError
+
+
+class OllamaBackend(LLMBackend):
+    """Ollama's /api/generate. Ollama has no batch endpoint: ``batch`` sends
+    up to ``parallel`` requests at once, which the server interleaves when
+    started with OLLAMA_NUM_PARALLEL of at least the same value."""
+
+    name = "ollama"
+    supports_context = True
+
+    def __init__(self, base_url: str, parallel: int = 1):
+        self.base_url = base_url.rstrip("/")
+        self.parallel = parallel
+
+    def generate(self, payload: dict, timeout: float) -> dict:
+        response = requests.post(f"{self.base_url}/api/generate", json=dict(payload, stream=False), timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def stream(self, payload: dict, timeout: float) -> Iterator[str]:
+        with requests.post(f"{self.base_url}/api/generate", json=dict(payload, stream=True),
+                           stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+
+    def batch(self, payloads: List[dict], timeout: float) -> List[dict]:
+        if self.parallel <= 1 or len(payloads) <= 1:
+            return super().batch(payloads, timeout)
+        with ThreadPoolExecutor(max_workers=min(self.parallel, len(payloads))) as pool:
+            return list(pool.map(lambda payload: self.generate(payload, timeout), payloads))
+
+    def model_loaded(self, model: str) -> bool:
+        response = requests.get(f"{self.base_url}/api/ps", timeout=1.0)
+        response.raise_for_status()
+        names = {entry.get("name", "") for entry in response.json().get("models", [])}
+        return any(name == model or name.split(":")[0] == model for name in names)
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """``/v1/completions`` of OpenAI-compatible servers such as llama.cpp server and vLLM.
+
+    ``batch`` sends up to ``max_batch`` prompts that share their sampling
+    options as one request (a list ``prompt``), which vLLM and llama.cpp
+    schedule together. Continuous batching itself is a server setting
+    (llama.cpp: ``--parallel N --cont-batching``; vLLM: on by default,
+    sized with ``--max-num-seqs``); raise LLM_MAX_CONCURRENCY to match so
+    the scheduler keeps the server's slots busy. ``cache_prompt`` asks
+    llama.cpp to reuse the KV cache of the shared prompt prefix.
+    """
+
+    name = "openai"
+    native_batch = True
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, max_batch: int = 8,
+                 cache_prompt: bool = True, extra: Optional[dict] = None):
+        self.base_url = base_url.rstrip("/")
+        if self.base_url.endswith("/v1"):
+            self.base_url = self.base_url[:-3]
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.max_batch = max_batch
+        self.cache_prompt = cache_prompt
+        self.extra = extra or {}
+
+    def _request(self, payload: dict, prompt) -> dict:
+        options = payload.get("options", {})
+        body = {
+            "model": payload["model"],
+            "prompt": prompt,
+            "max_tokens": options.get("num_predict", 100),
+            "temperature": options.get("temperature", 0.6),
+            "top_p": options.get("top_p", 0.8),
+            **self.extra,
+        }
+        if options.get("stop"):
+            body["stop"] = options["stop"]
+        if payload.get("format") == "json":
+            body["response_format"] = {"type": "json_object"}
+        if self.cache_prompt:
+            body["cache_prompt"] = True
+        return body
+
+    @staticmethod
+    def _result(choice: dict, completion_tokens: Optional[int]) -> dict:
+        return {"response": choice.get("text", ""), "eval_count": completion_tokens,
+                "done_reason": choice.get("finish_reason")}
+
+    def generate(self, payload: dict, timeout: float) -> dict:
+        response = requests.post(f"{self.base_url}/v1/completions", json=self._request(payload, payload["prompt"]),
+                                 headers=self.headers, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        return self._result(data["choices"][0], data.get("usage", {}).get("completion_tokens"))
+
+    def stream(self, payload: dict, timeout: float) -> Iterator[str]:
+        body = dict(self._request(payload, payload["prompt"]), stream=True)
+        with requests.post(f"{self.base_url}/v1/completions", json=body, headers=self.headers,
+                           stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line or not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                if choices[0].get("text"):
+                    yield choices[0]["text"]
+
+    def batch(self, payloads: List[dict], timeout: float) -> List[dict]:
+        results: List[Optional[dict]] = [None] * len(payloads)
+        # Prompts can only share a request when everything but the prompt matches
+        groups: Dict[str, List[int]] = {}
+        for index, payload in enumerate(payloads):
+            key = json.dumps({field: value for field, value in payload.items() if field != "prompt"}, sort_keys=True)
+            groups.setdefault(key, []).append(index)
+
+        for indexes in groups.values():
+            for start in range(0, len(indexes), self.max_batch):
+                chunk = indexes[start:start + self.max_batch]
+                body = self._request(payloads[chunk[0]], [payloads[index]["prompt"] for index in chunk])
+                response = requests.post(f"{self.base_url}/v1/completions", json=body,
+                                         headers=self.headers, timeout=timeout)
+                response.raise_for_status()
+                choices = response.json()["choices"]
+                for choice in choices:
+                    # Usage is only reported for the whole request
+                    results[chunk[choice.get("index", 0)]] = self._result(choice, None)
+        return [result or {"response": "", "eval_count": None} for result in results]
+
+    def model_loaded(self, model: str) -> bool:
+        response = requests.get(f"{self.base_url}/v1/models", headers=self.headers, timeout=1.0)
+        response.raise_for_status()
+        # llama.cpp lists its model under --alias (or the file path); LLM_MODEL must match it
+        return model in {entry.get("id", "") for entry in response.json().get("data", [])}
+
+
+def backend_from_env(base_url: Optional[str] = None) -> LLMBackend:
+    """Backend selected by LLM_BACKEND (ollama | openai)"""
+    kind = os.getenv("LLM_BACKEND", "ollama").lower()
+    if kind == "ollama":
+        return OllamaBackend(
+            base_url or os.getenv("LLM_BASE_URL") or os.getenv("OLLAMA_URL", "http://localhost:11434"),
+            parallel=int(os.getenv("LLM_BATCH_PARALLEL", "1")),
+        )
+    if kind in ("openai", "llamacpp", "vllm"):
+        return OpenAICompatibleBackend(
+            base_url or os.getenv("LLM_BASE_URL", "http://localhost:8080"),
+            api_key=os.getenv("LLM_API_KEY"),
+            max_batch=int(os.getenv("LLM_MAX_BATCH", "8")),
+            # cache_prompt is a llama.cpp extension
+            cache_prompt=os.getenv("LLM_CACHE_PROMPT", "true" if kind == "llamacpp" else "false").lower()
+            in ("1", "true", "yes"),
+        )
+    raise ValueError(f"Unknown LLM_BACKEND: {kind}")
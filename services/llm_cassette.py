@@ -0,0 +1,113 @@
+# services/llm_cassette.py
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+# Payload fields that decide the generation; keep_alive and stream do not
+KEY_FIELDS = ("model", "prompt", "options", "format", "context")
+# Options left out of the key: OutputBudget learns num_predict and stop from
+# earlier calls, so they differ between runs that send the same prompts
+VOLATILE_OPTIONS = ("num_predict", "stop")
+
+
+class CassetteMiss(LookupError):
+    """No recording exists for a request made in replay mode"""
+
+
+class LLMCassette:
+    """Records LLM generations to disk and replays them without a model server.
+
+    Each request is addressed by the SHA-256 of its prompt, model and
+    sampling options (without the learned output budget); ``<directory>/<key[:2]>/<key>.json`` holds the request and
+    every response recorded for it with its latency. Replay returns the
+    recordings of a key in order (wrapping around), so a recorded run is
+    reproduced exactly, and can sleep for the recorded latency scaled by
+    ``latency_scale`` (0 replays at full speed).
+    """
+
+    def __init__(self, directory: str, mode: str = "replay", latency_scale: float = 0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._plays = {}  # key -> recordings replayed so far
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMCassette"]:
+        mode = os.getenv("LLM_CASSETTE", "").lower()
+        if not mode or mode == "off":
+            return None
+        return cls(
+            directory=os.getenv("LLM_CASSETTE_DIR", "cassettes"),
+            mode=mode,
+            latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY", "0")),
+        )
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def key(payload: dict) -> str:
+        request = {field: payload[field] for field in KEY_FIELDS if field in payload}
+        if "options" in request:
+            request["options"] = {name: value for name, value in request["options"].items()
+                                  if name not in VOLATILE_OPTIONS}
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _read(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def generate(self, payload: dict, send: Callable[[], dict]) -> dict:
+        """Replay the response to ``payload``, or call ``send`` and record it"""
+        key = self.key(payload)
+        if self.replaying:
+            return self._replay(key)
+
+        started = time.monotonic()
+        data = send()
+        latency = time.monotonic() - started
+        with self._lock:
+            entry = self._read(key) or {
+                "request": {field: payload[field] for field in KEY_FIELDS if field in payload},
+                "responses": [],
+            }
+            entry["responses"].append({"response": data, "latency": round(latency, 4)})
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(path + ".tmp", path)
+        return data
+
+    def _replay(self, key: str) -> dict:
+        entry = self._read(key)
+        if not entry or not entry.get("responses"):
+            with self._lock:
+                self.misses += 1
+            raise CassetteMiss(f"No recorded response for request {key[:12]}")
+        with self._lock:
+            played = self._plays.get(key, 0)
+            self._plays[key] = played + 1
+        recording = entry["responses"][played % len(entry["responses"])]
+        if self.latency_scale > 0:
+            time.sleep(recording.get("latency", 0.0) * self.latency_scale)
+        return recording["response"]
+
+    def rewind(self):
+        """Replay every key from its first recording again"""
+        with self._lock:
+            self._plays.clear()
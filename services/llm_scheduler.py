@@ -0,0 +1,160 @@
+# services/llm_scheduler.py
+import os
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from models.common import LLMPriority
+
+
+class AdmissionError(Exception):
+    """Raised when an LLM request cannot be admitted in time"""
+
+
+class LLMScheduler:
+    """Admission control in front of the Ollama server.
+
+    At most ``max_concurrency`` requests run at once; up to ``max_queue``
+    more wait in priority order (FIFO within a priority). A request that is
+    not admitted before its deadline raises ``AdmissionError`` so callers
+    can go straight to their fallback path.
+    """
+
+    DEFAULT_DEADLINES = {
+        LLMPriority.INTERACTIVE: 8.0,
+        LLMPriority.PREFETCH: 30.0,
+        LLMPriority.BATCH: 120.0,
+    }
+
+    def __init__(self, max_concurrency: int = 2, max_queue: int = 32,
+                 deadlines: Optional[Dict[LLMPriority, float]] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.deadlines = dict(self.DEFAULT_DEADLINES)
+        if deadlines:
+            self.deadlines.update(deadlines)
+
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiters = []  # heap of [priority, seq]
+        self._seq = itertools.count()
+
+        self._admitted = {p: 0 for p in LLMPriority}
+        self._rejected = {"queue_full": 0, "deadline": 0}
+        self._wait_times = {p: deque(maxlen=500) for p in LLMPriority}
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        return cls(
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "2")),
+            max_queue=int(os.getenv("LLM_MAX_QUEUE", "32")),
+        )
+
+    @contextmanager
+    def slot(self, priority: LLMPriority = LLMPriority.INTERACTIVE, deadline: Optional[float] = None):
+        """Hold an execution slot for the duration of the block"""
+        self.acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self, priority: LLMPriority = LLMPriority.INTERACTIVE, deadline: Optional[float] = None):
+        priority = LLMPriority(priority)
+        if deadline is None:
+            deadline = self.deadlines[priority]
+        started = time.monotonic()
+
+        with self._cond:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._admit(priority, 0.0)
+                return
+
+            if len(self._waiters) >= self.max_queue:
+                self._rejected["queue_full"] += 1
+                raise AdmissionError(f"LLM queue full ({len(self._waiters)} waiting)")
+
+            entry = [int(priority), next(self._seq)]
+            heapq.heappush(self._waiters, entry)
+            end = started + deadline
+
+            while True:
+                if self._waiters[0] is entry and self._active < self.max_concurrency:
+                    heapq.heappop(self._waiters)
+                    self._admit(priority, time.monotonic() - started)
+                    # The next waiter may also fit if several slots freed up
+                    self._cond.notify_all()
+                    return
+
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._rejected["deadline"] += 1
+                    self._cond.notify_all()
+                    raise AdmissionError(f"LLM request not admitted within {deadline:.1f}s")
+
+                self._cond.wait(remaining)
+
+    def release(self):
+        with self._cond:
+            self._active = max(0, self._active - 1)
+            self._cond.notify_all()
+
+    def _admit(self, priority: LLMPriority, waited: float):
+        self._active += 1
+        self._admitted[priority] += 1
+        self._wait_times[priority].append(waited)
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._waiters)
+
+    def waiting(self, priority: LLMPriority) -> int:
+        """Number of queued requests at ``priority`` or more urgent"""
+        with self._cond:
+            return sum(1 for p, _ in self._waiters if p <= priority)
+
+    def saturated(self) -> bool:
+        """True when every slot is busy"""
+        with self._cond:
+            return self._active >= self.max_concurrency
+
+    def metrics(self) -> dict:
+        """Snapshot of queue depth, admissions, rejections and wait times"""
+        with self._cond:
+            waiting_by_priority = {p.name.lower(): 0 for p in LLMPriority}
+            for priority, _ in self._waiters:
+                waiting_by_priority[LLMPriority(priority).name.lower()] += 1
+
+            wait_stats = {}
+            for priority, samples in self._wait_times.items():
+                ordered = sorted(samples)
+                wait_stats[priority.name.lower()] = {
+                    "count": len(ordered),
+                    "p50_ms": round(_percentile(ordered, 0.50) * 1000, 1),
+                    "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+                    "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 1),
+                }
+
+            return {
+                "active": self._active,
+                "max_concurrency": self.max_concurrency,
+                "queue_depth": len(self._waiters),
+                "max_queue": self.max_queue,
+                "waiting": waiting_by_priority,
+                "admitted": {p.name.lower(): n for p, n in self._admitted.items()},
+                "rejected": dict(self._rejected),
+                "wait_time": wait_stats,
+            }
+
+
+def _percentile(ordered: list, q: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
@@ -0,0 +1,59 @@
+# services/metrics_publisher.py
+import os
+import socket
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from services.shared_store import SharedStore
+
+METRICS_PREFIX = "llm:"
+
+
+class MetricsPublisher:
+    """Publishes this instance's LLM queue and readiness metrics for the admin dashboard.
+
+    The app and the dashboard are separate processes, so every ``interval``
+    seconds the app writes ``queue_metrics()`` and ``readiness()`` to the
+    shared store under ``llm:<node id>``. Entries expire after three intervals, so stopped
+    instances drop off the dashboard.
+    """
+
+    def __init__(self, store: SharedStore, llama_service, node_id: Optional[str] = None, interval: float = 10.0):
+        self.store = store
+        self.llama_service = llama_service
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.publish()
+            except Exception as e:
+                print(f"[ERROR] Error publishing LLM metrics: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def publish(self):
+        self.store.set(f"{METRICS_PREFIX}{self.node_id}", {
+            "queue": self.llama_service.queue_metrics(),
+            "readiness": self.llama_service.readiness(),
+            "updated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }, ttl=self.interval * 3)
+
+
+def published_metrics(store: SharedStore) -> Dict[str, dict]:
+    """Latest metrics of every live instance, keyed by node id"""
+    return {key[len(METRICS_PREFIX):]: value for key, value in sorted(store.scan(METRICS_PREFIX).items())}
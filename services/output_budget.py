@@ -0,0 +1,112 @@
+# services/output_budget.py
+import math
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+# Stop sequences sent with every single-question prompt
+DEFAULT_STOP = ["\n\n", "Answer:", "Response:", "Follow-up Question:"]
+
+
+class OutputStats:
+    __slots__ = ("kept_tokens", "first_line", "calls", "generated", "kept", "truncated")
+
+    def __init__(self, window: int):
+        self.kept_tokens = deque(maxlen=window)  # Token position where the kept question ended
+        self.first_line = deque(maxlen=window)  # Whether the question was the response's first line
+        self.calls = 0
+        self.generated = 0
+        self.kept = 0
+        self.truncated = 0
+
+
+class OutputBudget:
+    """Learns how many tokens a prompt needs and where to stop generating.
+
+    ``_extract_clean_question`` keeps only the first non-empty line, so
+    everything generated after it is wasted. For every (template,
+    technology) this records the token position where that line ended
+    (estimated from Ollama's ``eval_count`` and the character offset) and,
+    after ``min_samples`` calls, requests ``num_predict`` just above the
+    observed ``percentile`` plus ``margin``. When the question is nearly
+    always the first line, generation also stops at the first newline;
+    otherwise it stops at a newline directly after a question mark.
+    """
+
+    def __init__(self, default_predict: int = 100, min_predict: int = 24, margin: int = 8,
+                 percentile: float = 0.95, min_samples: int = 10, first_line_rate: float = 0.9,
+                 window: int = 200, enabled: bool = True):
+        self.default_predict = default_predict
+        self.min_predict = min_predict
+        self.margin = margin
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.first_line_rate = first_line_rate
+        self.window = window
+        self.enabled = enabled
+        self._stats = {}  # (template, technology) -> OutputStats
+        self._lock = threading.Lock()
+
+    def options(self, template: str, technology: str) -> Tuple[int, List[str]]:
+        """(num_predict, stop) for the next generation of ``template`` about ``technology``"""
+        with self._lock:
+            stats = self._stats.get((template, technology))
+            if not self.enabled or stats is None or len(stats.kept_tokens) < self.min_samples:
+                return self.default_predict, DEFAULT_STOP + ["?\n"]
+            kept = sorted(stats.kept_tokens)
+            needed = kept[min(len(kept) - 1, int(len(kept) * self.percentile))]
+            num_predict = max(self.min_predict, min(self.default_predict, needed + self.margin))
+            if sum(stats.first_line) >= self.first_line_rate * len(stats.first_line):
+                return num_predict, DEFAULT_STOP + ["\n"]
+            return num_predict, DEFAULT_STOP + ["?\n"]
+
+    def record(self, template: str, technology: str, response: str, num_predict: int,
+               eval_count: Optional[int]):
+        """Fold one raw generation into the statistics"""
+        stripped = response.lstrip()
+        first_line = stripped.split("\n", 1)[0].strip()
+        if not eval_count or not first_line:
+            kept_tokens = 0
+        else:
+            # Characters up to the end of the kept line, converted at the
+            # response's own characters-per-token ratio
+            kept_end = len(response) - len(stripped) + len(stripped.split("\n", 1)[0])
+            kept_tokens = math.ceil(eval_count * kept_end / len(response))
+        truncated = bool(eval_count) and eval_count >= num_predict and "\n" not in stripped
+        with self._lock:
+            stats = self._stats.get((template, technology))
+            if stats is None:
+                stats = self._stats[(template, technology)] = OutputStats(self.window)
+            stats.calls += 1
+            stats.generated += eval_count or 0
+            stats.kept += kept_tokens
+            if truncated:
+                # The budget cut the question off; ask for more next time
+                stats.truncated += 1
+                kept_tokens = num_predict + self.margin * 2
+            if stripped and eval_count:
+                stats.kept_tokens.append(kept_tokens)
+            # A leading blank line would end the generation at once with a newline stop
+            stats.first_line.append(bool(first_line) and not response.lstrip(" \t").startswith("\n"))
+
+    def report(self) -> List[dict]:
+        """Tokens generated versus kept and the current budget per (template, technology)"""
+        with self._lock:
+            keys = sorted(self._stats)
+        rows = []
+        for template, technology in keys:
+            num_predict, stop = self.options(template, technology)
+            with self._lock:
+                stats = self._stats[(template, technology)]
+                rows.append({
+                    "template": template,
+                    "technology": technology,
+                    "calls": stats.calls,
+                    "tokens_generated": stats.generated,
+                    "tokens_kept": stats.kept,
+                    "kept_ratio": round(stats.kept / stats.generated, 3) if stats.generated else None,
+                    "truncated": stats.truncated,
+                    "num_predict": num_predict,
+                    "stop_at_newline": "\n" in stop,
+                })
+        return rows
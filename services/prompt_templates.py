@@ -0,0 +1,124 @@
+# services/prompt_templates.py
+import json
+import os
+import random
+import statistics
+import threading
+import zlib
+from collections import deque
+from string import Formatter
+from typing import Dict, List, Optional
+
+DEFAULT_TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "prompts", "templates.json")
+
+
+class PromptTemplate:
+    """One versioned prompt, split into literal text and fields once at load time"""
+
+    def __init__(self, name: str, version: str, text: str, weight: float = 1.0):
+        self.name = name
+        self.version = version
+        self.weight = weight
+        self.parts = []  # (literal, field name or None)
+        for literal, field, _spec, _conversion in Formatter().parse(text):
+            self.parts.append((literal, field or None))
+        self.fields = {field for _literal, field in self.parts if field}
+
+    def render(self, **values) -> str:
+        return "".join(literal + (str(values[field]) if field else "") for literal, field in self.parts)
+
+
+class VariantStats:
+    __slots__ = ("calls", "valid", "output_chars", "latencies")
+
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.valid = 0
+        self.output_chars = 0
+        self.latencies = deque(maxlen=window)  # Seconds per call
+
+
+class PromptRegistry:
+    """Versioned prompt templates with weighted A/B variants and per-variant stats.
+
+    Templates are read once from a JSON file mapping each template name to
+    a list of ``{"version", "weight", "text"}`` variants. ``choose`` picks a
+    variant by weight, stably per session when given a key; ``record``
+    collects output length, clean-extraction success and latency per
+    variant, reported by ``stats``.
+    """
+
+    def __init__(self, templates: Dict[str, List[PromptTemplate]]):
+        self.templates = templates
+        self._stats = {}  # (name, version) -> VariantStats
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "PromptRegistry":
+        path = path or os.getenv("PROMPT_TEMPLATES", DEFAULT_TEMPLATES_PATH)
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        templates = {
+            name: [PromptTemplate(name, variant["version"], variant["text"], float(variant.get("weight", 1.0)))
+                   for variant in variants]
+            for name, variants in raw.items()
+        }
+        print(f"[DEBUG] Loaded prompt templates from {path}: "
+              + ", ".join(f"{name} ({len(variants)})" for name, variants in templates.items()))
+        return cls(templates)
+
+    def variants(self, name: str) -> List[PromptTemplate]:
+        return self.templates[name]
+
+    def get(self, name: str, version: str) -> PromptTemplate:
+        for template in self.templates[name]:
+            if template.version == version:
+                return template
+        raise KeyError(f"No version {version!r} of prompt template {name!r}")
+
+    def choose(self, name: str, key: Optional[str] = None) -> PromptTemplate:
+        """Weighted pick among the variants of ``name``; the same key always gets the same variant"""
+        variants = [template for template in self.templates[name] if template.weight > 0] or self.templates[name][:1]
+        if len(variants) == 1:
+            return variants[0]
+        total = sum(template.weight for template in variants)
+        if key is None:
+            point = random.random() * total
+        else:
+            point = (zlib.crc32(f"{name}|{key}".encode("utf-8")) / 2 ** 32) * total
+        for template in variants:
+            point -= template.weight
+            if point < 0:
+                return template
+        return variants[-1]
+
+    def record(self, template: PromptTemplate, output: str, valid: bool, latency: float):
+        with self._lock:
+            stats = self._stats.get((template.name, template.version))
+            if stats is None:
+                stats = self._stats[(template.name, template.version)] = VariantStats()
+            stats.calls += 1
+            stats.valid += int(valid)
+            stats.output_chars += len(output)
+            stats.latencies.append(latency)
+
+    def stats(self) -> List[dict]:
+        """Per-variant calls, mean output length, clean-extraction rate and median latency"""
+        with self._lock:
+            rows = []
+            for name, variants in self.templates.items():
+                for template in variants:
+                    stats = self._stats.get((name, template.version))
+                    calls = stats.calls if stats else 0
+                    rows.append({
+                        "template": name,
+                        "version": template.version,
+                        "weight": template.weight,
+                        "calls": calls,
+                        "mean_output_chars": round(stats.output_chars / calls, 1) if calls else None,
+                        "valid_rate": round(stats.valid / calls, 3) if calls else None,
+                        "median_latency_ms": (round(statistics.median(stats.latencies) * 1000)
+                                              if calls and stats.latencies else None),
+                    })
+            return rows
@@ -0,0 +1,191 @@
+# services/question_index.py
+import re
+import operator
+import random
+import hashlib
+import zlib
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # signatures are computed in pure Python without NumPy
+    np = None
+
+# Words that say nothing about what a question is asking
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "could", "do", "does", "for",
+    "from", "give", "how", "i", "in", "is", "it", "its", "me", "of", "on", "or", "please",
+    "some", "that", "the", "their", "them", "this", "to", "us", "use", "using", "walk",
+    "was", "what", "when", "where", "which", "while", "who", "why", "will", "with",
+    "would", "you", "your", "explain", "describe", "tell", "example", "examples",
+    "write", "create", "implement", "work", "handle", "one", "main", "key", "between",
+    "difference", "different", "common", "typically", "approach", "concept",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+# (a * h + b) stays below 2**64 for 32-bit hashes, so NumPy can use uint64
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def content_words(text: str) -> List[str]:
+    words = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        words.append(token)
+    return words
+
+
+def shingles(text: str) -> set:
+    """Bigrams of the normalised content words of a question.
+
+    Stopwords and phrasing are dropped, so paraphrases keep most bigrams;
+    single content words are not used because the technology and topic
+    words every question about a subject shares would put whole subjects
+    in the same LSH buckets.
+    """
+    words = content_words(text)
+    if len(words) < 2:
+        return set(words)
+    return {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+def question_key(text: str) -> str:
+    """Stable key of a question: the same text always maps to the same entry"""
+    return hashlib.sha1(" ".join(_TOKEN_RE.findall(text.lower())).encode("utf-8")).hexdigest()[:16]
+
+
+class QuestionIndex:
+    """MinHash/LSH index for spotting near-duplicate questions.
+
+    Lookups only compare signatures that share at least one LSH band with
+    the query. Bands of ``rows`` = 6 hashes rarely collide for questions
+    that merely share a subject, so candidate sets stay small, and with
+    NumPy the candidates are compared in one vectorised step;
+    ``scripts/bench_question_index.py`` measures lookups at 100k entries.
+    """
+
+    def __init__(self, num_perm: int = 120, bands: int = 20, threshold: float = 0.5, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        if np is not None:
+            self._perm_a = np.array([a for a, _ in self._perms], dtype=np.uint64)
+            self._perm_b = np.array([b for _, b in self._perms], dtype=np.uint64)
+        self._buckets: List[Dict[tuple, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, tuple] = {}
+        self._vectors = {}  # key -> signature as a NumPy array, when NumPy is installed
+        self._texts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def signature(self, text: str) -> tuple:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text)]
+        if not hashes:
+            return (_MERSENNE_PRIME,) * self.num_perm
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)[:, None]
+            return tuple(((values * self._perm_a + self._perm_b) % _MERSENNE_PRIME).min(axis=0).tolist())
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        )
+
+    def _bands(self, signature: tuple):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def add(self, key: str, text: str) -> tuple:
+        signature = self.signature(text)
+        with self._lock:
+            if key in self._signatures:
+                self._remove_locked(key)
+            self._signatures[key] = signature
+            if np is not None:
+                self._vectors[key] = np.array(signature, dtype=np.uint32)
+            self._texts[key] = text
+            for band, chunk in self._bands(signature):
+                self._buckets[band].setdefault(chunk, []).append(key)
+        return signature
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key: str):
+        signature = self._signatures.pop(key, None)
+        self._vectors.pop(key, None)
+        self._texts.pop(key, None)
+        if signature is None:
+            return
+        for band, chunk in self._bands(signature):
+            bucket = self._buckets[band].get(chunk)
+            if bucket is None:
+                continue
+            if key in bucket:
+                bucket.remove(key)
+            if not bucket:
+                del self._buckets[band][chunk]
+
+    def query(self, text: str, threshold: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Stored questions similar to ``text``, most similar first"""
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(text)
+
+        with self._lock:
+            candidates = set()
+            for band, chunk in self._bands(signature):
+                candidates.update(self._buckets[band].get(chunk, ()))
+
+            matches = []
+            if np is not None and candidates:
+                keys = list(candidates)
+                similarities = (np.stack([self._vectors[key] for key in keys])
+                                == np.array(signature, dtype=np.uint32)).mean(axis=1)
+                matches = [(keys[i], float(similarities[i])) for i in np.flatnonzero(similarities >= threshold)]
+            else:
+                for key in candidates:
+                    similarity = self._similarity(signature, self._signatures[key])
+                    if similarity >= threshold:
+                        matches.append((key, similarity))
+
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def find_duplicate(self, text: str, threshold: Optional[float] = None) -> Optional[str]:
+        """Key of the closest stored near-duplicate, if any"""
+        matches = self.query(text, threshold)
+        return matches[0][0] if matches else None
+
+    def get_text(self, key: str) -> Optional[str]:
+        return self._texts.get(key)
+
+    def _similarity(self, a: tuple, b: tuple) -> float:
+        return sum(map(operator.eq, a, b)) / self.num_perm
+
+
+def dedupe_questions(questions: Iterable[str], threshold: float = 0.5) -> List[str]:
+    """Collapse near-duplicate questions, keeping the first of each group"""
+    index = QuestionIndex(threshold=threshold)
+    kept = []
+    for question in questions:
+        if index.find_duplicate(question) is None:
+            index.add(question_key(question), question)
+            kept.append(question)
+    return kept
@@ -0,0 +1,133 @@
+# services/ranking_service.py
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from database.durability import with_tier, DURABLE
+from models.common import ProficiencyLevel
+from services.rating_service import tech_key, tech_stats
+
+LEVELS = [level.value for level in ProficiencyLevel]  # Ordered Beginner -> Advanced
+
+
+def skill_tags(tech_stack: List[Dict]) -> List[str]:
+    """Tags for every level a candidate meets ("python:beginner", "python:intermediate", ...).
+
+    "At least Intermediate PostgreSQL" then becomes a plain equality match
+    on "postgresql:intermediate", which a multikey index can serve.
+    """
+    tags = set()
+    for category in tech_stack or []:
+        technologies = category.get("technologies", []) if isinstance(category, dict) else category.technologies
+        for tech in technologies:
+            name = tech.get("name", "").strip().lower()
+            level = tech.get("proficiency", ProficiencyLevel.INTERMEDIATE.value)
+            if not name or level not in LEVELS:
+                continue
+            for reached in LEVELS[:LEVELS.index(level) + 1]:
+                tags.add(f"{name}:{reached.lower()}")
+    return sorted(tags)
+
+
+class RankingService:
+    """Top-K candidate queries over the denormalized ``candidate_scores`` collection.
+
+    One document per candidate joins the profile (positions, claimed skills)
+    with the scores of their latest completed interview. It is refreshed on
+    completion and after background regrading, so a shortlist is one
+    indexed ``find`` sorted by ``overall_score`` instead of a join in Python.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.collection = with_tier(db.candidate_scores, DURABLE)
+        self.sessions = db.interview_sessions
+        self.candidates = db.candidates
+
+    def refresh(self, session_id: str) -> bool:
+        """Upsert the score document of a completed session's candidate"""
+        session = self.sessions.find_one(
+            {"session_id": session_id, "status": "completed"},
+            {"_id": 0, "session_id": 1, "candidate_id": 1, "tech_plan": 1, "tech_ratings": 1,
+             "total_points": 1, "max_possible_points": 1, "completed_at": 1}
+        )
+        if not session:
+            return False
+        candidate = self.candidates.find_one(
+            {"candidate_id": session["candidate_id"]},
+            {"_id": 0, "full_name": 1, "email": 1, "years_experience": 1, "desired_positions": 1, "tech_stack": 1}
+        )
+        if not candidate:
+            return False
+
+        max_points = session.get("max_possible_points", 0)
+        ratings = session.get("tech_ratings", {})
+        tech_scores = {}
+        for tech in session.get("tech_plan", []):
+            mean = tech_stats(ratings.get(tech_key(tech["name"])))["mean"]
+            if mean is not None:
+                tech_scores[tech_key(tech["name"])] = round(mean, 2)
+
+        try:
+            self._upsert(session, candidate, tech_scores, max_points)
+        except DuplicateKeyError:
+            # The stored score comes from a more recent session
+            return False
+        return True
+
+    def _upsert(self, session: dict, candidate: dict, tech_scores: Dict[str, float], max_points: float):
+        self.collection.update_one(
+            # A newer completed session replaces the score of an older one
+            {"candidate_id": session["candidate_id"],
+             "completed_at": {"$not": {"$gt": session.get("completed_at")}}},
+            {"$set": {
+                "candidate_id": session["candidate_id"],
+                "session_id": session["session_id"],
+                "full_name": candidate.get("full_name"),
+                "email": candidate.get("email"),
+                "years_experience": candidate.get("years_experience", 0),
+                "desired_positions": candidate.get("desired_positions", []),
+                "positions": [p.strip().lower() for p in candidate.get("desired_positions", [])],
+                "skill_tags": skill_tags(candidate.get("tech_stack", [])),
+                "overall_score": round(session.get("total_points", 0) / max_points * 10, 2) if max_points else 0.0,
+                "tech_scores": tech_scores,
+                "completed_at": session.get("completed_at"),
+                "updated_at": datetime.utcnow(),
+            }},
+            upsert=True
+        )
+
+    def top_candidates(self, position: Optional[str] = None, skills: Optional[Dict[str, str]] = None,
+                       min_experience: int = 0, limit: int = 50,
+                       after: Optional[Tuple[float, str]] = None) -> Tuple[List[dict], Optional[Tuple[float, str]]]:
+        """Candidates ranked by ``overall_score``, best first.
+
+        ``skills`` maps a technology to the minimum proficiency, e.g.
+        ``{"Python": "Advanced", "PostgreSQL": "Intermediate"}``. Pages are
+        keyset-paginated: pass the returned cursor as ``after`` for the next
+        page, which stays one index range scan however deep you page.
+        """
+        query = {}
+        if position:
+            query["positions"] = position.strip().lower()
+        if skills:
+            query["skill_tags"] = {"$all": [f"{name.strip().lower()}:{level.lower()}" for name, level in skills.items()]}
+        if min_experience:
+            query["years_experience"] = {"$gte": min_experience}
+        if after:
+            score, candidate_id = after
+            query["$or"] = [
+                {"overall_score": {"$lt": score}},
+                {"overall_score": score, "candidate_id": {"$gt": candidate_id}},
+            ]
+
+        results = list(
+            self.collection.find(query, {"_id": 0, "positions": 0, "skill_tags": 0})
+            .sort([("overall_score", -1), ("candidate_id", 1)])
+            .limit(limit)
+        )
+        cursor = None
+        if len(results) == limit:
+            cursor = (results[-1]["overall_score"], results[-1]["candidate_id"])
+        return results, cursor
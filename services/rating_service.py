@@ -0,0 +1,85 @@
+# services/rating_service.py
+from typing import Dict, Optional
+
+# Ratings are 0-10; the histogram keeps one bucket per 0.1 point
+BUCKETS = 100
+
+
+def tech_key(technology: str) -> str:
+    """Technology name usable as a Mongo field name ("Vue.js" -> "Vue_js")"""
+    return technology.replace(".", "_").replace("$", "_")
+
+
+def tech_stats(stats: Optional[Dict]) -> Dict:
+    """Derived mean/std-dev for one ``tech_ratings`` entry"""
+    stats = stats or {}
+    count = stats.get("count", 0)
+    if not count:
+        return {"count": 0, "mean": None, "std": None, "min": None, "max": None}
+    mean = stats.get("sum", 0.0) / count
+    variance = max(0.0, stats.get("sum_sq", 0.0) / count - mean * mean)
+    return {
+        "count": count,
+        "mean": mean,
+        "std": variance ** 0.5,
+        "min": stats.get("min"),
+        "max": stats.get("max"),
+    }
+
+
+class RatingService:
+    """Cross-candidate percentile index per (technology, proficiency).
+
+    Each pair has one document holding a histogram of candidates' average
+    ratings, so "how does this candidate rank on Django/Advanced" is a
+    single read by ``_id`` instead of an aggregation over all sessions.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.collection = db.tech_percentiles
+
+    @staticmethod
+    def _index_id(technology: str, proficiency: str) -> str:
+        return f"{technology}|{proficiency}"
+
+    @staticmethod
+    def _bucket(rating: float) -> int:
+        return min(BUCKETS, max(0, int(round(rating * BUCKETS / 10))))
+
+    def record(self, technology: str, proficiency: str, rating: float):
+        """Add one candidate's average rating for a technology"""
+        self.collection.update_one(
+            {"_id": self._index_id(technology, proficiency)},
+            {
+                "$inc": {f"histogram.{self._bucket(rating)}": 1, "count": 1},
+                "$setOnInsert": {"technology": technology, "proficiency": proficiency}
+            },
+            upsert=True
+        )
+
+    def percentile(self, technology: str, proficiency: str, rating: float) -> Optional[float]:
+        """Percentage of candidates rated below ``rating`` (ties count half)"""
+        doc = self.collection.find_one({"_id": self._index_id(technology, proficiency)})
+        if not doc or not doc.get("count"):
+            return None
+
+        bucket = self._bucket(rating)
+        below = equal = 0
+        for key, count in doc.get("histogram", {}).items():
+            index = int(key)
+            if index < bucket:
+                below += count
+            elif index == bucket:
+                equal += count
+        return round(100.0 * (below + equal / 2) / doc["count"], 1)
+
+    def session_percentiles(self, session_doc: dict) -> Dict[str, Optional[float]]:
+        """Percentile of every completed technology of a session"""
+        result = {}
+        ratings = session_doc.get("tech_ratings", {})
+        for tech in session_doc.get("tech_plan", []):
+            stats = tech_stats(ratings.get(tech_key(tech["name"])))
+            if stats["mean"] is not None:
+                result[tech["name"]] = self.percentile(tech["name"], tech["proficiency"], stats["mean"])
+        return result
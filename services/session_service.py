@@ -1,60 +1,149 @@
 # services/session_service.py
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+
 class SessionService:
     def __init__(self, db):
         self.db = db
         self.collection = db.interview_sessions
 
-    async def pause_session(self, session_id: str):
+    def pause_session(self, session_id: str, reason: str = "candidate") -> bool:
         """Pause an active interview session"""
-        await self.collection.update_one(
-            {"session_id": session_id},
+        result = self.collection.update_one(
+            {"session_id": session_id, "status": "active"},
             {
                 "$set": {
                     "status": "paused",
-                    "paused_at": datetime.now()
+                    "paused_at": datetime.utcnow(),
+                    "pause_reason": reason
                 }
             }
         )
+        return result.modified_count > 0
 
-    async def resume_session(self, session_id: str) -> bool:
+    def resume_session(self, session_id: str) -> bool:
         """Resume a paused interview session"""
-        session = await self.collection.find_one({"session_id": session_id})
-        
-        if session and session.get("status") == "paused":
-            await self.collection.update_one(
-                {"session_id": session_id},
-                {
-                    "$set": {
-                        "status": "active",
-                        "resumed_at": datetime.now()
-                    },
-                    "$unset": {"paused_at": ""}
-                }
-            )
-            return True
-        return False
+        result = self.collection.update_one(
+            {"session_id": session_id, "status": "paused"},
+            {
+                "$set": {
+                    "status": "active",
+                    "resumed_at": datetime.utcnow(),
+                    "last_activity_at": datetime.utcnow()
+                },
+                "$unset": {"paused_at": "", "pause_reason": ""}
+            }
+        )
+        return result.modified_count > 0
 
-    async def get_session_summary(self, session_id: str) -> Dict:
+    def get_session_summary(self, session_id: str) -> Dict:
         """Generate comprehensive session summary"""
-        session = await self.collection.find_one({"session_id": session_id})
-        
+        session = self.collection.find_one(
+            {"session_id": session_id},
+            {"_id": 0, "conversation_history": 0, "planned_questions": 0}
+        )
+
         if not session:
             return {}
-        
+
         # Calculate metrics
-        total_questions = len(session.get("questions_asked", []))
-        duration = self._calculate_duration(session)
-        technologies_covered = list(set([
-            q.get("technology") for q in session.get("questions_asked", [])
-        ]))
-        
+        ratings = session.get("answer_ratings", [])
         return {
             "session_id": session_id,
-            "total_questions": total_questions,
-            "duration_minutes": duration,
-            "technologies_covered": technologies_covered,
-            "conversation_length": len(session.get("conversation_history", [])),
+            "total_questions": len(ratings),
+            "duration_minutes": self._calculate_duration(session),
+            "technologies_covered": sorted({r.get("technology") for r in ratings if r.get("technology")}),
             "completion_status": session.get("status"),
             "started_at": session.get("started_at"),
             "completed_at": session.get("completed_at")
         }
+
+    def _calculate_duration(self, session: dict) -> float:
+        started_at = session.get("started_at")
+        ended_at = session.get("completed_at") or session.get("last_activity_at")
+        if not started_at or not ended_at:
+            return 0.0
+        return round((ended_at - started_at).total_seconds() / 60, 1)
+
+    def pause_idle_sessions(self, idle_for: timedelta,
+                            can_pause: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """Pause active sessions without a message for ``idle_for``; returns their ids.
+
+        ``can_pause`` filters the candidates, e.g. to skip sessions whose
+        state is held in memory by another replica.
+        """
+        cutoff = datetime.utcnow() - idle_for
+        idle = {"status": "active", "$or": [
+            {"last_activity_at": {"$lt": cutoff}},
+            # Sessions started before activity was tracked
+            {"last_activity_at": {"$exists": False}, "started_at": {"$lt": cutoff}},
+        ]}
+        session_ids = [doc["session_id"] for doc in self.collection.find(idle, {"_id": 0, "session_id": 1})]
+        if can_pause:
+            session_ids = [session_id for session_id in session_ids if can_pause(session_id)]
+        if session_ids:
+            self.collection.update_many(
+                {"session_id": {"$in": session_ids}, **idle},
+                {"$set": {"status": "paused", "paused_at": datetime.utcnow(), "pause_reason": "idle"}}
+            )
+        return session_ids
+
+    def expire_paused_sessions(self, paused_for: timedelta) -> int:
+        """Mark sessions paused for longer than ``paused_for`` as expired"""
+        result = self.collection.update_many(
+            {"status": "paused", "paused_at": {"$lt": datetime.utcnow() - paused_for}},
+            {"$set": {"status": "expired", "expired_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+
+class SessionReaper:
+    """Periodically pauses idle interviews and expires long-paused ones.
+
+    ``on_paused`` is called with every paused session id so the process can
+    drop its in-memory state and LLM caches for it. With several replicas,
+    ``can_pause`` keeps the reaper away from sessions another replica holds
+    in memory; that replica pauses them itself.
+    """
+
+    def __init__(self, session_service: SessionService, idle_after: timedelta = timedelta(minutes=30),
+                 expire_after: timedelta = timedelta(days=7), interval: float = 60.0,
+                 on_paused: Optional[Callable[[str], None]] = None,
+                 can_pause: Optional[Callable[[str], bool]] = None):
+        self.session_service = session_service
+        self.idle_after = idle_after
+        self.expire_after = expire_after
+        self.interval = interval
+        self.on_paused = on_paused
+        self.can_pause = can_pause
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.reap()
+            except Exception as e:
+                print(f"[ERROR] Session reaper failed: {e}")
+
+    def reap(self) -> dict:
+        paused = self.session_service.pause_idle_sessions(self.idle_after, self.can_pause)
+        for session_id in paused:
+            if self.on_paused:
+                self.on_paused(session_id)
+        expired = self.session_service.expire_paused_sessions(self.expire_after)
+        if paused or expired:
+            print(f"[DEBUG] Reaper paused {len(paused)} idle sessions, expired {expired}")
+        return {"paused": len(paused), "expired": expired}
@@ -0,0 +1,346 @@
+# services/session_state.py
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from database.durability import with_tier, FAST, DURABLE
+
+# Fields needed to drive turn progression; the conversation itself is never
+# loaded except for the last message (the question being answered).
+STATE_PROJECTION = {
+    "_id": 0,
+    "session_id": 1,
+    "candidate_id": 1,
+    "status": 1,
+    "tech_plan": 1,
+    "current_tech_index": 1,
+    "planned_questions": 1,
+    "total_points": 1,
+    "max_possible_points": 1,
+    "tech_ratings": 1,
+    "conversation_history": {"$slice": -1},
+}
+
+
+class SessionState:
+    """Turn-progression state of one interview session.
+
+    Mutations are applied to the attributes and recorded as pending Mongo
+    operations; ``take_update`` drains them into a single coalesced update.
+    """
+
+    __slots__ = (
+        "session_id", "candidate_id", "status", "tech_plan", "current_tech_index",
+        "planned_questions", "total_points", "max_possible_points", "tech_ratings", "last_question",
+        "_set", "_push", "_inc", "_min", "_max", "_lock",
+    )
+
+    def __init__(self, session_id: str, candidate_id: str, status: str = "active",
+                 tech_plan: Optional[List[Dict]] = None, current_tech_index: int = 0,
+                 planned_questions: Optional[Dict] = None, total_points: float = 0.0,
+                 max_possible_points: float = 0.0, tech_ratings: Optional[Dict] = None,
+                 last_question: str = ""):
+        self.session_id = session_id
+        self.candidate_id = candidate_id
+        self.status = status
+        self.tech_plan = tech_plan or []
+        self.current_tech_index = current_tech_index
+        self.planned_questions = planned_questions or {}
+        self.total_points = float(total_points)
+        self.max_possible_points = float(max_possible_points)
+        self.tech_ratings = tech_ratings or {}
+        self.last_question = last_question
+        self._set = {}
+        self._push = {}
+        self._inc = {}
+        self._min = {}
+        self._max = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "SessionState":
+        last_question = ""
+        history = doc.get("conversation_history") or []
+        if history and history[-1].get("role") == "assistant":
+            last_question = history[-1].get("content", "")
+        return cls(
+            session_id=doc["session_id"],
+            candidate_id=doc.get("candidate_id", ""),
+            status=doc.get("status", "active"),
+            tech_plan=doc.get("tech_plan", []),
+            current_tech_index=doc.get("current_tech_index", 0),
+            planned_questions=doc.get("planned_questions", {}),
+            total_points=doc.get("total_points", 0.0),
+            max_possible_points=doc.get("max_possible_points", 0.0),
+            tech_ratings=doc.get("tech_ratings", {}),
+            last_question=last_question,
+        )
+
+    @property
+    def current_tech(self) -> Optional[Dict]:
+        if self.current_tech_index < len(self.tech_plan):
+            return self.tech_plan[self.current_tech_index]
+        return None
+
+    def set(self, field: str, value):
+        with self._lock:
+            self._set[field] = value
+
+    def push(self, field: str, value):
+        with self._lock:
+            self._push.setdefault(field, []).append(value)
+
+    def inc(self, field: str, amount: float):
+        with self._lock:
+            self._inc[field] = self._inc.get(field, 0) + amount
+
+    def min(self, field: str, value):
+        with self._lock:
+            self._min[field] = min(value, self._min.get(field, value))
+
+    def max(self, field: str, value):
+        with self._lock:
+            self._max[field] = max(value, self._max.get(field, value))
+
+    def save_tech_plan(self):
+        """Record the current tech plan and index for persistence"""
+        self.set("tech_plan", [dict(tech) for tech in self.tech_plan])
+        self.set("current_tech_index", self.current_tech_index)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._set or self._push or self._inc or self._min or self._max)
+
+    def take_update(self) -> Optional[dict]:
+        """Drain pending operations into one Mongo update document"""
+        with self._lock:
+            if not self.dirty:
+                return None
+            update = {}
+            if self._set:
+                update["$set"] = self._set
+            if self._push:
+                update["$push"] = {field: {"$each": values} for field, values in self._push.items()}
+            if self._inc:
+                update["$inc"] = self._inc
+            if self._min:
+                update["$min"] = self._min
+            if self._max:
+                update["$max"] = self._max
+            self._set, self._push, self._inc, self._min, self._max = {}, {}, {}, {}, {}
+            return update
+
+    def restore_update(self, update: dict):
+        """Put back operations from a failed flush, ahead of newer ones"""
+        with self._lock:
+            newer_set, newer_push, newer_inc = self._set, self._push, self._inc
+            newer_min, newer_max = self._min, self._max
+            self._set = dict(update.get("$set", {}))
+            self._set.update(newer_set)
+            self._push = {field: list(spec["$each"]) for field, spec in update.get("$push", {}).items()}
+            for field, values in newer_push.items():
+                self._push.setdefault(field, []).extend(values)
+            self._inc = dict(update.get("$inc", {}))
+            for field, amount in newer_inc.items():
+                self._inc[field] = self._inc.get(field, 0) + amount
+            self._min = dict(update.get("$min", {}))
+            for field, value in newer_min.items():
+                self._min[field] = min(value, self._min.get(field, value))
+            self._max = dict(update.get("$max", {}))
+            for field, value in newer_max.items():
+                self._max[field] = max(value, self._max.get(field, value))
+
+
+class SessionStateStore:
+    """In-process store of active session states with write-behind persistence.
+
+    Turns run against the in-memory ``SessionState``; dirty states are
+    written to Mongo by a background flusher in one ``bulk_write`` every
+    ``flush_interval`` seconds. ``flush`` forces a synchronous write (used on
+    completion and pause). A state that is not in memory, for example after
+    a restart, is rebuilt from the persisted document, so at most the last
+    ``flush_interval`` of progress is lost on a crash. Turn updates are
+    written with the fast write concern; completed sessions and sessions
+    leaving memory (``evict``, paused or handed off) wait for a majority of
+    the replica set.
+    """
+
+    def __init__(self, collection, flush_interval: float = 1.0, max_sessions: int = 10000):
+        self.collection = collection
+        self.fast_collection = with_tier(collection, FAST)
+        self.durable_collection = with_tier(collection, DURABLE)
+        self.flush_interval = flush_interval
+        self.max_sessions = max_sessions
+        self._states: Dict[str, SessionState] = {}
+        self._dirty = set()
+        self._pins: Dict[str, int] = {}  # session_id -> turns using the state right now
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.flush_interval * 2)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[ERROR] Write-behind flush failed: {e}")
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            state = self._states.get(session_id)
+        if state is not None:
+            return state
+
+        doc = self.collection.find_one({"session_id": session_id}, STATE_PROJECTION)
+        if not doc:
+            return None
+        state = SessionState.from_doc(doc)
+        return self.put(state)
+
+    def put(self, state: SessionState) -> SessionState:
+        with self._lock:
+            existing = self._states.get(state.session_id)
+            if existing is not None:
+                return existing
+            if len(self._states) >= self.max_sessions:
+                self._evict_clean_locked()
+            self._states[state.session_id] = state
+            return state
+
+    @contextmanager
+    def pinned(self, session_id: str):
+        """Keep the session's state in memory while a turn works on it.
+
+        A clean state evicted mid-turn would take the turn's later writes
+        with it: ``flush`` only writes states that are still in memory.
+        """
+        with self._lock:
+            self._pins[session_id] = self._pins.get(session_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins[session_id] -= 1
+                if not self._pins[session_id]:
+                    del self._pins[session_id]
+
+    def mark_dirty(self, state: SessionState):
+        with self._lock:
+            self._dirty.add(state.session_id)
+
+    def flush(self, session_id: Optional[str] = None, durable: bool = False) -> int:
+        """Write pending operations for one session, or all dirty sessions"""
+        with self._lock:
+            if session_id is None:
+                session_ids = list(self._dirty)
+                self._dirty.clear()
+            elif session_id in self._dirty:
+                session_ids = [session_id]
+                self._dirty.discard(session_id)
+            else:
+                session_ids = []
+            states = [self._states[sid] for sid in session_ids if sid in self._states]
+
+        durable_pending, pending = [], []
+        for state in states:
+            update = state.take_update()
+            if update:
+                # Completion carries the final scores, whichever flush writes it
+                if durable or state.status == "completed":
+                    durable_pending.append((state, update))
+                else:
+                    pending.append((state, update))
+
+        batches = [(self.durable_collection, durable_pending), (self.fast_collection, pending)]
+        for index, (collection, batch) in enumerate(batches):
+            if not batch:
+                continue
+            try:
+                self._write(collection, batch)
+            except Exception:
+                # The batches not attempted yet are retried with the next flush
+                for _, later in batches[index + 1:]:
+                    for state, update in later:
+                        state.restore_update(update)
+                        self.mark_dirty(state)
+                raise
+        return len(durable_pending) + len(pending)
+
+    def _write(self, collection, pending: List[tuple]):
+        try:
+            collection.bulk_write(
+                [UpdateOne({"session_id": state.session_id}, update) for state, update in pending],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # Only the failed updates are retried; the others were applied
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            for index, (state, update) in enumerate(pending):
+                if index in failed:
+                    state.restore_update(update)
+                    self.mark_dirty(state)
+            raise
+        except Exception:
+            # Keep the operations so the next flush retries them
+            for state, update in pending:
+                state.restore_update(update)
+                self.mark_dirty(state)
+            raise
+
+    def adjust_points(self, session_id: str, delta: float):
+        """Apply a points change that was already written to Mongo directly"""
+        with self._lock:
+            state = self._states.get(session_id)
+        if state is not None:
+            state.total_points += delta
+
+    def adjust_rating(self, session_id: str, key: str, old: float, new: float):
+        """Apply a regraded answer to the in-memory per-technology aggregates"""
+        with self._lock:
+            state = self._states.get(session_id)
+        if state is None:
+            return
+        stats = state.tech_ratings.get(key)
+        if stats:
+            stats["sum"] = stats.get("sum", 0.0) + new - old
+            stats["sum_sq"] = stats.get("sum_sq", 0.0) + new ** 2 - old ** 2
+            stats["min"] = min(new, stats.get("min", new))
+            stats["max"] = max(new, stats.get("max", new))
+
+    def evict(self, session_id: str):
+        """Flush and drop a session's state, e.g. once it is completed or handed off"""
+        # Another replica may load the session next; it must not miss these writes
+        self.flush(session_id, durable=True)
+        with self._lock:
+            self._states.pop(session_id, None)
+            self._dirty.discard(session_id)
+
+    def drop(self, session_id: str):
+        """Forget a session's state without writing it, e.g. after losing ownership"""
+        with self._lock:
+            self._states.pop(session_id, None)
+            self._dirty.discard(session_id)
+
+    def _evict_clean_locked(self):
+        idle = [sid for sid in self._states if sid not in self._dirty and sid not in self._pins]
+        for sid in idle[: max(1, self.max_sessions // 10)]:
+            del self._states[sid]
+
+    def __len__(self) -> int:
+        return len(self._states)
@@ -0,0 +1,159 @@
+# services/shared_store.py
+import re
+import time
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+class SharedStore:
+    """Key/value store with expiring entries and leases, shared by all replicas.
+
+    ``LocalSharedStore`` keeps everything in process (single node, tests);
+    ``MongoSharedStore`` shares it through a Mongo collection.
+    """
+
+    def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def scan(self, prefix: str) -> Dict[str, dict]:
+        """All live entries whose key starts with ``prefix``"""
+        raise NotImplementedError
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        """Take or renew ``key`` for ``owner``; fails while another owner's lease is live"""
+        raise NotImplementedError
+
+    def release_lease(self, key: str, owner: str):
+        raise NotImplementedError
+
+    def lease_owner(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class LocalSharedStore(SharedStore):
+    """In-process stand-in for a shared store"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[dict, Optional[float]]] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+
+    def _live(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            value = self._live(key)
+            return dict(value) if value is not None else None
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (dict(value), time.monotonic() + ttl if ttl else None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def scan(self, prefix: str) -> Dict[str, dict]:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            return {key: dict(value) for key in keys if (value := self._live(key)) is not None}
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            current = self._leases.get(key)
+            if current and current[0] != owner and current[1] > now:
+                return False
+            self._leases[key] = (owner, now + ttl)
+            return True
+
+    def release_lease(self, key: str, owner: str):
+        with self._lock:
+            current = self._leases.get(key)
+            if current and current[0] == owner:
+                del self._leases[key]
+
+    def lease_owner(self, key: str) -> Optional[str]:
+        with self._lock:
+            current = self._leases.get(key)
+            if current and current[1] > time.monotonic():
+                return current[0]
+            return None
+
+
+class MongoSharedStore(SharedStore):
+    """Shared store on a Mongo collection.
+
+    Entries and leases are documents keyed by ``_id`` with an ``expires_at``
+    date; expiry is checked on read, and a TTL index (see init_db) removes
+    old documents. Lease acquisition is a single conditional upsert, so two
+    replicas can never both hold a live lease.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[datetime]:
+        return datetime.utcnow() + timedelta(seconds=ttl) if ttl else None
+
+    @staticmethod
+    def _live_filter() -> dict:
+        return {"$or": [{"expires_at": None}, {"expires_at": {"$gt": datetime.utcnow()}}]}
+
+    def get(self, key: str) -> Optional[dict]:
+        doc = self.collection.find_one({"_id": key, **self._live_filter()}, {"value": 1})
+        return doc.get("value") if doc else None
+
+    def set(self, key: str, value: dict, ttl: Optional[float] = None):
+        self.collection.update_one(
+            {"_id": key},
+            {"$set": {"value": value, "expires_at": self._expiry(ttl)}},
+            upsert=True
+        )
+
+    def delete(self, key: str):
+        self.collection.delete_one({"_id": key})
+
+    def scan(self, prefix: str) -> Dict[str, dict]:
+        query = {"_id": {"$regex": f"^{re.escape(prefix)}"}, **self._live_filter()}
+        return {doc["_id"]: doc.get("value") for doc in self.collection.find(query, {"value": 1})}
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        lease_id = f"lease:{key}"
+        try:
+            doc = self.collection.find_one_and_update(
+                {"_id": lease_id, "$or": [{"owner": owner}, {"expires_at": {"$lte": datetime.utcnow()}}]},
+                {"$set": {"owner": owner, "expires_at": self._expiry(ttl)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # The lease exists and is held by someone else
+            return False
+        return doc is not None and doc.get("owner") == owner
+
+    def release_lease(self, key: str, owner: str):
+        self.collection.delete_one({"_id": f"lease:{key}", "owner": owner})
+
+    def lease_owner(self, key: str) -> Optional[str]:
+        doc = self.collection.find_one({"_id": f"lease:{key}", "expires_at": {"$gt": datetime.utcnow()}}, {"owner": 1})
+        return doc.get("owner") if doc else None
@@ -0,0 +1,26 @@
+# services/tech_plan.py
+from typing import Dict, List
+
+
+def build_tech_plan(tech_stack) -> List[Dict]:
+    """Build the interview technology plan from a tech stack.
+
+    Accepts ``TechStack`` models or plain dicts, so it can run on the
+    interview path and on raw documents during bulk import.
+    """
+    tech_plan = []
+    for category in tech_stack:
+        technologies = category.technologies if hasattr(category, 'technologies') else category.get('technologies', [])
+
+        for tech in technologies:
+            name = tech.name if hasattr(tech, 'name') else tech.get('name')
+            proficiency = tech.proficiency if hasattr(tech, 'proficiency') else tech.get('proficiency')
+
+            if name and proficiency:
+                tech_plan.append({
+                    "name": name,
+                    "proficiency": proficiency,
+                    "questions_asked": 0,
+                    "completed": False
+                })
+    return tech_plan
@@ -0,0 +1,108 @@
+# services/turn_worker.py
+import time
+import uuid
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+class TurnTicket:
+    """Handle for a submitted turn; poll ``done`` or ``wait`` for the result"""
+
+    __slots__ = ("ticket_id", "session_id", "user_input", "status", "result", "error",
+                 "submitted_at", "finished_at", "_event")
+
+    def __init__(self, session_id: str, user_input: str):
+        self.ticket_id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.user_input = user_input
+        self.status = "queued"  # "queued", "running", "done", "failed"
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._event = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def _finish(self, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.monotonic()
+        self._event.set()
+
+
+class TurnWorkerPool:
+    """Background pool that processes interview turns off the UI thread.
+
+    Turns of different sessions run in parallel on up to ``max_workers``
+    threads; turns of the same session run one at a time, in submission
+    order, so a fast double submit cannot reorder the conversation.
+    """
+
+    def __init__(self, process_turn: Callable[[str, str], str], max_workers: int = 4,
+                 ticket_ttl: float = 600.0):
+        self.process_turn = process_turn
+        self.ticket_ttl = ticket_ttl  # Seconds a finished ticket stays retrievable
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="turn-worker")
+        self._lock = threading.Lock()
+        self._session_queues: Dict[str, deque] = {}
+        self._tickets: Dict[str, TurnTicket] = {}
+
+    def submit(self, session_id: str, user_input: str) -> TurnTicket:
+        ticket = TurnTicket(session_id, user_input)
+        with self._lock:
+            self._prune_locked()
+            self._tickets[ticket.ticket_id] = ticket
+            queue = self._session_queues.get(session_id)
+            if queue is not None:
+                # A drain for this session is already scheduled or running
+                queue.append(ticket)
+                return ticket
+            self._session_queues[session_id] = deque([ticket])
+        self._executor.submit(self._drain, session_id)
+        return ticket
+
+    def get(self, ticket_id: str) -> Optional[TurnTicket]:
+        with self._lock:
+            return self._tickets.get(ticket_id)
+
+    def pending(self, session_id: str) -> int:
+        with self._lock:
+            queue = self._session_queues.get(session_id)
+            return len(queue) if queue else 0
+
+    def _drain(self, session_id: str):
+        while True:
+            with self._lock:
+                queue = self._session_queues[session_id]
+                if not queue:
+                    del self._session_queues[session_id]
+                    return
+                ticket = queue[0]
+
+            ticket.status = "running"
+            try:
+                ticket._finish("done", result=self.process_turn(ticket.session_id, ticket.user_input))
+            except Exception as e:
+                print(f"[ERROR] Turn worker failed for session {session_id}: {e}")
+                ticket._finish("failed", error=str(e))
+
+            with self._lock:
+                queue.popleft()
+
+    def _prune_locked(self):
+        cutoff = time.monotonic() - self.ticket_ttl
+        expired = [tid for tid, t in self._tickets.items() if t.finished_at is not None and t.finished_at < cutoff]
+        for tid in expired:
+            del self._tickets[tid]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)